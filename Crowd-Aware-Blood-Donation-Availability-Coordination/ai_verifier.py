@@ -63,6 +63,13 @@ class AIVerifier:
         
         return status, self.confidence_score, json.dumps(self.verification_notes)
     
+    def verify_batch(self, users_data, role):
+        """
+        Verify a batch of registrations of the same role (bulk imports)
+        Returns: list of (status, confidence_score, notes) in input order
+        """
+        return [self.verify_user(user_data, role) for user_data in users_data]
+    
     def _check_email(self, email):
         """Validate email format and check for suspicious patterns"""
         if not email:
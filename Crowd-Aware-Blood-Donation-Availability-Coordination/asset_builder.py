@@ -0,0 +1,140 @@
+"""
+Frontend Asset Build for BloodConnect
+Emits content-hashed CSS/JS, gzip variants and rewritten HTML into frontend_build/
+Usage: python asset_builder.py  (restart the server afterwards to pick up the new manifest)
+"""
+
+import os
+import re
+import gzip
+import json
+import shutil
+import hashlib
+import posixpath
+
+MANIFEST_NAME = 'manifest.json'
+
+class AssetBuilder:
+    """Builds a deployable copy of frontend/ with fingerprinted names and precompressed files"""
+
+    COMPRESSIBLE = ('.html', '.css', '.js', '.svg', '.json', '.txt')
+    SKIP = ('README.md',)
+    HASH_LENGTH = 10
+
+    # href="css/style.css" / src='js/main.js' (query strings and fragments are kept)
+    REFERENCE_PATTERN = re.compile(r'''\b(href|src)=(["'])([^"'#?]+)([^"']*)\2''')
+
+    def __init__(self, source_dir, output_dir):
+        self.source_dir = source_dir
+        self.output_dir = output_dir
+
+    def fingerprinted_name(self, relpath, data):
+        """css/style.css -> css/style.<hash>.css"""
+        stem, ext = posixpath.splitext(relpath)
+        digest = hashlib.sha256(data).hexdigest()[:self.HASH_LENGTH]
+        return f"{stem}.{digest}{ext}"
+
+    def iter_source_files(self):
+        """Yields frontend paths relative to source_dir, using '/' separators"""
+        for root, _, files in os.walk(self.source_dir):
+            for name in sorted(files):
+                if name in self.SKIP:
+                    continue
+                full = os.path.join(root, name)
+                yield os.path.relpath(full, self.source_dir).replace(os.sep, '/')
+
+    def rewrite_html(self, relpath, html, assets):
+        """Points href/src attributes at the fingerprinted asset names"""
+        base = posixpath.dirname(relpath)
+
+        def replace(match):
+            attr, quote, url, rest = match.groups()
+            if '://' in url or url.startswith('/'):
+                return match.group(0)
+            target = assets.get(posixpath.normpath(posixpath.join(base, url)))
+            if not target:
+                return match.group(0)
+            new_url = posixpath.relpath(target, base) if base else target
+            return f"{attr}={quote}{new_url}{rest}{quote}"
+
+        return self.REFERENCE_PATTERN.sub(replace, html)
+
+    def write(self, relpath, data, gzipped):
+        """Writes one output file plus its .gz variant when that is actually smaller"""
+        path = os.path.join(self.output_dir, *relpath.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+
+        if relpath.endswith(self.COMPRESSIBLE):
+            # mtime=0 keeps the .gz byte-identical across builds
+            compressed = gzip.compress(data, compresslevel=9, mtime=0)
+            if len(compressed) < len(data):
+                with open(path + '.gz', 'wb') as f:
+                    f.write(compressed)
+                gzipped.append(relpath)
+
+    def build(self):
+        """Runs the full build and returns the manifest dict"""
+        if os.path.isdir(self.output_dir):
+            shutil.rmtree(self.output_dir)
+        os.makedirs(self.output_dir)
+
+        assets = {}
+        gzipped = []
+        pages = []
+
+        # 1. Fingerprint everything except HTML (page URLs are user-facing and stay stable)
+        for relpath in self.iter_source_files():
+            if relpath.endswith('.html'):
+                pages.append(relpath)
+                continue
+            with open(os.path.join(self.source_dir, relpath), 'rb') as f:
+                data = f.read()
+            assets[relpath] = self.fingerprinted_name(relpath, data)
+            self.write(assets[relpath], data, gzipped)
+
+        # 2. HTML pages keep their names but reference the hashed assets
+        for relpath in pages:
+            with open(os.path.join(self.source_dir, relpath), encoding='utf-8') as f:
+                html = self.rewrite_html(relpath, f.read(), assets)
+            self.write(relpath, html.encode('utf-8'), gzipped)
+
+        manifest = {'assets': assets, 'gzip': sorted(gzipped)}
+        with open(os.path.join(self.output_dir, MANIFEST_NAME), 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        return manifest
+
+class AssetManifest:
+    """Build manifest loaded once at startup; empty when no build exists"""
+
+    def __init__(self, folder=None, assets=None, gzip=None):
+        self.folder = folder
+        self.assets = assets or {}
+        self.gzip = frozenset(gzip or ())
+
+    @property
+    def built(self):
+        return self.folder is not None
+
+    @classmethod
+    def load(cls, folder):
+        path = os.path.join(folder, MANIFEST_NAME)
+        if not os.path.exists(path):
+            return cls()
+        with open(path) as f:
+            data = json.load(f)
+        return cls(folder, data.get('assets'), data.get('gzip'))
+
+    def resolve(self, relpath):
+        """Maps a source path (css/style.css) to its built name; unknown paths are returned unchanged"""
+        return self.assets.get(relpath, relpath)
+
+if __name__ == "__main__":
+    basedir = os.path.abspath(os.path.dirname(__file__))
+    builder = AssetBuilder(os.path.join(basedir, 'frontend'), os.path.join(basedir, 'frontend_build'))
+    print("Building frontend assets...")
+    manifest = builder.build()
+    print(f"- {len(manifest['assets'])} fingerprinted assets")
+    print(f"- {len(manifest['gzip'])} gzip variants")
+    print(f"Build written to {builder.output_dir}")
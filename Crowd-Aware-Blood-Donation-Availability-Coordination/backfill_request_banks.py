@@ -0,0 +1,72 @@
+import sys
+import time
+from app import app, db, User, BloodRequest, parse_bank_id
+
+BANK_ROLES = ['blood_bank', 'bank']
+
+def backfill_request_banks_batch(after_id, batch_size=1000):
+    """
+    Links up to batch_size unresolved requests with IDs above after_id, without committing.
+    Returns (last request ID examined or None when none are left, requests resolved,
+    requests left unresolved).
+    """
+    batch = db.session.query(BloodRequest.id, BloodRequest.blood_bank_id).filter(
+        BloodRequest.id > after_id,
+        BloodRequest.bank_id.is_(None),
+        BloodRequest.blood_bank_id.isnot(None)
+    ).order_by(BloodRequest.id).limit(batch_size).all()
+    if not batch:
+        return None, 0, 0
+
+    wanted = {parse_bank_id(value) for _, value in batch} - {None}
+    banks = set()
+    if wanted:
+        banks = {bank_id for (bank_id,) in db.session.query(User.id).filter(
+            User.id.in_(wanted), User.role.in_(BANK_ROLES))}
+
+    updates = []
+    for request_id, value in batch:
+        bank_id = parse_bank_id(value)
+        if bank_id in banks:
+            updates.append({'id': request_id, 'bank_id': bank_id})
+
+    if updates:
+        # Executemany UPDATE ... WHERE id = ? (bulk update by primary key)
+        db.session.execute(db.update(BloodRequest), updates)
+    return batch[-1][0], len(updates), len(batch) - len(updates)
+
+def backfill_request_banks(batch_size=1000, pause=0.05):
+    """
+    Resolves the legacy BloodRequest.blood_bank_id strings into the integer bank_id FK.
+    Requests are walked in primary-key order, batch_size per short transaction with a pause
+    between batches, so the table is never locked for long and live writes carry on.
+    Only rows whose bank_id is still NULL are touched, so an interrupted run simply resumes.
+    Strings that are not the ID of an existing bank stay unresolved.
+    Returns (requests resolved, requests left unresolved).
+    """
+    last_id = 0
+    resolved = 0
+    unresolved = 0
+    while True:
+        last_id, linked, skipped = backfill_request_banks_batch(last_id, batch_size)
+        if last_id is None:
+            break
+        db.session.commit()
+        resolved += linked
+        unresolved += skipped
+        if pause:
+            time.sleep(pause)
+    return resolved, unresolved
+
+if __name__ == "__main__":
+    # Optional requests per batch (default 1000) and seconds to pause between batches (default 0.05)
+    batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    pause = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    with app.app_context():
+        db.create_all()
+        print("Resolving blood request bank identifiers into blood_request.bank_id...")
+        resolved, unresolved = backfill_request_banks(batch_size=batch_size, pause=pause)
+        print(f"- {resolved} requests linked to their bank")
+        if unresolved:
+            print(f"- {unresolved} requests name no known bank and were left unassigned")
+        print("Backfill complete.")
@@ -0,0 +1,450 @@
+"""
+In-Process API Benchmark for BloodConnect
+Drives every /api route through the Flask test client against synthetic datasets at several
+scales, recording p50/p95/p99 latency, SQL statements and peak allocated memory per endpoint,
+and compares the results with a stored baseline to flag regressions.
+
+Usage:
+    python benchmark.py [scales] [iterations] [--save-baseline] [--baseline=path] [--threads=N] [--output=path]
+
+scales is a comma-separated list (default 0.1,1). The benchmark DROPS AND RECREATES every table
+of the database it runs on: it uses BENCHMARK_DATABASE_URL (e.g. a scratch MySQL schema) or,
+when that is unset, a temporary SQLite file. DATABASE_URL is never used, and the run stops if app was
+imported first and bound to another database. --threads adds a concurrent
+read/write pass over the last dataset, and --output writes the results as JSON instead of comparing
+them with the baseline (see compare_backends.py).
+"""
+
+import io
+import json
+import math
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from itertools import count
+
+BENCHMARK_URL = os.environ.get('BENCHMARK_DATABASE_URL') or \
+    'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'benchmark.db')
+if 'app' not in sys.modules:
+    os.environ['DATABASE_URL'] = BENCHMARK_URL
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+import app as app_module
+from app import app, db, User, Report, BloodRequest, Campaign, Appointment, donor_leaderboard, donor_segments, \
+    bank_locations, stats_cache, snapshot_inventory, InventorySnapshot
+from migrations import upgrade
+from report_storage import ReportStorage
+from synthetic_data import TIME_SLOTS, load_synthetic_data
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+class BenchmarkContext:
+    """Sample IDs from the loaded dataset plus untimed fixtures for routes that consume a row"""
+
+    def __init__(self):
+        self.nonce = int(time.time() * 1000) % 10**8  # Keeps emails unique across runs on one database
+        self.admin = User.query.filter_by(role='admin').first().id
+        self.bank = db.session.query(Appointment.bank_id).filter(Appointment.bank_id.isnot(None))\
+            .group_by(Appointment.bank_id).order_by(db.func.count(Appointment.id).desc()).first()[0]
+        self.hospital = db.session.query(BloodRequest.hospital_id).group_by(BloodRequest.hospital_id)\
+            .order_by(db.func.count(BloodRequest.id).desc()).first()[0]
+        self.donor = db.session.query(Appointment.donor_id).group_by(Appointment.donor_id)\
+            .order_by(db.func.count(Appointment.id).desc()).first()[0]
+        self.donors = [d for (d,) in db.session.query(User.id).filter_by(role='donor').order_by(User.id).limit(500)]
+        self.donor_email = db.session.get(User, self.donor).email
+        self.city = db.session.get(User, self.bank).city
+        # Small scales may have no upcoming camp or request for the chosen bank
+        camp = Campaign.query.filter_by(status='scheduled').order_by(Campaign.date).first()
+        self.camp = camp.id if camp else self.new_camp(0)
+        request = BloodRequest.query.filter_by(bank_id=self.bank).order_by(BloodRequest.id.desc()).first()
+        self.request = request.id if request else self.new_request(0)
+        db.session.commit()
+
+    def _add(self, obj):
+        db.session.add(obj)
+        db.session.commit()
+        return obj.id
+
+    def new_camp(self, i):
+        return self._add(Campaign(organizer_id=self.bank, name=f'Bench Camp {i}', location='Hall', city=self.city,
+                                  date=datetime.utcnow() + timedelta(days=30), start_time='09:00', end_time='17:00'))
+
+    def new_report(self, i):
+        return self._add(Report(donor_id=self.donors[i % len(self.donors)], filename=f'bench/{i}.pdf'))
+
+    def new_request(self, i):
+        return self._add(BloodRequest(hospital_id=self.hospital, patient_name=f'Bench {i}', patient_id=f'B{i}',
+                                      blood_group='O+', units=1, priority='urgent', reason='Surgery',
+                                      blood_bank_id=str(self.bank), bank_id=self.bank))
+
+    def new_user(self, i):
+        return self._add(User(username=f'bench_pending_{self.nonce}_{i}', email=f'pending{self.nonce}_{i}@bench.test',
+                              role='hospital', password_hash='x', account_status='pending',
+                              ai_verification_status='flagged'))
+
+def _import_csv(ctx, i):
+    rows = ['name,email,password,blood_group,city'] + [
+        f'Bench Donor {i}-{n},import{ctx.nonce}_{i}_{n}@bench.test,pw,O+,{ctx.city}' for n in range(3)]
+    return {'data': {'file': (io.BytesIO('\n'.join(rows).encode()), 'donors.csv')},
+            'content_type': 'multipart/form-data'}
+
+def _booking(ctx, i):
+    # Far-future, distinct (day, slot) pairs so every booking finds a free seat
+    day = (datetime.utcnow() + timedelta(days=400 + i // len(TIME_SLOTS))).strftime('%Y-%m-%d')
+    return {'json': {'bank_id': ctx.bank, 'donor_id': ctx.donors[i % len(ctx.donors)], 'date': day,
+                     'time_slot': TIME_SLOTS[i % len(TIME_SLOTS)]}}
+
+def _new_camp_body(ctx, i):
+    return {'json': {'organizer_id': ctx.bank, 'name': f'Bench Drive {i}', 'location': 'Town Hall',
+                     'date': (datetime.utcnow() + timedelta(days=45)).strftime('%Y-%m-%d'),
+                     'start_time': '09:00', 'end_time': '17:00', 'target_blood_groups': 'All'}}
+
+# (method, rule) -> builder(ctx, i) returning (path, test client kwargs); reads run before writes
+SCENARIOS = {
+    ('GET', '/api/donor/stats/<int:user_id>'): lambda ctx, i: (f'/api/donor/stats/{ctx.donor}', {}),
+    ('GET', '/api/campaigns'): lambda ctx, i: ('/api/campaigns', {}),
+    ('GET', '/api/camps/discover'): lambda ctx, i: ('/api/camps/discover', {'query_string': {'city': ctx.city}}),
+    ('GET', '/api/camps/<int:camp_id>/slots'): lambda ctx, i: (f'/api/camps/{ctx.camp}/slots', {}),
+    ('GET', '/api/appointments/<int:user_id>'): lambda ctx, i: (f'/api/appointments/{ctx.donor}', {}),
+    ('GET', '/api/user/<int:user_id>'): lambda ctx, i: (f'/api/user/{ctx.bank}', {}),
+    ('GET', '/api/reports'): lambda ctx, i: ('/api/reports', {}),
+    ('GET', '/api/hospital/requests'): lambda ctx, i: ('/api/hospital/requests',
+                                                        {'query_string': {'hospital_id': ctx.hospital}}),
+    ('GET', '/api/admin/requests'): lambda ctx, i: ('/api/admin/requests', {}),
+    ('GET', '/api/users'): lambda ctx, i: ('/api/users', {'query_string': {'role': 'donor'}}),
+    ('GET', '/api/bank/stats/<int:bank_id>'): lambda ctx, i: (f'/api/bank/stats/{ctx.bank}', {}),
+    ('GET', '/api/bank/inventory/details/<int:bank_id>'): lambda ctx, i: (f'/api/bank/inventory/details/{ctx.bank}', {}),
+    ('GET', '/api/bank/inventory/<int:bank_id>'): lambda ctx, i: (f'/api/bank/inventory/{ctx.bank}', {}),
+    ('GET', '/api/notifications/<int:user_id>'): lambda ctx, i: (f'/api/notifications/{ctx.donor}', {}),
+    ('GET', '/api/bank/requests/<int:bank_id>'): lambda ctx, i: (f'/api/bank/requests/{ctx.bank}', {}),
+    ('GET', '/api/bank/donations/<int:bank_id>'): lambda ctx, i: (f'/api/bank/donations/{ctx.bank}', {}),
+    ('GET', '/api/banks'): lambda ctx, i: ('/api/banks', {}),
+    ('GET', '/api/inventory/check_expiry'): lambda ctx, i: ('/api/inventory/check_expiry', {}),
+    ('GET', '/api/donors/segment'): lambda ctx, i: ('/api/donors/segment', {'query_string': {
+        'blood_group': 'O+', 'city': ctx.city, 'eligible_within_days': 7}}),
+    ('GET', '/api/leaderboard'): lambda ctx, i: ('/api/leaderboard', {'query_string': {'city': ctx.city}}),
+    ('GET', '/api/leaderboard/rank/<int:donor_id>'): lambda ctx, i: (f'/api/leaderboard/rank/{ctx.donor}', {}),
+    ('GET', '/api/admin/stats/advanced'): lambda ctx, i: ('/api/admin/stats/advanced', {}),
+    ('GET', '/api/analytics/monthly'): lambda ctx, i: ('/api/analytics/monthly', {}),
+    ('GET', '/api/analytics/distribution'): lambda ctx, i: ('/api/analytics/distribution', {}),
+    ('GET', '/api/analytics/inventory/trend'): lambda ctx, i: ('/api/analytics/inventory/trend',
+                                                               {'query_string': {'bank_id': ctx.bank}}),
+    ('GET', '/api/hospital/stats/<int:hospital_id>'): lambda ctx, i: (f'/api/hospital/stats/{ctx.hospital}', {}),
+    ('GET', '/api/hospital/requests/<int:hospital_id>'): lambda ctx, i: (f'/api/hospital/requests/{ctx.hospital}', {}),
+    ('GET', '/api/stock-check'): lambda ctx, i: ('/api/stock-check', {'query_string': {
+        'blood_group': 'O+', 'near': '12.97,77.59', 'radius_km': 100}}),
+    ('GET', '/api/requests/<int:request_id>/match'): lambda ctx, i: (f'/api/requests/{ctx.request}/match', {}),
+    ('GET', '/api/admin/pending-verifications'): lambda ctx, i: ('/api/admin/pending-verifications', {}),
+    ('GET', '/api/admin/auto-approved'): lambda ctx, i: ('/api/admin/auto-approved', {}),
+    ('GET', '/api/admin/ai-stats'): lambda ctx, i: ('/api/admin/ai-stats', {}),
+    ('GET', '/api/bank/bootstrap/<int:bank_id>'): lambda ctx, i: (f'/api/bank/bootstrap/{ctx.bank}', {}),
+    ('GET', '/api/donor/bootstrap/<int:user_id>'): lambda ctx, i: (f'/api/donor/bootstrap/{ctx.donor}', {}),
+    ('GET', '/api/hospital/bootstrap/<int:hospital_id>'): lambda ctx, i: (f'/api/hospital/bootstrap/{ctx.hospital}', {}),
+    ('GET', '/api/bank/profile'): lambda ctx, i: ('/api/bank/profile', {}),
+    ('GET', '/api/inventory/summary'): lambda ctx, i: ('/api/inventory/summary', {}),
+    ('GET', '/api/inventory/groups'): lambda ctx, i: ('/api/inventory/groups', {}),
+    ('GET', '/api/inventory'): lambda ctx, i: ('/api/inventory', {}),
+    ('GET', '/api/requests/urgent'): lambda ctx, i: ('/api/requests/urgent', {}),
+    ('GET', '/api/camps'): lambda ctx, i: ('/api/camps', {}),
+    ('GET', '/api/donations/today'): lambda ctx, i: ('/api/donations/today', {}),
+    ('GET', '/api/network'): lambda ctx, i: ('/api/network', {}),
+    ('GET', '/api/alerts'): lambda ctx, i: ('/api/alerts', {}),
+    ('POST', '/api/login'): lambda ctx, i: ('/api/login', {'json': {
+        'email': ctx.donor_email, 'password': 'password', 'role': 'donor'}}),
+    ('POST', '/api/batch'): lambda ctx, i: ('/api/batch', {'json': {'requests': [
+        '/api/banks', f'/api/bank/stats/{ctx.bank}', f'/api/notifications/{ctx.donor}']}}),
+    ('POST', '/api/camps'): lambda ctx, i: ('/api/camps', _new_camp_body(ctx, i)),
+    ('POST', '/api/campaigns'): lambda ctx, i: ('/api/campaigns', _new_camp_body(ctx, i)),
+    ('PUT', '/api/camps/<int:camp_id>'): lambda ctx, i: (f'/api/camps/{ctx.camp}', {'json': {
+        'name': f'Renamed Drive {i}', 'slot_capacity': 25}}),
+    ('DELETE', '/api/camps/<int:camp_id>'): lambda ctx, i: (f'/api/camps/{ctx.new_camp(i)}', {}),
+    ('POST', '/api/appointments'): lambda ctx, i: ('/api/appointments', _booking(ctx, i)),
+    ('POST', '/api/init_db'): lambda ctx, i: ('/api/init_db', {}),
+    ('POST', '/api/register'): lambda ctx, i: ('/api/register', {'json': {
+        'name': f'bench_donor_{ctx.nonce}_{i}', 'email': f'register{ctx.nonce}_{i}@bench.test', 'password': 'pw',
+        'role': 'donor', 'blood_group': 'A+', 'city': ctx.city, 'pincode': '560001'}}),
+    ('POST', '/api/donors/import'): lambda ctx, i: ('/api/donors/import', _import_csv(ctx, i)),
+    ('POST', '/api/upload_report'): lambda ctx, i: ('/api/upload_report', {
+        'data': {'donor_id': str(ctx.donor), 'report': (io.BytesIO(b'%PDF-1.4 bench report'), 'report.pdf')},
+        'content_type': 'multipart/form-data'}),
+    ('POST', '/api/verify_report/<int:report_id>'): lambda ctx, i: (f'/api/verify_report/{ctx.new_report(i)}', {
+        'json': {'action': 'approve'}}),
+    ('POST', '/api/request_blood'): lambda ctx, i: ('/api/request_blood', {'json': {
+        'hospital_id': ctx.hospital, 'patient_name': f'Bench {i}', 'patient_id': f'B{i}', 'blood_group': 'B+',
+        'units': 2, 'priority': 'routine', 'reason': 'Surgery', 'blood_bank': str(ctx.bank)}}),
+    ('POST', '/api/admin/verify_request/<int:request_id>'): lambda ctx, i: (
+        f'/api/admin/verify_request/{ctx.new_request(i)}', {'json': {'action': 'approve'}}),
+    ('POST', '/api/verify_user/<int:user_id>'): lambda ctx, i: (f'/api/verify_user/{ctx.new_user(i)}', {
+        'json': {'action': 'approve'}}),
+    ('POST', '/api/notifications/mark-read/<int:user_id>'): lambda ctx, i: (
+        f'/api/notifications/mark-read/{ctx.donor}', {}),
+    ('POST', '/api/inventory/update'): lambda ctx, i: ('/api/inventory/update', {'json': {
+        'bank_id': ctx.bank, 'blood_group': 'A+', 'units': 1,
+        'expiry_date': (datetime.utcnow() + timedelta(days=35)).strftime('%Y-%m-%d')}}),
+    ('POST', '/api/bank/request/<int:request_id>/action'): lambda ctx, i: (
+        f'/api/bank/request/{ctx.new_request(i)}/action', {'json': {'action': 'approve', 'bank_id': ctx.bank}}),
+    ('POST', '/api/analytics/run-prediction'): lambda ctx, i: ('/api/analytics/run-prediction', {
+        'json': {'city': ctx.city}}),
+    ('POST', '/api/admin/verify/<int:user_id>'): lambda ctx, i: (f'/api/admin/verify/{ctx.new_user(i)}', {
+        'json': {'decision': 'approve', 'admin_id': ctx.admin, 'notes': 'Benchmark'}}),
+}
+
+def api_routes():
+    """Every (method, rule) the app serves under /api, in registration order"""
+    routes = []
+    for rule in app.url_map.iter_rules():
+        if not rule.rule.startswith('/api/'):
+            continue
+        for method in sorted(rule.methods - {'HEAD', 'OPTIONS'}):
+            if (method, rule.rule) not in routes:
+                routes.append((method, rule.rule))
+    return routes
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an unsorted list"""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+def reset_caches():
+    # Bulk loads bypass the session, so nothing told the in-process caches the data changed
+    stats_cache.clear()
+    bank_locations.invalidate()
+    donor_segments.loaded = False
+    donor_leaderboard.invalidate()
+
+def check_database():
+    """
+    Refuses to run unless the app is bound to BENCHMARK_URL. The URL is only chosen when benchmark.py
+    is imported before app; otherwise the engine may point at the real database.
+    """
+    if db.engine.url != make_url(BENCHMARK_URL):
+        raise RuntimeError(f"Benchmark expected {make_url(BENCHMARK_URL).render_as_string(hide_password=True)} "
+                           f"but the app uses {db.engine.url.render_as_string(hide_password=True)}; "
+                           "set BENCHMARK_DATABASE_URL before app is imported")
+
+def prepare_dataset(scale, seed=42, log=print):
+    """Drops every table, migrates an empty schema and loads a synthetic dataset"""
+    check_database()
+    db.session.remove()
+    db.drop_all()
+    upgrade(pause=0, log=lambda message: None)
+    db.session.add(User(username='admin', email='admin@bloodconnect.com', role='admin', password_hash='x'))
+    db.session.commit()
+    inserted = load_synthetic_data(scale=scale, seed=seed, log=lambda message: None)
+    # The trend endpoint reads daily history; only today can be measured, so earlier days repeat it
+    snapshot_inventory()
+    today = datetime.utcnow().date()
+    rows = [{column: getattr(snap, column) for column in ('bank_id', 'blood_group', 'available', 'expiring', 'expired')}
+            for snap in InventorySnapshot.query.filter_by(day=today)]
+    history = [dict(row, day=today - timedelta(days=days_ago))
+               for days_ago in range(1, app.config['INVENTORY_TREND_DAYS'] + 1) for row in rows]
+    if history:
+        db.session.execute(db.insert(InventorySnapshot), history)
+    db.session.commit()
+    reset_caches()
+    log(f"Loaded scale {scale:g}: {sum(inserted.values()):,} rows")
+    return inserted
+
+def measure(client, ctx, method, builder, iterations, counter):
+    """Runs one endpoint: a warm-up call, `iterations` timed calls and one traced call for memory"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(1)
+
+    def call():
+        path, kwargs = builder(ctx, next(counter))
+        db.session.remove()  # Each request starts from a clean session, as in production
+        resp = client.open(path, method=method, **kwargs)
+        resp.get_data()  # Drains streamed responses inside the measurement
+        resp.close()
+        return resp.status_code
+
+    status = call()
+    latencies, counts = [], []
+    engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        for _ in range(iterations):
+            # Fixtures a builder creates commit before the timer starts
+            path, kwargs = builder(ctx, next(counter))
+            db.session.remove()
+            del statements[:]
+            started = time.perf_counter()
+            resp = client.open(path, method=method, **kwargs)
+            resp.get_data()
+            latencies.append((time.perf_counter() - started) * 1000)
+            resp.close()
+            counts.append(len(statements))
+            status = max(status, resp.status_code)
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        call()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'n': iterations,
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'statements': sorted(counts)[len(counts) // 2],
+        'peak_kb': round(peak / 1024, 1),
+        'status': status,
+    }
+
+def run_benchmarks(scales=(0.1, 1), iterations=30, seed=42, log=print):
+    """Returns {'<scale> <METHOD> <rule>': result}; raises if a /api route has no scenario"""
+    missing = [route for route in api_routes() if route not in SCENARIOS]
+    if missing:
+        raise LookupError(f"No benchmark scenario for: {', '.join(' '.join(r) for r in missing)}")
+
+    # Upload blobs go to a scratch folder rather than the real uploads directory
+    uploads = tempfile.mkdtemp()
+    saved_storage, app_module.report_storage = app_module.report_storage, ReportStorage(uploads)
+    results = {}
+    counter = iter(range(10**9))
+    try:
+        with app.app_context():
+            client = app.test_client()
+            for scale in scales:
+                prepare_dataset(scale, seed=seed, log=log)
+                ctx = BenchmarkContext()
+                # Reads first, so they see the dataset as loaded
+                ordered = sorted(api_routes(), key=lambda route: route[0] != 'GET')
+                for method, rule in ordered:
+                    result = measure(client, ctx, method, SCENARIOS[(method, rule)], iterations, counter)
+                    results[f'{scale:g} {method} {rule}'] = result
+                    log(f"{scale:>6g} {method:<6} {rule:<48} p50 {result['p50_ms']:>8.2f}  p95 {result['p95_ms']:>8.2f}  "
+                        f"p99 {result['p99_ms']:>8.2f} ms  {result['statements']:>4} sql  {result['peak_kb']:>9.1f} KB"
+                        f"  [{result['status']}]")
+    finally:
+        app_module.report_storage = saved_storage
+        reset_caches()
+    return results
+
+# Mixed workload for the concurrent pass: three dashboard reads for every booking
+CONCURRENT_MIX = [
+    ('GET', '/api/camps/discover'),
+    ('GET', '/api/bank/inventory/<int:bank_id>'),
+    ('GET', '/api/leaderboard'),
+    ('POST', '/api/appointments'),
+]
+
+def run_concurrency(threads=8, requests=200, log=print):
+    """
+    Replays CONCURRENT_MIX from `threads` clients at once against the loaded dataset.
+    Returns throughput, latency percentiles and the number of 5xx answers (e.g. 'database is locked').
+    """
+    with app.app_context():
+        check_database()
+        ctx = BenchmarkContext()
+    counter = count(10**5)  # Clear of the booking days the sequential pass used
+    latencies, errors = [], []
+
+    def worker():
+        client = app.test_client()
+        for n in range(requests):
+            method, rule = CONCURRENT_MIX[n % len(CONCURRENT_MIX)]
+            path, kwargs = SCENARIOS[(method, rule)](ctx, next(counter))
+            started = time.perf_counter()
+            resp = client.open(path, method=method, **kwargs)
+            resp.get_data()
+            latencies.append((time.perf_counter() - started) * 1000)
+            resp.close()
+            if resp.status_code >= 500:
+                errors.append(resp.status_code)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - started
+    reset_caches()
+
+    result = {
+        'threads': threads,
+        'requests': len(latencies),
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 50), 3),
+        'p95_ms': round(percentile(latencies, 95), 3),
+        'p99_ms': round(percentile(latencies, 99), 3),
+        'errors': len(errors),
+    }
+    log(f"{threads} threads x {requests} requests: {result['throughput_rps']:.1f} req/s  p50 {result['p50_ms']:.2f}  "
+        f"p95 {result['p95_ms']:.2f}  p99 {result['p99_ms']:.2f} ms  {result['errors']} errors")
+    return result
+
+def compare(results, baseline, tolerance=0.25, min_ms=2.0, memory_tolerance=0.5, min_kb=256):
+    """
+    Regressions against a baseline: any 5xx answer, p95 more than tolerance (and min_ms) slower, any
+    extra SQL statement, or peak memory more than memory_tolerance (and min_kb) higher. The absolute
+    floors keep timer noise on sub-millisecond endpoints from being reported.
+    """
+    regressions = []
+    for key, result in results.items():
+        if result['status'] >= 500:
+            regressions.append(f"{key}: status {result['status']}")
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if result['p95_ms'] > base['p95_ms'] * (1 + tolerance) and result['p95_ms'] - base['p95_ms'] > min_ms:
+            regressions.append(f"{key}: p95 {base['p95_ms']:.2f} -> {result['p95_ms']:.2f} ms")
+        if result['statements'] > base['statements']:
+            regressions.append(f"{key}: {base['statements']} -> {result['statements']} SQL statements")
+        if result['peak_kb'] > base['peak_kb'] * (1 + memory_tolerance) and result['peak_kb'] - base['peak_kb'] > min_kb:
+            regressions.append(f"{key}: peak memory {base['peak_kb']:.0f} -> {result['peak_kb']:.0f} KB")
+    return regressions
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+def save_baseline(results, path=BASELINE_PATH):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    scales = [float(s) for s in args[0].split(',')] if args else [0.1, 1]
+    iterations = int(args[1]) if len(args) > 1 else 30
+    path = next((arg.split('=', 1)[1] for arg in sys.argv if arg.startswith('--baseline=')), BASELINE_PATH)
+    threads = next((int(arg.split('=', 1)[1]) for arg in sys.argv if arg.startswith('--threads=')), 0)
+    output = next((arg.split('=', 1)[1] for arg in sys.argv if arg.startswith('--output=')), None)
+
+    results = run_benchmarks(scales=scales, iterations=iterations)
+    concurrency = run_concurrency(threads=threads, requests=iterations * 4) if threads else None
+    if output:
+        with open(output, 'w') as f:
+            json.dump({'database': make_url(app.config['SQLALCHEMY_DATABASE_URI']).render_as_string(hide_password=True),
+                       'endpoints': results, 'concurrency': concurrency}, f, indent=2, sort_keys=True)
+        print(f"Results written to {output}")
+        sys.exit(0)
+    if '--save-baseline' in sys.argv:
+        save_baseline(results, path)
+        print(f"Baseline written to {path}")
+        sys.exit(0)
+
+    baseline = load_baseline(path)
+    if not baseline:
+        print(f"No baseline at {path}; run with --save-baseline to record one.")
+        sys.exit(0)
+    regressions = compare(results, baseline)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    print(f"{len(regressions)} regressions against {path}")
+    sys.exit(1 if regressions else 0)
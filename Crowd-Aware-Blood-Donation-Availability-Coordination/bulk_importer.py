@@ -0,0 +1,147 @@
+"""
+Bulk Donor Import for BloodConnect
+Streams CSV / NDJSON uploads from camps and partner institutions in batches
+"""
+
+import csv
+import codecs
+import io
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.security import generate_password_hash
+
+from ai_verifier import ai_verifier
+
+class BulkDonorImporter:
+    """Parses donor uploads as a stream and prepares rows for chunked inserts"""
+
+    # Columns accepted from the upload (anything else is ignored)
+    FIELDS = [
+        'username', 'name', 'email', 'password', 'phone', 'blood_group',
+        'medical_conditions', 'donation_type', 'address', 'city', 'state', 'pincode'
+    ]
+
+    RESULT_COLUMNS = ['row', 'email', 'status', 'user_id', 'message']
+
+    def __init__(self, batch_size=500, hash_workers=None):
+        self.batch_size = batch_size
+        # Password hashing dominates import time; scrypt releases the GIL so threads scale with cores
+        self.hash_workers = hash_workers or os.cpu_count() or 1
+
+    def detect_format(self, filename=None, content_type=None):
+        """Returns 'ndjson' or 'csv' based on the upload name / content type"""
+        filename = (filename or '').lower()
+        content_type = (content_type or '').lower()
+        if filename.endswith(('.ndjson', '.jsonl')) or 'ndjson' in content_type or 'jsonl' in content_type:
+            return 'ndjson'
+        return 'csv'
+
+    def iter_rows(self, stream, fmt='csv'):
+        """
+        Yields (row_number, dict) one line at a time without reading the whole upload.
+        Malformed NDJSON lines are yielded as (row_number, None).
+        """
+        lines = codecs.iterdecode(stream, 'utf-8-sig')
+        if fmt == 'ndjson':
+            for row_number, line in enumerate(lines, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    yield row_number, None
+                    continue
+                yield row_number, record if isinstance(record, dict) else None
+        else:
+            reader = csv.DictReader(lines)
+            for row_number, record in enumerate(reader, start=1):
+                yield row_number, record
+
+    def iter_batches(self, stream, fmt='csv', batch_size=None):
+        """Groups the row stream into lists of at most batch_size rows"""
+        batch_size = batch_size or self.batch_size
+        batch = []
+        for item in self.iter_rows(stream, fmt):
+            batch.append(item)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def normalize(self, record):
+        """Maps an upload record onto the register() field names"""
+        data = {}
+        for field in self.FIELDS:
+            value = record.get(field)
+            if value is not None:
+                value = str(value).strip()
+            data[field] = value if value not in ('', None) else None
+        data['username'] = data['username'] or data['name']
+        del data['name']
+        data['donation_type'] = data['donation_type'] or 'Free'
+        return data
+
+    def prepare_batch(self, batch):
+        """
+        Validates, AI-verifies and hashes one batch.
+        Returns (accepted, rejected): accepted is a list of (row_number, user_values),
+        rejected a list of (row_number, email, message).
+        """
+        accepted = []
+        rejected = []
+        seen_emails = set()
+        seen_usernames = set()
+
+        for row_number, record in batch:
+            if record is None:
+                rejected.append((row_number, None, "Malformed row"))
+                continue
+            data = self.normalize(record)
+            if not data['username'] or not data['email'] or not data['password']:
+                rejected.append((row_number, data['email'], "Missing required fields"))
+                continue
+            if data['email'] in seen_emails:
+                rejected.append((row_number, data['email'], "Duplicate email in upload"))
+                continue
+            if data['username'] in seen_usernames:
+                rejected.append((row_number, data['email'], "Duplicate username in upload"))
+                continue
+            seen_emails.add(data['email'])
+            seen_usernames.add(data['username'])
+            accepted.append((row_number, data))
+
+        verified = ai_verifier.verify_batch([data for _, data in accepted], 'donor')
+
+        with ThreadPoolExecutor(max_workers=self.hash_workers) as executor:
+            hashes = list(executor.map(generate_password_hash, [data['password'] for _, data in accepted]))
+
+        prepared = []
+        for (row_number, data), (ai_status, ai_score, ai_notes), password_hash in zip(accepted, verified, hashes):
+            del data['password']
+            data.update({
+                'role': 'donor',
+                'account_status': 'pending',
+                'password_hash': password_hash,
+                'ai_verification_status': ai_status,
+                'ai_confidence_score': ai_score,
+                'ai_verification_notes': ai_notes
+            })
+            prepared.append((row_number, data))
+
+        return prepared, rejected
+
+    def format_results(self, results, header=False):
+        """Renders result tuples as CSV text for the streamed result file"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if header:
+            writer.writerow(self.RESULT_COLUMNS)
+        for result in results:
+            writer.writerow(['' if value is None else value for value in result])
+        return buffer.getvalue()
+
+# Singleton instance
+bulk_importer = BulkDonorImporter()
@@ -0,0 +1,95 @@
+"""
+Commit Change Tracking for BloodConnect
+Records which tables (and rows) a session writes and notifies listeners once the transaction commits
+"""
+
+import threading
+from sqlalchemy import event, inspect
+
+class CommitTracker:
+    """Calls listener(changed_tables) after each commit that wrote one of the listener's tables"""
+
+    INFO_KEY = 'commit_tracker_tables'
+    ROWS_KEY = 'commit_tracker_rows'
+
+    def __init__(self):
+        self._listeners = []  # (frozenset of table names or None for every table, callback)
+        self._row_listeners = []  # (model, column names, callback)
+        self._lock = threading.Lock()
+
+    def listen(self, tables, callback):
+        with self._lock:
+            self._listeners.append((frozenset(tables) if tables is not None else None, callback))
+
+    def listen_rows(self, model, columns, callback):
+        """
+        Calls callback(rows) after a commit that flushed instances of `model`.
+        Each row is a dict of `columns` captured at flush time (the instances are expired
+        by the commit); deleted instances are reported as {'id': pk, '_deleted': True}.
+        ORM bulk statements carry no instances and are not reported here.
+        """
+        with self._lock:
+            self._row_listeners.append((model, tuple(columns), callback))
+
+    def notify(self, tables):
+        """Runs the listeners for a set of changed table names (also usable for raw SQL writes)"""
+        tables = set(tables)
+        with self._lock:
+            listeners = list(self._listeners)
+        for watched, callback in listeners:
+            if watched is None or watched & tables:
+                callback(tables)
+
+    def _changed(self, session):
+        return session.info.setdefault(self.INFO_KEY, set())
+
+    def _after_flush(self, session, flush_context):
+        changed = self._changed(session)
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+            table = getattr(obj, '__table__', None)
+            if table is not None:
+                changed.add(table.name)
+
+        if not self._row_listeners:
+            return
+        rows = session.info.setdefault(self.ROWS_KEY, [])
+        for index, (model, columns, _) in enumerate(self._row_listeners):
+            for obj in list(session.new) + list(session.dirty):
+                if isinstance(obj, model):
+                    rows.append((index, {col: getattr(obj, col) for col in columns}))
+            for obj in session.deleted:
+                if isinstance(obj, model):
+                    rows.append((index, {'id': inspect(obj).identity[0], '_deleted': True}))
+
+    def _do_orm_execute(self, orm_execute_state):
+        # Bulk insert/update/delete statements never pass through flush
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            mapper = orm_execute_state.bind_mapper
+            if mapper is not None:
+                self._changed(orm_execute_state.session).add(mapper.local_table.name)
+
+    def _after_commit(self, session):
+        changed = session.info.pop(self.INFO_KEY, None)
+        if changed:
+            self.notify(changed)
+
+        rows = session.info.pop(self.ROWS_KEY, None)
+        if rows:
+            for index, (_, _, callback) in enumerate(self._row_listeners):
+                matched = [row for i, row in rows if i == index]
+                if matched:
+                    callback(matched)
+
+    def _after_rollback(self, session):
+        session.info.pop(self.INFO_KEY, None)
+        session.info.pop(self.ROWS_KEY, None)
+
+    def track(self, session):
+        """Registers the hooks on a session, sessionmaker or scoped_session (e.g. db.session)"""
+        event.listen(session, 'after_flush', self._after_flush)
+        event.listen(session, 'do_orm_execute', self._do_orm_execute)
+        event.listen(session, 'after_commit', self._after_commit)
+        event.listen(session, 'after_rollback', self._after_rollback)
+
+# Singleton instance
+commit_tracker = CommitTracker()
@@ -0,0 +1,18 @@
+import sys
+from app import app, db, Report, report_storage
+
+def cleanup_uploads(grace_seconds=3600):
+    with app.app_context():
+        print("Removing orphaned report blobs...")
+        
+        # Every blob still referenced by a report (duplicates share one filename)
+        referenced = {filename for (filename,) in db.session.query(Report.filename).distinct()}
+        print(f"- {len(referenced)} blobs referenced by reports")
+        
+        removed = report_storage.cleanup_orphans(referenced, grace_seconds=grace_seconds)
+        print(f"- Deleted {removed} orphaned blobs")
+        print("Cleanup complete.")
+
+if __name__ == "__main__":
+    # Optional grace period in seconds (default 1 hour) protects uploads still being registered
+    cleanup_uploads(int(sys.argv[1]) if len(sys.argv) > 1 else 3600)
@@ -0,0 +1,75 @@
+"""
+Backend Comparison for BloodConnect
+Runs benchmark.py once per database backend on the same synthetic workload and prints the
+endpoint latencies and the concurrent read/write pass side by side.
+
+Usage:
+    python compare_backends.py [scale] [iterations] [threads] [mysql_url]
+
+Backends compared: tuned SQLite (WAL mode, the default for SQLite files), SQLite with its stock
+settings (SQLITE_TUNED=0) and, when a URL is given or BENCHMARK_MYSQL_URL is set, MySQL.
+The MySQL schema is DROPPED AND RECREATED, so point it at a scratch database.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from statistics import median
+
+BENCHMARK = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark.py')
+
+def backends(mysql_url=None):
+    """(label, environment overrides) for each backend to run"""
+    runs = [
+        ('sqlite-tuned', {'SQLITE_TUNED': '1'}),
+        ('sqlite-default', {'SQLITE_TUNED': '0'}),
+    ]
+    if mysql_url:
+        runs.append(('mysql', {'BENCHMARK_DATABASE_URL': mysql_url}))
+    return runs
+
+def run_backend(label, overrides, scale, iterations, threads):
+    """Runs benchmark.py in a fresh interpreter (engine options are fixed at import) and returns its JSON"""
+    output = os.path.join(tempfile.mkdtemp(), f'{label}.json')
+    env = {k: v for k, v in os.environ.items() if k not in ('BENCHMARK_DATABASE_URL', 'DATABASE_URL')}
+    env.update(overrides)
+    subprocess.run([sys.executable, BENCHMARK, f'{scale:g}', str(iterations), f'--threads={threads}',
+                    f'--output={output}'], env=env, check=True, stdout=subprocess.DEVNULL)
+    with open(output) as f:
+        return json.load(f)
+
+def summarize(results):
+    """Prints p95 per endpoint for each backend, then the aggregate and concurrent rows"""
+    labels = list(results)
+    print(f"{'p95 ms':<58}" + ''.join(f'{label:>16}' for label in labels))
+    keys = sorted(set.intersection(*(set(r['endpoints']) for r in results.values())))
+    for key in keys:
+        print(f'{key[:58]:<58}' + ''.join(f"{results[label]['endpoints'][key]['p95_ms']:>16.2f}" for label in labels))
+
+    print()
+    rows = {
+        'median endpoint p50 ms': lambda r: median(e['p50_ms'] for e in r['endpoints'].values()),
+        'median endpoint p95 ms': lambda r: median(e['p95_ms'] for e in r['endpoints'].values()),
+        'concurrent req/s': lambda r: r['concurrency']['throughput_rps'],
+        'concurrent p95 ms': lambda r: r['concurrency']['p95_ms'],
+        'concurrent p99 ms': lambda r: r['concurrency']['p99_ms'],
+        'concurrent 5xx errors': lambda r: r['concurrency']['errors'],
+    }
+    for name, value in rows.items():
+        print(f'{name:<58}' + ''.join(f'{value(results[label]):>16.2f}' for label in labels))
+
+if __name__ == "__main__":
+    scale = float(sys.argv[1]) if len(sys.argv) > 1 else 0.1
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    threads = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+    mysql_url = sys.argv[4] if len(sys.argv) > 4 else os.environ.get('BENCHMARK_MYSQL_URL')
+
+    if not mysql_url:
+        print("No MySQL URL given; comparing the SQLite modes only.")
+    results = {}
+    for label, overrides in backends(mysql_url):
+        print(f"Benchmarking {label}...")
+        results[label] = run_backend(label, overrides, scale, iterations, threads)
+    summarize(results)
@@ -0,0 +1,95 @@
+"""
+Response Compression for BloodConnect
+Accept-Encoding negotiated gzip for JSON responses, with a streaming mode for large lists
+"""
+
+import gzip
+import zlib
+from flask import Response, current_app, request, stream_with_context
+
+class ResponseCompressor:
+    """Gzips JSON bodies above COMPRESSION_MIN_SIZE and streams large JSON arrays"""
+
+    STREAM_CHUNK_SIZE = 16 * 1024  # Encoded JSON bytes gathered before each compress() call
+
+    def accepts_gzip(self):
+        return 'gzip' in request.accept_encodings
+
+    def _finish(self, rv, encoded):
+        rv.vary.add('Accept-Encoding')
+        if encoded:
+            rv.headers['Content-Encoding'] = 'gzip'
+        return rv
+
+    def compress_response(self, rv):
+        """after_request hook: compresses buffered JSON responses in one pass"""
+        if (rv.mimetype != 'application/json' or rv.direct_passthrough or rv.is_streamed
+                or 'Content-Encoding' in rv.headers or rv.status_code < 200 or rv.status_code >= 300):
+            return rv
+
+        data = rv.get_data()
+        if len(data) < current_app.config['COMPRESSION_MIN_SIZE']:
+            return rv
+        if not self.accepts_gzip():
+            return self._finish(rv, False)
+
+        rv.set_data(gzip.compress(data, compresslevel=current_app.config['COMPRESSION_LEVEL']))
+        return self._finish(rv, True)
+
+    def json_list(self, items, status=200):
+        """
+        Streams a JSON array built from an iterable of dicts.
+        Items are encoded and compressed incrementally, so the full JSON string is never held in memory.
+        Lists that stay under COMPRESSION_MIN_SIZE are sent as a normal, uncompressed response.
+        """
+        dumps = current_app.json.dumps
+        min_size = current_app.config['COMPRESSION_MIN_SIZE']
+        items = iter(items)
+
+        # Buffer until we know whether the payload is big enough to be worth compressing
+        head = []
+        size = 1
+        for item in items:
+            chunk = (',' if head else '[') + dumps(item)
+            head.append(chunk)
+            size += len(chunk)
+            if size >= min_size:
+                break
+        else:
+            body = ''.join(head) + ']' if head else '[]'
+            return Response(body, status=status, mimetype='application/json')
+
+        gzipped = self.accepts_gzip()
+        level = current_app.config['COMPRESSION_LEVEL']
+
+        def generate():
+            # wbits=31 emits a gzip container rather than a raw zlib stream
+            compressor = zlib.compressobj(level, zlib.DEFLATED, 31) if gzipped else None
+            pending = list(head)
+            pending_size = size
+
+            def emit(text):
+                data = text.encode('utf-8')
+                return compressor.compress(data) if compressor else data
+
+            for item in items:
+                chunk = ',' + dumps(item)
+                pending.append(chunk)
+                pending_size += len(chunk)
+                if pending_size >= self.STREAM_CHUNK_SIZE:
+                    out = emit(''.join(pending))
+                    pending, pending_size = [], 0
+                    if out:
+                        yield out
+
+            pending.append(']')
+            out = emit(''.join(pending))
+            if compressor:
+                out += compressor.flush()
+            yield out
+
+        rv = Response(stream_with_context(generate()), status=status, mimetype='application/json')
+        return self._finish(rv, gzipped)
+
+# Singleton instance
+compressor = ResponseCompressor()
@@ -0,0 +1,53 @@
+"""
+Shared pytest setup for the in-process tests.
+Every test module runs against one throwaway SQLite database (never the configured MySQL server),
+with a fresh schema and empty in-process caches, and can count the SQL it causes.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+# Set before any test module imports app, which reads it once at import time
+DATABASE_URL = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'tests.db')
+os.environ['DATABASE_URL'] = DATABASE_URL
+os.environ['BENCHMARK_DATABASE_URL'] = DATABASE_URL  # Lets benchmark.py drop and reload the same scratch file
+
+@pytest.fixture(scope='module', autouse=True)
+def database():
+    """Drops and recreates every table before each module, and forgets what the caches loaded"""
+    from app import app, db, stats_cache, bank_locations, donor_segments, donor_leaderboard
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+        db.create_all()
+    stats_cache.clear()
+    bank_locations.invalidate()
+    donor_segments.loaded = False
+    donor_leaderboard.invalidate()
+    yield
+
+@contextmanager
+def _recording(parameters=False):
+    from app import app, db
+    statements = []
+
+    def record(conn, cursor, statement, params, context, executemany):
+        statements.append((statement, params) if parameters else statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+@pytest.fixture
+def sql_statements():
+    """`with sql_statements() as statements:` collects the SQL executed inside the block
+    (as (statement, parameters) pairs with parameters=True)"""
+    return _recording
@@ -0,0 +1,294 @@
+"""
+Donor Segment Engine for BloodConnect
+In-memory bitmaps over donor IDs for targeted outreach queries
+(e.g. "active O- donors in Coimbatore eligible within a week")
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+class Bitmap:
+    """
+    Chunked bitset: IDs are split into 65536-wide chunks, each stored as one Python int.
+    Empty chunks are never stored, so sparse ID ranges stay small and set operations
+    only touch the chunks both sides share.
+    """
+
+    CHUNK_BITS = 16
+    LOW_MASK = (1 << CHUNK_BITS) - 1
+
+    __slots__ = ('chunks',)
+
+    def __init__(self, chunks=None):
+        self.chunks = chunks or {}
+
+    @classmethod
+    def of(cls, ids):
+        bitmap = cls()
+        for i in ids:
+            bitmap.add(i)
+        return bitmap
+
+    def add(self, i):
+        hi = i >> self.CHUNK_BITS
+        self.chunks[hi] = self.chunks.get(hi, 0) | (1 << (i & self.LOW_MASK))
+
+    def discard(self, i):
+        hi = i >> self.CHUNK_BITS
+        value = self.chunks.get(hi, 0) & ~(1 << (i & self.LOW_MASK))
+        if value:
+            self.chunks[hi] = value
+        else:
+            self.chunks.pop(hi, None)
+
+    def __contains__(self, i):
+        return bool(self.chunks.get(i >> self.CHUNK_BITS, 0) >> (i & self.LOW_MASK) & 1)
+
+    def __and__(self, other):
+        small, large = (self, other) if len(self.chunks) <= len(other.chunks) else (other, self)
+        chunks = {}
+        for hi, value in small.chunks.items():
+            value &= large.chunks.get(hi, 0)
+            if value:
+                chunks[hi] = value
+        return Bitmap(chunks)
+
+    def __or__(self, other):
+        chunks = dict(self.chunks)
+        for hi, value in other.chunks.items():
+            chunks[hi] = chunks.get(hi, 0) | value
+        return Bitmap(chunks)
+
+    def __sub__(self, other):
+        chunks = {}
+        for hi, value in self.chunks.items():
+            value &= ~other.chunks.get(hi, 0)
+            if value:
+                chunks[hi] = value
+        return Bitmap(chunks)
+
+    def __len__(self):
+        return sum(bin(value).count('1') for value in self.chunks.values())
+
+    def __iter__(self):
+        """Yields IDs in ascending order"""
+        for hi in sorted(self.chunks):
+            value = self.chunks[hi]
+            base = hi << self.CHUNK_BITS
+            while value:
+                lowest = value & -value
+                yield base | (lowest.bit_length() - 1)
+                value ^= lowest
+
+    def __bool__(self):
+        return bool(self.chunks)
+
+class DonorSegments:
+    """
+    Bitmap indexes on blood group, city, pincode prefix, donation type and account status,
+    plus eligibility buckets keyed by the day a donor may donate again.
+    Loaded from the database, then kept current with upsert() / record_donation() and
+    reloaded by refresh() once it is older than a TTL.
+    """
+
+    FIELDS = ('blood_group', 'city', 'pincode', 'donation_type', 'account_status')
+    DONATION_GAP_DAYS = 90  # Same wait period as the donor dashboard's next eligible date
+    NEVER_DONATED = 0  # Eligibility bucket for donors without an approved donation
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._load_lock = threading.Lock()  # One rebuild at a time; queries keep using the old bitmaps meanwhile
+        self.loaded = False
+        self.loaded_at = 0.0
+        self._reset()
+
+    def _reset(self):
+        self.indexes = {field: {} for field in self.FIELDS}
+        self.eligible_from = {}  # date ordinal (or NEVER_DONATED) -> Bitmap
+        self.folded_until = self.NEVER_DONATED  # Buckets up to this day live in one merged bitmap
+        self.donors = {}  # donor_id -> (index keys, eligibility bucket, last donation)
+        self.all = Bitmap()
+
+    @staticmethod
+    def _normalize(field, value):
+        if value is None:
+            return None
+        value = str(value).strip()
+        if not value:
+            return None
+        if field == 'city':
+            return value.lower()
+        if field == 'blood_group':
+            return value.upper()
+        return value
+
+    def _keys(self, donor):
+        keys = []
+        for field in self.FIELDS:
+            value = self._normalize(field, donor.get(field))
+            if value is None:
+                continue
+            if field == 'pincode':
+                # Every prefix, so '641' (a district) and '641001' (one office) both resolve
+                keys.extend(('pincode', value[:n]) for n in range(1, len(value) + 1))
+            else:
+                keys.append((field, value))
+        return keys
+
+    def _bucket(self, last_donation):
+        if last_donation is None:
+            return self.NEVER_DONATED
+        if isinstance(last_donation, datetime):
+            last_donation = last_donation.date()
+        return (last_donation + timedelta(days=self.DONATION_GAP_DAYS)).toordinal()
+
+    def _live_bucket(self, bucket):
+        """Key of the bitmap currently holding `bucket` (past days are folded into one)"""
+        if bucket != self.NEVER_DONATED and bucket <= self.folded_until:
+            return self.folded_until
+        return bucket
+
+    def _bucket_add(self, bucket, donor_id):
+        self.eligible_from.setdefault(self._live_bucket(bucket), Bitmap()).add(donor_id)
+
+    def _bucket_discard(self, bucket, donor_id):
+        key = self._live_bucket(bucket)
+        bitmap = self.eligible_from.get(key)
+        if bitmap is not None:
+            bitmap.discard(donor_id)
+            if not bitmap:
+                del self.eligible_from[key]
+
+    def _index(self, donor_id, keys, bucket):
+        for field, value in keys:
+            self.indexes[field].setdefault(value, Bitmap()).add(donor_id)
+        self._bucket_add(bucket, donor_id)
+        self.all.add(donor_id)
+
+    def _unindex(self, donor_id):
+        entry = self.donors.pop(donor_id, None)
+        if entry is None:
+            return None
+        keys, bucket, last_donation = entry
+        for field, value in keys:
+            bitmap = self.indexes[field].get(value)
+            if bitmap is not None:
+                bitmap.discard(donor_id)
+                if not bitmap:
+                    del self.indexes[field][value]
+        self._bucket_discard(bucket, donor_id)
+        self.all.discard(donor_id)
+        return last_donation
+
+    def load(self, donors, last_donations):
+        """Full rebuild from donor dicts (with 'id' and FIELDS) and {donor_id: last donation datetime}"""
+        with self._lock:
+            self._reset()
+            for donor in donors:
+                self._put(donor, last_donations.get(donor['id']))
+            self.loaded = True
+            self.loaded_at = time.monotonic()
+
+    def _fresh(self, ttl):
+        return self.loaded and time.monotonic() - self.loaded_at < ttl
+
+    def refresh(self, loader, ttl):
+        """
+        Rebuilds from loader() -> (donors, last_donations) when never loaded or loaded more than ttl seconds ago.
+        Row listeners only see this process's commits, so the TTL bounds how long other workers' writes are missed.
+        """
+        if not self._fresh(ttl):
+            with self._load_lock:
+                if not self._fresh(ttl):
+                    started = time.monotonic()
+                    self.load(*loader())
+                    self.loaded_at = started
+        return self
+
+    def _put(self, donor, last_donation):
+        keys = self._keys(donor)
+        bucket = self._bucket(last_donation)
+        self._index(donor['id'], keys, bucket)
+        self.donors[donor['id']] = (keys, bucket, last_donation)
+
+    def upsert(self, donor):
+        """Adds or re-indexes one donor dict, keeping its recorded last donation"""
+        with self._lock:
+            if not self.loaded:
+                return
+            last_donation = self._unindex(donor['id'])
+            self._put(donor, last_donation)
+
+    def remove(self, donor_id):
+        with self._lock:
+            if self.loaded:
+                self._unindex(donor_id)
+
+    def record_donation(self, donor_id, when):
+        """Moves a donor to the eligibility bucket of their latest donation"""
+        with self._lock:
+            entry = self.donors.get(donor_id) if self.loaded else None
+            if entry is None or when is None:
+                return
+            keys, bucket, last_donation = entry
+            if last_donation is not None and last_donation >= when:
+                return
+            self._bucket_discard(bucket, donor_id)
+            bucket = self._bucket(when)
+            self._bucket_add(bucket, donor_id)
+            self.donors[donor_id] = (keys, bucket, when)
+
+    def eligible_by(self, day):
+        """Donors whose wait period has ended on or before `day`"""
+        cutoff = day.toordinal()
+        with self._lock:
+            # Fold past buckets together so repeated queries union only a handful of bitmaps
+            today = datetime.utcnow().date().toordinal()
+            if today > self.folded_until:
+                merged = Bitmap()
+                for key in [k for k in self.eligible_from if k != self.NEVER_DONATED and k <= today]:
+                    merged = merged | self.eligible_from.pop(key)
+                if merged:
+                    self.eligible_from[today] = merged
+                self.folded_until = today
+
+            result = Bitmap()
+            for key, bitmap in self.eligible_from.items():
+                if key <= cutoff:
+                    result = result | bitmap
+            return result
+
+    def segment(self, blood_group=None, city=None, pincode_prefix=None, donation_type=None,
+                account_status='active', eligible_by=None):
+        """Intersects the requested indexes; None skips a filter. Returns a Bitmap of donor IDs."""
+        filters = [
+            ('blood_group', blood_group), ('city', city), ('pincode', pincode_prefix),
+            ('donation_type', donation_type), ('account_status', account_status)
+        ]
+        with self._lock:
+            bitmaps = []
+            for field, value in filters:
+                value = self._normalize(field, value)
+                if value is None:
+                    continue
+                bitmap = self.indexes[field].get(value)
+                if bitmap is None:
+                    return Bitmap()
+                bitmaps.append(bitmap)
+            if eligible_by is not None:
+                bitmaps.append(self.eligible_by(eligible_by))
+            if not bitmaps:
+                return Bitmap(dict(self.all.chunks))
+
+            # Smallest first keeps every intermediate result small
+            bitmaps.sort(key=lambda b: len(b.chunks))
+            result = bitmaps[0]
+            for bitmap in bitmaps[1:]:
+                result = result & bitmap
+                if not result:
+                    break
+            return result if len(bitmaps) > 1 else Bitmap(dict(result.chunks))
+
+# Singleton instance
+donor_segments = DonorSegments()
@@ -0,0 +1,116 @@
+"""
+Cache-Friendly File Serving for BloodConnect
+Content-hash ETags, conditional / Range responses and proxy offload for the frontend and uploads
+"""
+
+import os
+import re
+import hashlib
+import mimetypes
+from urllib.parse import quote
+from flask import Response, request, send_file
+from werkzeug.exceptions import NotFound
+from werkzeug.security import safe_join
+from asset_builder import AssetBuilder
+
+class CachedFileServer:
+    """Sends files with strong validators and a cache lifetime chosen from the file name"""
+
+    IMMUTABLE_MAX_AGE = 365 * 24 * 3600  # One year for content-hashed names
+
+    # name.<hash>.ext (asset build), <sha256> (report blobs) or <sha256>.ext (older report blobs);
+    # a plain hex name such as 12345678.pdf is an ordinary upload that may be replaced in place
+    FINGERPRINT_PATTERN = re.compile(
+        rf'^[^.].*\.([0-9a-f]{{{AssetBuilder.HASH_LENGTH}}})\.[A-Za-z0-9]+$|^([0-9a-f]{{64}})(?:\.[A-Za-z0-9]+)?$'
+    )
+
+    def __init__(self):
+        # path -> ((mtime_ns, size), etag) so unchanged files are hashed only once
+        self._etags = {}
+
+    def fingerprint(self, filename):
+        """Returns the content hash embedded in a file name, or None"""
+        match = self.FINGERPRINT_PATTERN.search(os.path.basename(filename))
+        return (match.group(1) or match.group(2)) if match else None
+
+    def etag_for(self, path, stat):
+        """Strong ETag derived from file content, cached until the file changes"""
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._etags.get(path)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(64 * 1024), b''):
+                digest.update(chunk)
+        etag = digest.hexdigest()[:32]
+        self._etags[path] = (version, etag)
+        return etag
+
+    def apply_cache_policy(self, rv, immutable, private=False):
+        """Fingerprinted files are cached for a year; everything else is revalidated with its ETag"""
+        if immutable:
+            rv.cache_control.no_cache = None
+            rv.cache_control.max_age = self.IMMUTABLE_MAX_AGE
+            rv.cache_control.immutable = True
+        else:
+            rv.cache_control.no_cache = True
+            rv.cache_control.max_age = 0
+        if private:
+            rv.cache_control.public = None
+            rv.cache_control.private = True
+        elif immutable:
+            rv.cache_control.public = True
+        return rv
+
+    def send(self, directory, filename, private=False, accel_location=None, precompressed=(), immutable=None,
+             mimetype=None):
+        """
+        Serves directory/filename with a content ETag, conditional GET and Range support.
+        Files listed in `precompressed` are sent as their .gz sibling when the client accepts gzip.
+        `immutable` overrides the name-based cache policy (e.g. a plain URL mapped onto a hashed file),
+        and `mimetype` the type guessed from the name.
+        With accel_location set (an internal proxy location mapped to `directory`), only the
+        headers are produced and the transfer is handed to the proxy via X-Accel-Redirect.
+        """
+        path = safe_join(directory, filename)
+        if path is None or not os.path.isfile(path):
+            raise NotFound()
+
+        stat = os.stat(path)
+        fingerprint = self.fingerprint(filename)
+        etag = fingerprint or self.etag_for(path, stat)
+        if immutable is None:
+            immutable = fingerprint is not None
+
+        mimetype = mimetype or mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        negotiated = filename in precompressed
+        encoding = 'gzip' if negotiated and 'gzip' in request.accept_encodings else None
+        served_name = filename
+        if encoding:
+            served_name = filename + '.gz'
+            path += '.gz'
+            etag += '-gzip'
+
+        if accel_location:
+            rv = Response(mimetype=mimetype)
+            rv.headers['X-Accel-Redirect'] = accel_location.rstrip('/') + '/' + quote(served_name)
+            rv.set_etag(etag)
+            rv.last_modified = stat.st_mtime
+            # Answer 304s here; the proxy handles Range for the file itself
+            rv = rv.make_conditional(request)
+            if rv.status_code == 304:
+                rv.headers.pop('X-Accel-Redirect', None)
+        else:
+            rv = send_file(path, mimetype=mimetype, download_name=os.path.basename(filename),
+                           etag=etag, conditional=True, last_modified=stat.st_mtime)
+
+        if encoding:
+            rv.headers['Content-Encoding'] = encoding
+        if negotiated:
+            rv.vary.add('Accept-Encoding')
+        return self.apply_cache_policy(rv, immutable=immutable, private=private)
+
+# Singleton instance
+file_server = CachedFileServer()
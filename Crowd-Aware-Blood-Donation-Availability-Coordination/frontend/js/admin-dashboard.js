@@ -84,12 +84,32 @@ document.addEventListener('DOMContentLoaded', function () {
     }
 });
 
+// Admin list endpoints return one page as a JSON array; totals and the next cursor come in headers
+function fetchPage(url) {
+    return fetch(url).then(res => res.json().then(items => ({
+        items: items,
+        total: parseInt(res.headers.get('X-Total-Count') || items.length, 10),
+        nextCursor: res.headers.get('X-Next-Cursor')
+    })));
+}
+
+function appendLoadMore(list, nextCursor, loadNext) {
+    if (!nextCursor) return;
+    const btn = document.createElement('button');
+    btn.className = 'btn-secondary btn-sm load-more';
+    btn.textContent = 'Load more';
+    btn.onclick = () => {
+        btn.remove();
+        loadNext(nextCursor);
+    };
+    list.appendChild(btn);
+}
+
 function loadTotalDonors() {
-    fetch('/api/users?role=donor')
-        .then(res => res.json())
-        .then(users => {
+    fetchPage('/api/users?role=donor&limit=1&fields=id')
+        .then(page => {
             const el = document.getElementById('totalDonorsCount');
-            if (el) el.textContent = users.length;
+            if (el) el.textContent = page.total;
         })
         .catch(err => console.error('Error loading donors:', err));
 }
@@ -168,38 +188,29 @@ function loadAllVerifications() {
     loadUsers('blood_bank', 'banksList'); // Banks Tab
 }
 
-function loadReports() {
+function loadReports(after) {
     const list = document.getElementById('reportsList');
     const statusFilter = document.getElementById('verificationFilter').value;
-    list.innerHTML = '<p>Loading...</p>';
+    if (!after) list.innerHTML = '<p>Loading...</p>';
 
-    fetch('/api/reports')
-        .then(response => response.json())
-        .then(reports => {
-            list.innerHTML = '';
+    const params = new URLSearchParams();
+    if (statusFilter !== 'all') params.set('status', statusFilter);
+    if (after) params.set('after', after);
 
-            // Calculate pending for stats regardless of filter
-            const pendingCount = reports.filter(r => r.status === 'pending').length;
-            dashboardStats.donors = pendingCount;
-            updateGlobalStats();
-            // document.querySelector('.stat-number:not(#pendingCount)').textContent = reports.length; // Approximate "Total Donors"
+    Promise.all([fetchPage(`/api/reports?${params}`), fetchPage('/api/reports?status=pending&limit=1&fields=id')])
+        .then(([page, pendingPage]) => {
+            if (!after) list.innerHTML = '';
 
-            // Filter for display
-            const filteredReports = reports.filter(r => {
-                if (statusFilter === 'all') return true;
-                return r.status === statusFilter;
-            });
+            // Pending count for stats regardless of filter
+            dashboardStats.donors = pendingPage.total;
+            updateGlobalStats();
 
-            if (filteredReports.length === 0) {
+            if (page.items.length === 0 && !after) {
                 list.innerHTML = '<p>No reports found.</p>';
                 return;
             }
 
-            let pending = 0;
-
-            filteredReports.forEach(report => {
-                if (report.status === 'pending') pending++;
-
+            page.items.forEach(report => {
                 const card = document.createElement('div');
                 card.className = 'report-card';
                 card.innerHTML = `
@@ -219,8 +230,8 @@ function loadReports() {
                 list.appendChild(card);
             });
 
-            // We could update a badge here if we had one
-            updateBadge('reportsList', pending);
+            updateBadge('reportsList', pendingPage.total);
+            appendLoadMore(list, page.nextCursor, loadReports);
         })
         .catch(error => {
             console.error('Error:', error);
@@ -228,40 +239,32 @@ function loadReports() {
         });
 }
 
-function loadUsers(role, containerId) {
+function loadUsers(role, containerId, after) {
     const list = document.getElementById(containerId);
     const statusFilter = document.getElementById('verificationFilter').value;
-    list.innerHTML = '<p>Loading...</p>';
+    if (!after) list.innerHTML = '<p>Loading...</p>';
 
-    fetch(`/api/users?role=${role}`)
-        .then(response => response.json())
-        .then(users => {
-            list.innerHTML = '';
+    const params = new URLSearchParams({ role: role });
+    // Map 'approved' filter to 'active' status in DB
+    if (statusFilter !== 'all') params.set('status', statusFilter === 'approved' ? 'active' : statusFilter);
+    if (after) params.set('after', after);
 
-            // Calculate pending for stats
-            const pendingCount = users.filter(u => u.account_status === 'pending').length;
-            if (role === 'hospital') dashboardStats.hospitals = pendingCount;
-            if (role === 'blood_bank') dashboardStats.banks = pendingCount;
-            updateGlobalStats();
+    Promise.all([fetchPage(`/api/users?${params}`), fetchPage(`/api/users?role=${role}&status=pending&limit=1&fields=id`)])
+        .then(([page, pendingPage]) => {
+            if (!after) list.innerHTML = '';
 
-            const filteredUsers = users.filter(u => {
-                if (statusFilter === 'all') return true;
-                // Map 'approved' filter to 'active' status in DB
-                const targetStatus = statusFilter === 'approved' ? 'active' : statusFilter;
-                return u.account_status === targetStatus;
-            });
+            // Pending count for stats
+            if (role === 'hospital') dashboardStats.hospitals = pendingPage.total;
+            if (role === 'blood_bank') dashboardStats.banks = pendingPage.total;
+            updateGlobalStats();
+            updateBadge(containerId, pendingPage.total);
 
-            if (filteredUsers.length === 0) {
+            if (page.items.length === 0 && !after) {
                 list.innerHTML = '<p>No records found.</p>';
-                if (statusFilter === 'pending') {
-                    updateBadge(containerId, 0);
-                }
                 return;
             }
 
-            let pendingCountTab = 0;
-            filteredUsers.forEach(user => {
-                if (user.account_status === 'pending') pendingCountTab++;
+            page.items.forEach(user => {
                 const card = document.createElement('div');
                 card.className = 'report-card';
                 card.innerHTML = `
@@ -279,7 +282,7 @@ function loadUsers(role, containerId) {
             `;
                 list.appendChild(card);
             });
-            updateBadge(containerId, pendingCountTab);
+            appendLoadMore(list, page.nextCursor, next => loadUsers(role, containerId, next));
         })
         .catch(error => {
             console.error('Error:', error);
@@ -416,20 +419,19 @@ function verifyReport(reportId, action) {
         });
 }
 
-function loadBloodRequests() {
+function loadBloodRequests(after) {
     const list = document.getElementById('bloodRequestsList');
-    list.innerHTML = '<p>Loading...</p>';
+    if (!after) list.innerHTML = '<p>Loading...</p>';
 
-    fetch('/api/admin/requests')
-        .then(response => response.json())
-        .then(requests => {
-            list.innerHTML = '';
-            if (requests.length === 0) {
+    fetchPage('/api/admin/requests' + (after ? `?after=${encodeURIComponent(after)}` : ''))
+        .then(page => {
+            if (!after) list.innerHTML = '';
+            if (page.items.length === 0 && !after) {
                 list.innerHTML = '<p>No pending requests.</p>';
                 return;
             }
 
-            requests.forEach(req => {
+            page.items.forEach(req => {
                 const card = document.createElement('div');
                 card.className = 'report-card';
                 card.innerHTML = `
@@ -450,6 +452,7 @@ function loadBloodRequests() {
             `;
                 list.appendChild(card);
             });
+            appendLoadMore(list, page.nextCursor, loadBloodRequests);
         })
         .catch(error => {
             console.error('Error:', error);
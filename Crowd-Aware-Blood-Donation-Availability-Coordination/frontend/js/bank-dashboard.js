@@ -1,19 +1,32 @@
 // Blood Bank Dashboard JavaScript - Database Connected
 
 document.addEventListener('DOMContentLoaded', function () {
-    // Load User Profile
-    loadUserProfile();
-
-    // Load Dashboard Data
+    // Load Dashboard Data (one bootstrap request fills every widget)
     const bankId = localStorage.getItem('user_id');
-    if (bankId) {
-        loadBankStats(bankId);
-        loadBankInventory(bankId); // Overview Widget
-        loadDetailedInventory(bankId); // Inventory Tab
-        loadCamps(bankId);
-        loadBankRequests(bankId);
-        loadBankDonations(bankId);
-        loadNetwork(bankId);
+    if (!bankId) {
+        loadUserProfile();
+    } else {
+        fetch(`/api/bank/bootstrap/${bankId}`)
+            .then(res => {
+                if (!res.ok) throw new Error(`Bootstrap failed (${res.status})`);
+                return res.json();
+            })
+            .then(data => loadDashboard(data))
+            .catch(err => {
+                console.error('Error loading dashboard bootstrap:', err);
+                loadDashboard({});
+            });
+    }
+
+    function loadDashboard(data) {
+        loadUserProfile(data.profile);
+        loadBankStats(bankId, data.stats);
+        loadBankInventory(bankId, data.inventory); // Overview Widget
+        loadDetailedInventory(bankId, data.inventory_details); // Inventory Tab
+        loadCamps(bankId, data.camps);
+        loadBankRequests(bankId, data.requests);
+        loadBankDonations(bankId, data.donations);
+        loadNetwork(bankId, data.banks);
     }
 
     // Wiring up Add Stock Button
@@ -58,15 +71,14 @@ document.addEventListener('DOMContentLoaded', function () {
         });
     }
 
-    function loadUserProfile() {
+    function loadUserProfile(preloaded) {
         const userId = localStorage.getItem('user_id');
         if (!userId) {
             window.location.href = 'login.html';
             return;
         }
 
-        fetch(`/api/user/${userId}`)
-            .then(res => res.json())
+        fetchJson(`/api/user/${userId}`, preloaded)
             .then(user => {
                 const nameElements = document.querySelectorAll('.user-name');
                 const locationElements = document.querySelectorAll('.user-blood, .user-location');
@@ -126,12 +138,17 @@ document.addEventListener('DOMContentLoaded', function () {
 
     // --- Data Loading Functions ---
 
-    function loadDetailedInventory(bankId) {
+    // Resolves with data already delivered by the dashboard bootstrap, or fetches it
+    function fetchJson(url, preloaded) {
+        if (preloaded !== undefined) return Promise.resolve(preloaded);
+        return fetch(url).then(res => res.json());
+    }
+
+    function loadDetailedInventory(bankId, preloaded) {
         const tbody = document.getElementById('inventoryTableBody');
         if (!tbody) return;
 
-        fetch(`/api/bank/inventory/details/${bankId}`)
-            .then(res => res.json())
+        fetchJson(`/api/bank/inventory/details/${bankId}`, preloaded)
             .then(data => {
                 tbody.innerHTML = '';
                 data.forEach(item => {
@@ -166,12 +183,11 @@ document.addEventListener('DOMContentLoaded', function () {
     // Global storage for camps to avoid passing complex objects in HTML
     window.campsMap = {};
 
-    function loadCamps(bankId) {
+    function loadCamps(bankId, preloaded) {
         const container = document.querySelector('.camps-grid');
         if (!container) return;
 
-        fetch('/api/campaigns')
-            .then(res => res.json())
+        fetchJson('/api/campaigns', preloaded)
             .then(camps => {
                 container.innerHTML = '';
 
@@ -296,12 +312,11 @@ document.addEventListener('DOMContentLoaded', function () {
             });
     };
 
-    function loadBankRequests(bankId) {
+    function loadBankRequests(bankId, preloaded) {
         const container = document.querySelector('.requests-list');
         if (!container) return;
 
-        fetch(`/api/bank/requests/${bankId}`)
-            .then(res => res.json())
+        fetchJson(`/api/bank/requests/${bankId}`, preloaded)
             .then(requests => {
                 container.innerHTML = '';
                 requests.forEach(req => {
@@ -360,12 +375,11 @@ document.addEventListener('DOMContentLoaded', function () {
             .catch(err => alert('Action failed: ' + err));
     };
 
-    function loadBankDonations(bankId) {
+    function loadBankDonations(bankId, preloaded) {
         const tbody = document.querySelector('#donations .data-table tbody');
         if (!tbody) return;
 
-        fetch(`/api/bank/donations/${bankId}`)
-            .then(res => res.json())
+        fetchJson(`/api/bank/donations/${bankId}`, preloaded)
             .then(donations => {
                 tbody.innerHTML = '';
                 donations.forEach(d => {
@@ -389,12 +403,11 @@ document.addEventListener('DOMContentLoaded', function () {
             });
     }
 
-    function loadNetwork(bankId) {
+    function loadNetwork(bankId, preloaded) {
         const grid = document.querySelector('.network-grid');
         if (!grid) return;
 
-        fetch('/api/banks')
-            .then(res => res.json())
+        fetchJson('/api/banks', preloaded)
             .then(banks => {
                 grid.innerHTML = '';
                 banks.forEach(bank => {
@@ -427,9 +440,8 @@ document.addEventListener('DOMContentLoaded', function () {
             });
     }
 
-    function loadBankStats(bankId) {
-        fetch(`/api/bank/stats/${bankId}`)
-            .then(res => res.json())
+    function loadBankStats(bankId, preloaded) {
+        fetchJson(`/api/bank/stats/${bankId}`, preloaded)
             .then(stats => {
                 // Update stat cards
                 const statCards = document.querySelectorAll('.stat-card .stat-number');
@@ -447,14 +459,13 @@ document.addEventListener('DOMContentLoaded', function () {
             .catch(err => console.error('Error loading stats:', err));
     }
 
-    function loadBankInventory(bankId) {
+    function loadBankInventory(bankId, preloaded) {
         const grid = document.querySelector('.blood-groups-grid');
         if (!grid) return;
 
         grid.innerHTML = '<p>Loading...</p>';
 
-        fetch(`/api/bank/inventory/${bankId}`)
-            .then(res => res.json())
+        fetchJson(`/api/bank/inventory/${bankId}`, preloaded)
             .then(data => {
                 grid.innerHTML = '';
                 const bloodGroups = ['A+', 'A-', 'B+', 'B-', 'AB+', 'AB-', 'O+', 'O-'];
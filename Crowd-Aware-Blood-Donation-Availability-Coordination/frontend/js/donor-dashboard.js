@@ -9,18 +9,36 @@ document.addEventListener('DOMContentLoaded', function () {
         return;
     }
 
-    // Initialize Dashboard
-    loadUserProfile(userId);
-    loadDonorStats(userId);
-    loadCampaigns(); // Loads for both dashboard widget and camps section
-    loadAppointments(userId);
-    loadNotifications(userId);
+    // Initialize Dashboard (one bootstrap request fills every widget)
+    fetch(`/api/donor/bootstrap/${userId}`)
+        .then(res => {
+            if (!res.ok) throw new Error(`Bootstrap failed (${res.status})`);
+            return res.json();
+        })
+        .then(data => loadDashboard(data))
+        .catch(err => {
+            console.error('Error loading dashboard bootstrap:', err);
+            loadDashboard({});
+        });
+
+    function loadDashboard(data) {
+        loadUserProfile(userId, data.profile);
+        loadDonorStats(userId, data.stats);
+        loadCampaigns(data.campaigns); // Loads for both dashboard widget and camps section
+        loadAppointments(userId, data.appointments);
+        loadNotifications(userId, data.notifications);
+    }
 
     // --- Data Loading Functions ---
 
-    function loadNotifications(id) {
-        fetch(`/api/notifications/${id}`)
-            .then(res => res.json())
+    // Resolves with data already delivered by the dashboard bootstrap, or fetches it
+    function fetchJson(url, preloaded) {
+        if (preloaded !== undefined) return Promise.resolve(preloaded);
+        return fetch(url).then(res => res.json());
+    }
+
+    function loadNotifications(id, preloaded) {
+        fetchJson(`/api/notifications/${id}`, preloaded)
             .then(notifs => {
                 const list = document.getElementById('notificationsList');
                 if (!list) return;
@@ -59,9 +77,8 @@ document.addEventListener('DOMContentLoaded', function () {
         }
     }
 
-    function loadUserProfile(id) {
-        fetch(`/api/user/${id}`)
-            .then(res => res.json())
+    function loadUserProfile(id, preloaded) {
+        fetchJson(`/api/user/${id}`, preloaded)
             .then(user => {
                 // Update Sidebar and Header
                 document.querySelectorAll('.user-name').forEach(el => el.textContent = user.username);
@@ -86,9 +103,8 @@ document.addEventListener('DOMContentLoaded', function () {
             .catch(err => console.error('Error loading profile:', err));
     }
 
-    function loadDonorStats(id) {
-        fetch(`/api/donor/stats/${id}`)
-            .then(res => res.json())
+    function loadDonorStats(id, preloaded) {
+        fetchJson(`/api/donor/stats/${id}`, preloaded)
             .then(stats => {
                 const statsGrid = document.getElementById('statsGrid');
                 if (statsGrid) {
@@ -143,10 +159,11 @@ document.addEventListener('DOMContentLoaded', function () {
             .catch(err => console.error('Error loading stats:', err));
     }
 
-    function loadCampaigns() {
-        fetch('/api/campaigns')
-            .then(res => res.json())
-            .then(camps => {
+    function loadCampaigns(preloaded) {
+        // Upcoming scheduled camps, filtered and paged by the server
+        fetchJson('/api/camps/discover', preloaded)
+            .then(page => {
+                const camps = page.camps;
                 // 1. Dashboard Widget List
                 const dashboardList = document.getElementById('dashboardCampList');
                 if (dashboardList) {
@@ -217,9 +234,8 @@ document.addEventListener('DOMContentLoaded', function () {
             .catch(err => console.error('Error loading camps:', err));
     }
 
-    function loadAppointments(id) {
-        fetch(`/api/appointments/${id}`)
-            .then(res => res.json())
+    function loadAppointments(id, preloaded) {
+        fetchJson(`/api/appointments/${id}`, preloaded)
             .then(appts => {
                 const upcomingList = document.getElementById('upcomingAppointmentsList');
                 const pastList = document.getElementById('pastAppointmentsList');
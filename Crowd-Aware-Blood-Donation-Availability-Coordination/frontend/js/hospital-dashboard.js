@@ -1,18 +1,31 @@
 // Hospital Dashboard JavaScript - Database Connected
 
 document.addEventListener('DOMContentLoaded', function () {
-    // Load User Profile
-    loadUserProfile();
-
-    // Load Dashboard Data
+    // Load Dashboard Data (one bootstrap request fills every widget)
     const hospitalId = localStorage.getItem('user_id');
-    if (hospitalId) {
-        loadHospitalStats(hospitalId);
-        loadActiveRequests(hospitalId);
+    if (!hospitalId) {
+        loadUserProfile();
+    } else {
+        fetch(`/api/hospital/bootstrap/${hospitalId}`)
+            .then(res => {
+                if (!res.ok) throw new Error(`Bootstrap failed (${res.status})`);
+                return res.json();
+            })
+            .then(data => loadDashboard(data))
+            .catch(err => {
+                console.error('Error loading dashboard bootstrap:', err);
+                loadDashboard({});
+            });
+    }
+
+    function loadDashboard(data) {
+        loadUserProfile(data.profile);
+        loadHospitalStats(hospitalId, data.stats);
+        loadActiveRequests(hospitalId, data.active_requests);
         loadQuickStockCheck();
-        loadAllRequests(hospitalId);
-        loadBloodBanks();
-        loadRequestHistory(hospitalId);
+        loadAllRequests(hospitalId, data.requests);
+        loadBloodBanks(data.banks);
+        loadRequestHistory(hospitalId, data.history);
     }
 
     // Emergency Request Button
@@ -139,15 +152,20 @@ document.addEventListener('DOMContentLoaded', function () {
 
     // --- Data Loading Functions ---
 
-    function loadUserProfile() {
+    // Resolves with data already delivered by the dashboard bootstrap, or fetches it
+    function fetchJson(url, preloaded) {
+        if (preloaded !== undefined) return Promise.resolve(preloaded);
+        return fetch(url).then(res => res.json());
+    }
+
+    function loadUserProfile(preloaded) {
         const userId = localStorage.getItem('user_id');
         if (!userId) {
             window.location.href = 'login.html';
             return;
         }
 
-        fetch(`/api/user/${userId}`)
-            .then(res => res.json())
+        fetchJson(`/api/user/${userId}`, preloaded)
             .then(user => {
                 const nameElements = document.querySelectorAll('.user-name');
                 const locationElements = document.querySelectorAll('.user-blood');
@@ -158,9 +176,8 @@ document.addEventListener('DOMContentLoaded', function () {
             .catch(err => console.error('Error loading profile:', err));
     }
 
-    function loadHospitalStats(hospitalId) {
-        fetch(`/api/hospital/stats/${hospitalId}`)
-            .then(res => res.json())
+    function loadHospitalStats(hospitalId, preloaded) {
+        fetchJson(`/api/hospital/stats/${hospitalId}`, preloaded)
             .then(stats => {
                 const statCards = document.querySelectorAll('.stat-card .stat-number');
                 if (statCards[0]) statCards[0].textContent = stats.active_requests || 0;
@@ -171,12 +188,11 @@ document.addEventListener('DOMContentLoaded', function () {
             .catch(err => console.error('Error loading stats:', err));
     }
 
-    function loadActiveRequests(hospitalId) {
+    function loadActiveRequests(hospitalId, preloaded) {
         const container = document.querySelector('.hospital-requests-list');
         if (!container) return;
 
-        fetch(`/api/hospital/requests/${hospitalId}?status=active`)
-            .then(res => res.json())
+        fetchJson(`/api/hospital/requests/${hospitalId}?status=active`, preloaded)
             .then(requests => {
                 container.innerHTML = '';
                 requests.forEach(req => {
@@ -213,12 +229,11 @@ document.addEventListener('DOMContentLoaded', function () {
         // Stock check is loaded on demand when user clicks the button
     }
 
-    function loadAllRequests(hospitalId) {
+    function loadAllRequests(hospitalId, preloaded) {
         const container = document.getElementById('allRequestsContainer');
         if (!container) return;
 
-        fetch(`/api/hospital/requests/${hospitalId}`)
-            .then(res => res.json())
+        fetchJson(`/api/hospital/requests/${hospitalId}`, preloaded)
             .then(requests => {
                 container.innerHTML = '';
                 requests.forEach(req => {
@@ -258,12 +273,11 @@ document.addEventListener('DOMContentLoaded', function () {
             });
     }
 
-    function loadBloodBanks() {
+    function loadBloodBanks(preloaded) {
         const grid = document.getElementById('bloodBanksGrid');
         if (!grid) return;
 
-        fetch('/api/banks')
-            .then(res => res.json())
+        fetchJson('/api/banks', preloaded)
             .then(banks => {
                 grid.innerHTML = '';
                 banks.forEach(bank => {
@@ -297,12 +311,11 @@ document.addEventListener('DOMContentLoaded', function () {
             });
     }
 
-    function loadRequestHistory(hospitalId) {
+    function loadRequestHistory(hospitalId, preloaded) {
         const tbody = document.getElementById('historyTableBody');
         if (!tbody) return;
 
-        fetch(`/api/hospital/requests/${hospitalId}?status=completed`)
-            .then(res => res.json())
+        fetchJson(`/api/hospital/requests/${hospitalId}?status=completed`, preloaded)
             .then(requests => {
                 tbody.innerHTML = '';
                 requests.forEach(req => {
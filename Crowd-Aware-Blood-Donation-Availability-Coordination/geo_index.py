@@ -0,0 +1,116 @@
+"""
+Geospatial Index for BloodConnect
+In-memory grid of bank coordinates for nearest-bank / radius searches
+"""
+
+import math
+import threading
+import time
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+MAX_RADIUS_KM = math.pi * EARTH_RADIUS_KM  # Half the circumference: every point on Earth is this close
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance between two points in kilometres"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+def parse_point(value):
+    """'12.97,77.59' -> (12.97, 77.59); raises ValueError for anything else"""
+    parts = [p.strip() for p in str(value).split(',')]
+    if len(parts) != 2:
+        raise ValueError("Expected 'lat,lon'")
+    lat, lon = float(parts[0]), float(parts[1])
+    if not (-90 <= lat <= 90 and -180 <= lon <= 180) or math.isnan(lat) or math.isnan(lon):
+        raise ValueError("Coordinates out of range")
+    return lat, lon
+
+def parse_radius(value):
+    """Radius in km, clamped to MAX_RADIUS_KM; raises ValueError unless finite and positive"""
+    radius = float(value)
+    if not math.isfinite(radius) or radius <= 0:
+        raise ValueError("Radius must be a positive number of kilometres")
+    return min(radius, MAX_RADIUS_KM)
+
+class GridIndex:
+    """Buckets points into fixed lat/lon cells; a radius query scans only the cells its bounding box covers"""
+
+    def __init__(self, points=(), cell_degrees=0.25):
+        self.cell_degrees = cell_degrees
+        self.cells = {}
+        self.size = 0
+        for key, lat, lon in points:
+            self.cells.setdefault(self._cell(lat, lon), []).append((key, lat, lon))
+            self.size += 1
+
+    def _cell(self, lat, lon):
+        return int(math.floor(lat / self.cell_degrees)), int(math.floor(lon / self.cell_degrees))
+
+    def within(self, lat, lon, radius_km):
+        """Returns [(key, distance_km)] for points within radius_km, nearest first"""
+        radius_km = parse_radius(radius_km)
+        dlat = min(radius_km / KM_PER_DEGREE_LAT, 180.0)
+        # Longitude degrees shrink towards the poles; clamp so the box stays finite
+        cos_lat = max(math.cos(math.radians(lat)), 0.01)
+        dlon = min(radius_km / (KM_PER_DEGREE_LAT * cos_lat), 180.0)
+
+        lat_lo, lon_lo = self._cell(lat - dlat, lon - dlon)
+        lat_hi, lon_hi = self._cell(lat + dlat, lon + dlon)
+        if (lat_hi - lat_lo + 1) * (lon_hi - lon_lo + 1) > self.size:
+            # A box wider than the point count costs more to walk than checking every point
+            candidates = (point for bucket in self.cells.values() for point in bucket)
+        else:
+            candidates = (point for cell_lat in range(lat_lo, lat_hi + 1) for cell_lon in range(lon_lo, lon_hi + 1)
+                          for point in self.cells.get((cell_lat, cell_lon), ()))
+        results = []
+        for key, plat, plon in candidates:
+            distance = haversine_km(lat, lon, plat, plon)
+            if distance <= radius_km:
+                results.append((key, distance))
+        results.sort(key=lambda item: item[1])
+        return results
+
+class GeoIndex:
+    """
+    Lazily (re)built GridIndex over rows from `loader`, an iterable of (key, lat, lon).
+    invalidate() marks it stale; the next query reloads, so bursts of writes cost one rebuild.
+    invalidate() only reaches this process, so an index older than `ttl` seconds is also reloaded
+    to pick up writes made by other workers.
+    """
+
+    def __init__(self, loader, cell_degrees=0.25, ttl=60):
+        self.loader = loader
+        self.cell_degrees = cell_degrees
+        self.ttl = ttl
+        self._index = None
+        self._loaded_at = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self, tables=None):
+        self._generation += 1
+        self._index = None
+
+    def _fresh(self, index):
+        return index is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    def get(self):
+        index = self._index
+        if not self._fresh(index):
+            with self._lock:
+                index = self._index
+                if not self._fresh(index):
+                    generation = self._generation
+                    loaded_at = time.monotonic()
+                    index = GridIndex(self.loader(), self.cell_degrees)
+                    # A write committed while loading leaves it stale; use it once, rebuild next time
+                    if generation == self._generation:
+                        self._index, self._loaded_at = index, loaded_at
+        return index
+
+    def within(self, lat, lon, radius_km):
+        return self.get().within(lat, lon, radius_km)
@@ -1,9 +1,10 @@
 from app import app, db, User
+from migrations import upgrade
 
 def init_db():
     with app.app_context():
-        # Create tables
-        db.create_all()
+        # Create or upgrade tables
+        upgrade()
         
         # Check if admin exists
         if not User.query.filter_by(role='admin').first():
@@ -0,0 +1,164 @@
+"""
+Donor Leaderboard for BloodConnect
+Sorted donation rankings per city, blood group and city + group, kept current incrementally
+"""
+
+import bisect
+import threading
+import time
+
+class DonorLeaderboard:
+    """
+    One sorted list of (-total_donations, donor_id) per board; index order is rank order.
+    Rank lookups are a bisect (O(log n)); top-N is a slice. Donors with no donations
+    are tracked (for their city / group) but not ranked.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._load_lock = threading.Lock()  # One rebuild at a time; lookups keep using the old boards meanwhile
+        self.loaded = False
+        self.loaded_at = 0.0
+        self._reset()
+
+    def _reset(self):
+        self.boards = {}  # scope tuple -> sorted list of (-count, donor_id)
+        self.donors = {}  # donor_id -> (count, city, blood_group)
+
+    @staticmethod
+    def scope(city=None, blood_group=None):
+        """Board key: ('all',), ('city', c), ('blood_group', g) or ('city_group', c, g)"""
+        city = (city or '').strip().lower() or None
+        blood_group = (blood_group or '').strip().upper() or None
+        if city and blood_group:
+            return ('city_group', city, blood_group)
+        if city:
+            return ('city', city)
+        if blood_group:
+            return ('blood_group', blood_group)
+        return ('all',)
+
+    def _scopes(self, city, blood_group):
+        scopes = {('all',), self.scope(city=city), self.scope(blood_group=blood_group),
+                  self.scope(city, blood_group)}
+        return scopes
+
+    def _insert(self, donor_id, count, city, blood_group):
+        if count <= 0:
+            return
+        for scope in self._scopes(city, blood_group):
+            bisect.insort(self.boards.setdefault(scope, []), (-count, donor_id))
+
+    def _delete(self, donor_id):
+        entry = self.donors.get(donor_id)
+        if entry is None or entry[0] <= 0:
+            return
+        count, city, blood_group = entry
+        key = (-count, donor_id)
+        for scope in self._scopes(city, blood_group):
+            board = self.boards.get(scope)
+            if not board:
+                continue
+            i = bisect.bisect_left(board, key)
+            if i < len(board) and board[i] == key:
+                del board[i]
+            if not board:
+                del self.boards[scope]
+
+    def load(self, rows):
+        """Full rebuild from (donor_id, total_donations, city, blood_group) rows"""
+        with self._lock:
+            self._reset()
+            members = {}
+            for donor_id, count, city, blood_group in rows:
+                count = count or 0
+                self.donors[donor_id] = (count, city, blood_group)
+                if count > 0:
+                    for scope in self._scopes(city, blood_group):
+                        members.setdefault(scope, []).append((-count, donor_id))
+            # Sorting each board once is cheaper than repeated inserts
+            self.boards = {scope: sorted(entries) for scope, entries in members.items()}
+            self.loaded = True
+            self.loaded_at = time.monotonic()
+
+    def _fresh(self, ttl):
+        return self.loaded and time.monotonic() - self.loaded_at < ttl
+
+    def refresh(self, loader, ttl):
+        """
+        Rebuilds from loader() -> rows when never loaded or loaded more than ttl seconds ago.
+        Row listeners only see this process's commits, so the TTL bounds how long other workers' writes are missed.
+        """
+        if not self._fresh(ttl):
+            with self._load_lock:
+                if not self._fresh(ttl):
+                    started = time.monotonic()
+                    self.load(loader())
+                    self.loaded_at = started
+        return self
+
+    def update(self, donor_id, count=None, city=None, blood_group=None, profile=False):
+        """
+        Re-ranks one donor. With profile=True only the count changes (city / group are kept);
+        otherwise city and blood group change and the count is kept.
+        """
+        with self._lock:
+            if not self.loaded:
+                return
+            old = self.donors.get(donor_id, (0, None, None))
+            if profile:
+                new = (count or 0, old[1], old[2])
+            else:
+                new = (old[0], city, blood_group)
+            if new == old and donor_id in self.donors:
+                return
+            self._delete(donor_id)
+            self.donors[donor_id] = new
+            self._insert(donor_id, *new)
+
+    def invalidate(self):
+        """Forces a rebuild on next use (after bulk writes that bypass update())"""
+        with self._lock:
+            self.loaded = False
+
+    def remove(self, donor_id):
+        with self._lock:
+            if self.loaded:
+                self._delete(donor_id)
+                self.donors.pop(donor_id, None)
+
+    def top(self, scope, n=10):
+        """[(rank, donor_id, total_donations)] with ties sharing a rank"""
+        with self._lock:
+            board = self.boards.get(scope, [])
+            result = []
+            for i, (neg_count, donor_id) in enumerate(board[:max(n, 0)]):
+                rank = i + 1
+                if result and result[-1][2] == -neg_count:
+                    rank = result[-1][0]
+                result.append((rank, donor_id, -neg_count))
+            return result
+
+    def rank(self, donor_id, scope):
+        """(rank, board size) for a donor, or (None, board size) when they have no donations there"""
+        with self._lock:
+            board = self.boards.get(scope, [])
+            entry = self.donors.get(donor_id)
+            if entry is None or entry[0] <= 0 or scope not in self._scopes(entry[1], entry[2]):
+                return None, len(board)
+            # Everyone with strictly more donations ranks ahead
+            return bisect.bisect_left(board, (-entry[0], float('-inf'))) + 1, len(board)
+
+    def scopes_for(self, donor_id):
+        """The four boards a donor belongs to, in display order"""
+        with self._lock:
+            _, city, blood_group = self.donors.get(donor_id, (0, None, None))
+        return [
+            ('overall', self.scope()),
+            ('city', self.scope(city=city)),
+            ('blood_group', self.scope(blood_group=blood_group)),
+            ('city_blood_group', self.scope(city, blood_group)),
+        ]
+
+# Singleton instance
+donor_leaderboard = DonorLeaderboard()
@@ -0,0 +1,65 @@
+import sys
+from app import app, db, User, VerificationEvent, verification_event_rows
+
+def migrate_verification_notes_batch(after_id, batch_size=500):
+    """
+    Moves the notes of up to batch_size users with IDs above after_id, without committing.
+    Returns (last user ID examined or None when none are left, users migrated, events written,
+    user IDs skipped). Unparseable blobs are left in place.
+    """
+    batch = db.session.query(User.id, User.ai_verification_notes).filter(
+        User.id > after_id,
+        User.ai_verification_notes.isnot(None)
+    ).order_by(User.id).limit(batch_size).all()
+    if not batch:
+        return None, 0, 0, []
+
+    events, moved, skipped = [], [], []
+    for user_id, notes in batch:
+        try:
+            events.extend(verification_event_rows(user_id, notes))
+        except (ValueError, TypeError, AttributeError):
+            skipped.append(user_id)
+            continue
+        moved.append(user_id)
+
+    if events:
+        db.session.execute(db.insert(VerificationEvent), events)
+    if moved:
+        db.session.execute(
+            db.update(User).where(User.id.in_(moved)).values(ai_verification_notes=None)
+            .execution_options(synchronize_session=False)
+        )
+    return batch[-1][0], len(moved), len(events), skipped
+
+def migrate_verification_notes(batch_size=500):
+    """
+    Splits every legacy User.ai_verification_notes blob into VerificationEvent rows.
+    Users are walked in primary-key order, batch_size per transaction; each batch clears the
+    blobs it moved, so an interrupted run simply resumes. Unparseable blobs are left in place.
+    Returns (users migrated, events written, user IDs skipped).
+    """
+    last_id = 0
+    migrated = written = 0
+    skipped = []
+    while True:
+        last_id, moved, events, batch_skipped = migrate_verification_notes_batch(last_id, batch_size)
+        if last_id is None:
+            break
+        db.session.commit()
+        migrated += moved
+        written += events
+        skipped.extend(batch_skipped)
+    return migrated, written, skipped
+
+if __name__ == "__main__":
+    # Optional users per batch (default 500)
+    batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    with app.app_context():
+        db.create_all()
+        print("Moving AI verification notes into the verification_event table...")
+        migrated, written, skipped = migrate_verification_notes(batch_size=batch_size)
+        print(f"- {migrated} users migrated, {written} events written")
+        if skipped:
+            print(f"- Left unreadable notes in place for user IDs: {', '.join(map(str, skipped))}")
+        print("Migration complete.")
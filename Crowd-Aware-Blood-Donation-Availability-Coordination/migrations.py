@@ -0,0 +1,292 @@
+"""
+Versioned Schema Migrations for BloodConnect
+Applies DDL and chunked data backfills in order, recording progress so a run can be throttled,
+stopped and resumed without taking the application down.
+
+Usage:
+    python migrations.py status
+    python migrations.py upgrade [batch_size] [pause_seconds] [max_seconds]
+    python migrations.py reset --yes     (development only: drops every table, then upgrades)
+"""
+
+import sys
+import time
+from datetime import datetime
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateColumn, CreateIndex
+from app import app, db, User, Report, BloodRequest, BloodInventory, Notification, Campaign, Appointment, \
+    AppointmentSlot, DonorProfile, VerificationEvent, InventorySnapshot
+from backfill_request_banks import backfill_request_banks_batch
+from migrate_verification_notes import migrate_verification_notes_batch
+
+class SchemaMigration(db.Model):
+    """One row per migration version; step / last_id are the resume point while it runs"""
+    version = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    name = db.Column(db.String(200), nullable=False)
+    step = db.Column(db.Integer, default=0, nullable=False)  # Steps already completed
+    last_id = db.Column(db.Integer, default=0, nullable=False)  # Backfill cursor within the current step
+    rows = db.Column(db.Integer, default=0, nullable=False)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow)
+    applied_at = db.Column(db.DateTime)  # NULL until every step has finished
+
+# --- DDL steps ---
+
+def _online(statement):
+    # InnoDB builds these in place while reads and writes continue
+    if db.engine.dialect.name == 'mysql':
+        return statement + ', ALGORITHM=INPLACE, LOCK=NONE' if statement.startswith('ALTER') \
+            else statement + ' ALGORITHM=INPLACE LOCK=NONE'
+    return statement
+
+def create_missing_tables(models):
+    """Creates the models' tables the database does not have yet (existing tables are left alone)"""
+    for model in models:
+        model.__table__.create(bind=db.engine, checkfirst=True)
+
+def create_tables(*models):
+    return lambda: create_missing_tables(models)
+
+def _add_column(table, column):
+    """ALTER TABLE ... ADD COLUMN with the column's full spec: type, NOT NULL, server default and FKs"""
+    dialect = db.engine.dialect
+    quote = dialect.identifier_preparer.quote
+    spec = str(CreateColumn(column).compile(dialect=dialect))
+    references = [(fk.column.table.name, fk.column.name) for fk in column.foreign_keys]
+    if dialect.name == 'sqlite':
+        # SQLite cannot add a constraint to an existing table, but accepts one inline on the new column
+        spec += ''.join(f' REFERENCES {quote(ref_table)} ({quote(ref_column)})' for ref_table, ref_column in references)
+        references = []
+    db.session.execute(text(_online(f'ALTER TABLE {quote(table.name)} ADD COLUMN {spec}')))
+    for ref_table, ref_column in references:
+        # Not _online(): InnoDB only adds a foreign key in place with foreign_key_checks off
+        db.session.execute(text(
+            f'ALTER TABLE {quote(table.name)} ADD CONSTRAINT {quote(f"fk_{table.name}_{column.name}")} '
+            f'FOREIGN KEY ({quote(column.name)}) REFERENCES {quote(ref_table)} ({quote(ref_column)})'))
+
+def add_missing_columns(model=None, names=None):
+    """create_all() never alters existing tables, so add model columns the live tables lack"""
+    inspector = inspect(db.session.connection())  # Same connection as the DDL that follows
+    existing_tables = set(inspector.get_table_names())
+    tables = [model.__table__] if model is not None else db.metadata.sorted_tables
+    added = []
+    for table in tables:
+        if table.name not in existing_tables:
+            continue
+        present = {col['name'] for col in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present or (names and column.name not in names):
+                continue
+            _add_column(table, column)
+            added.append(f"{table.name}.{column.name}")
+    db.session.commit()
+    return added
+
+def _index_names(inspector, table_name):
+    """Names of the table's indexes, including expression indexes the SQLite and MySQL inspectors skip"""
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        rows = db.session.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table"), {'table': table_name})
+    elif dialect == 'mysql':
+        rows = db.session.execute(text(
+            "SELECT DISTINCT index_name FROM information_schema.statistics "
+            "WHERE table_schema = DATABASE() AND table_name = :table"), {'table': table_name})
+    else:
+        return {index['name'] for index in inspector.get_indexes(table_name)}
+    return {name for (name,) in rows}
+
+def add_missing_indexes(model=None, names=None):
+    """Creates model indexes that existing tables were built without"""
+    inspector = inspect(db.session.connection())  # Same connection as the DDL that follows
+    existing_tables = set(inspector.get_table_names())
+    tables = [model.__table__] if model is not None else db.metadata.sorted_tables
+    added = []
+    for table in tables:
+        if table.name not in existing_tables:
+            continue
+        present = _index_names(inspector, table.name)
+        for index in table.indexes:
+            if index.name in present or (names and index.name not in names):
+                continue
+            ddl = str(CreateIndex(index).compile(dialect=db.engine.dialect))
+            db.session.execute(text(_online(ddl)))
+            added.append(index.name)
+    db.session.commit()
+    return added
+
+def drop_replaced_indexes(model, names):
+    """Drops indexes the model no longer declares because a newer index took their place (not logged as added)"""
+    inspector = inspect(db.session.connection())
+    present = _index_names(inspector, model.__tablename__)
+    quote = db.engine.dialect.identifier_preparer.quote
+    for name in names:
+        if name not in present:
+            continue
+        ddl = f'DROP INDEX {quote(name)}'
+        if db.engine.dialect.name == 'mysql':
+            ddl += f' ON {quote(model.__tablename__)}'
+        db.session.execute(text(_online(ddl)))
+    db.session.commit()
+
+def add_columns(model, *names):
+    return lambda: add_missing_columns(model, names)
+
+def add_indexes(model, *names):
+    return lambda: add_missing_indexes(model, names)
+
+def drop_indexes(model, *names):
+    return lambda: drop_replaced_indexes(model, names)
+
+# --- Backfill steps: batch(after_id, batch_size) -> (last ID examined or None when done, rows changed) ---
+
+def backfill_campaign_cities_batch(after_id, batch_size=1000):
+    """Camps created before Campaign.city existed take their organizer's city"""
+    camp_ids = [camp_id for (camp_id,) in db.session.query(Campaign.id).filter(
+        Campaign.id > after_id, Campaign.city.is_(None)
+    ).order_by(Campaign.id).limit(batch_size)]
+    if not camp_ids:
+        return None, 0
+    organizer_city = db.select(User.city).where(User.id == Campaign.organizer_id).scalar_subquery()
+    result = db.session.execute(
+        db.update(Campaign).where(Campaign.id.in_(camp_ids)).values(city=organizer_city)
+        .execution_options(synchronize_session=False)
+    )
+    return camp_ids[-1], result.rowcount
+
+def _verification_notes_batch(after_id, batch_size):
+    last_id, _, written, _ = migrate_verification_notes_batch(after_id, batch_size)
+    return last_id, written
+
+def _request_banks_batch(after_id, batch_size):
+    last_id, resolved, _ = backfill_request_banks_batch(after_id, batch_size)
+    return last_id, resolved
+
+class Backfill:
+    """A data step run in primary-key batches, one short transaction each"""
+
+    def __init__(self, batch):
+        self.batch = batch
+
+# Append only: a version that has been applied anywhere must never change, so every step
+# names the tables, columns and indexes it creates instead of following the current models
+MIGRATIONS = [
+    (1, "Baseline: create tables, add columns and indexes missing from pre-migration databases",
+     [create_tables(User, Report, BloodRequest, BloodInventory, Notification, Campaign, Appointment,
+                    AppointmentSlot, DonorProfile),
+      add_columns(User, 'latitude', 'longitude', 'created_at'), add_columns(Campaign, 'slot_capacity'),
+      add_indexes(User, 'ix_user_role_status', 'ix_user_city', 'ix_user_ai_status_score'),
+      add_indexes(Report, 'ix_report_status_id'), add_indexes(BloodRequest, 'ix_blood_request_status_date'),
+      add_indexes(Campaign, 'ix_campaign_status_date')]),
+    (2, "Campaign.city from the organizer's city",
+     [add_columns(Campaign, 'city'), Backfill(backfill_campaign_cities_batch),
+      add_indexes(Campaign, 'ix_campaign_city_status_date')]),
+    (3, "User.ai_verification_notes into verification_event rows",
+     [create_tables(VerificationEvent), Backfill(_verification_notes_batch)]),
+    (4, "BloodRequest.bank_id from the legacy blood_bank_id string",
+     [add_columns(BloodRequest, 'bank_id'), add_indexes(BloodRequest, 'ix_blood_request_bank_status_date'),
+      Backfill(_request_banks_batch)]),
+    (5, "InventorySnapshot table for daily stock history",
+     [create_tables(InventorySnapshot)]),
+    (6, "Case-insensitive camp city index on lower(city)",
+     [add_indexes(Campaign, 'ix_campaign_city_lower_status_date'), drop_indexes(Campaign, 'ix_campaign_city_status_date')]),
+]
+
+# --- Runner ---
+
+def _ensure_history():
+    SchemaMigration.__table__.create(bind=db.engine, checkfirst=True)
+
+def status():
+    """[(version, name, state)] where state is 'applied', 'pending' or 'running (step n, after id m)'"""
+    _ensure_history()
+    history = {m.version: m for m in SchemaMigration.query.all()}
+    result = []
+    for version, name, steps in MIGRATIONS:
+        record = history.get(version)
+        if record is None:
+            state = 'pending'
+        elif record.applied_at:
+            state = 'applied'
+        else:
+            state = f'running (step {record.step + 1} of {len(steps)}, after id {record.last_id})'
+        result.append((version, name, state))
+    return result
+
+def upgrade(target=None, batch_size=1000, pause=0.05, max_seconds=None, log=print):
+    """
+    Applies pending migrations up to target (default: all) in version order.
+    Backfills commit their progress with every batch and sleep `pause` seconds between batches.
+    With max_seconds the run stops after the batch that crosses the budget; the next run resumes
+    there. Returns True when everything up to target is applied.
+    """
+    _ensure_history()
+    deadline = time.monotonic() + max_seconds if max_seconds is not None else None
+    for version, name, steps in MIGRATIONS:
+        if target is not None and version > target:
+            break
+        record = db.session.get(SchemaMigration, version)
+        if record is not None and record.applied_at:
+            continue
+        if record is None:
+            record = SchemaMigration(version=version, name=name, step=0, last_id=0, rows=0)
+            db.session.add(record)
+            db.session.commit()
+        log(f"Migration {version}: {name}")
+
+        while record.step < len(steps):
+            step = steps[record.step]
+            if isinstance(step, Backfill):
+                while True:
+                    if deadline is not None and time.monotonic() >= deadline:
+                        log(f"- Paused at step {record.step + 1}, after id {record.last_id}")
+                        return False
+                    last_id, changed = step.batch(record.last_id, batch_size)
+                    if last_id is None:
+                        break
+                    # The batch and the cursor commit together, so a crash never skips or repeats rows
+                    record.last_id = last_id
+                    record.rows += changed
+                    db.session.commit()
+                    if pause:
+                        time.sleep(pause)
+                log(f"- Backfilled {record.rows} rows")
+            else:
+                result = step()
+                for item in result or []:
+                    log(f"- Added {item}")
+            record.step += 1
+            record.last_id = 0
+            db.session.commit()
+
+        record.applied_at = datetime.utcnow()
+        db.session.commit()
+    return True
+
+def reset():
+    """Development only: drops every table and rebuilds the schema through the migrations"""
+    db.drop_all()
+    upgrade(pause=0)
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else 'upgrade'
+    with app.app_context():
+        if command == 'status':
+            for version, name, state in status():
+                print(f"{version:>4}  {state:<10}  {name}")
+        elif command == 'upgrade':
+            # Optional rows per batch (default 1000), pause between batches (default 0.05s)
+            # and a time budget in seconds after which the run stops and can be resumed
+            batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+            pause = float(sys.argv[3]) if len(sys.argv) > 3 else 0.05
+            max_seconds = float(sys.argv[4]) if len(sys.argv) > 4 else None
+            if upgrade(batch_size=batch_size, pause=pause, max_seconds=max_seconds):
+                print("Database schema is up to date.")
+            else:
+                print("Stopped early; run upgrade again to resume.")
+        elif command == 'reset' and '--yes' in sys.argv:
+            print("Dropping all tables and rebuilding the schema...")
+            reset()
+            print("Database reset successfully. Run init_db.py to create the admin account.")
+        else:
+            print(__doc__)
+            sys.exit(1)
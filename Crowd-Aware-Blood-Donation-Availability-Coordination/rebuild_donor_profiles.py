@@ -0,0 +1,11 @@
+import sys
+from app import app, rebuild_donor_profiles
+
+if __name__ == "__main__":
+    # Optional insert batch size (default 1000)
+    batch_size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    with app.app_context():
+        print("Rebuilding donor profile counters from approved reports...")
+        count = rebuild_donor_profiles(batch_size=batch_size)
+        print(f"- {count} donor profiles written")
+        print("Rebuild complete.")
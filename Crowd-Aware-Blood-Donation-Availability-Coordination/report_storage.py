@@ -0,0 +1,138 @@
+"""
+Content-Addressed Report Storage for BloodConnect
+Streams uploaded medical reports to disk and deduplicates identical files
+"""
+
+import os
+import re
+import time
+import hashlib
+import mimetypes
+import tempfile
+from werkzeug.security import safe_join
+from werkzeug.utils import secure_filename
+
+class ReportStorage:
+    """
+    Stores uploads as uploads/<aa>/<bb>/<sha256> blobs shared by every report with the same content.
+    Reports reference a blob as <aa>/<bb>/<sha256><ext>, keeping the uploaded file's extension for its content type.
+    """
+
+    CHUNK_SIZE = 64 * 1024
+
+    # <sha256><ext> report names point at the <sha256> blob
+    REFERENCE_PATTERN = re.compile(r'^([0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64})\.[A-Za-z0-9]+$')
+
+    # Leading bytes of the report formats donors upload, checked before the extension
+    SIGNATURES = (
+        (b'%PDF-', 'application/pdf'),
+        (b'\x89PNG\r\n\x1a\n', 'image/png'),
+        (b'\xff\xd8\xff', 'image/jpeg'),
+        (b'GIF8', 'image/gif'),
+    )
+
+    def __init__(self, root, chunk_size=CHUNK_SIZE):
+        self.root = root
+        self.chunk_size = chunk_size
+        # Beside the root rather than in it, so half-written uploads are never served from /uploads
+        # (same filesystem, so os.replace stays atomic)
+        root = os.path.abspath(root)
+        self.tmp_dir = os.path.join(os.path.dirname(root), f'.{os.path.basename(root)}-tmp')
+        os.makedirs(self.root, exist_ok=True)
+        os.makedirs(self.tmp_dir, exist_ok=True)
+
+    def blob_name(self, digest):
+        """Relative, sharded blob path for a content hash"""
+        return f"{digest[:2]}/{digest[2:4]}/{digest}"
+
+    def resolve(self, filename):
+        """
+        Relative path on disk for a Report.filename: the file itself when it exists (older blobs
+        were stored with their extension, and legacy flat uploads), otherwise the shared blob.
+        """
+        path = safe_join(self.root, filename)
+        if path is not None and os.path.isfile(path):
+            return filename
+        match = self.REFERENCE_PATTERN.match(filename)
+        return match.group(1) if match else filename
+
+    def content_type(self, filename):
+        """MIME type sniffed from the blob's first bytes, else guessed from the report's extension, else None"""
+        path = safe_join(self.root, self.resolve(filename))
+        if path is None or not os.path.isfile(path):
+            return None
+        with open(path, 'rb') as f:
+            head = f.read(8)
+        sniffed = next((mimetype for signature, mimetype in self.SIGNATURES if head.startswith(signature)), None)
+        return sniffed or mimetypes.guess_type(filename)[0]
+
+    def save(self, file_storage):
+        """
+        Streams an uploaded file to disk in chunks while hashing it.
+        Returns the name to store in Report.filename (blob name plus the lower-cased extension);
+        identical content reuses the existing blob whatever the uploaded file was called.
+        """
+        ext = os.path.splitext(secure_filename(file_storage.filename or ''))[1].lower()
+        fd, tmp_path = tempfile.mkstemp(dir=self.tmp_dir)
+        digest = hashlib.sha256()
+        try:
+            with os.fdopen(fd, 'wb') as out:
+                while True:
+                    chunk = file_storage.stream.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    out.write(chunk)
+
+            blob = self.blob_name(digest.hexdigest())
+            path = os.path.join(self.root, blob)
+            if os.path.exists(path):
+                # Duplicate upload: drop the copy and refresh the blob so cleanup treats it as live
+                os.remove(tmp_path)
+                os.utime(path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp_path, path)
+            return blob + ext
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def iter_blobs(self):
+        """Yields (blob_name, absolute_path) for every blob in the sharded tree"""
+        for shard in sorted(os.listdir(self.root)):
+            shard_path = os.path.join(self.root, shard)
+            if len(shard) != 2 or not os.path.isdir(shard_path):
+                continue  # Skips legacy flat uploads
+            for sub in sorted(os.listdir(shard_path)):
+                sub_path = os.path.join(shard_path, sub)
+                if not os.path.isdir(sub_path):
+                    continue
+                for name in os.listdir(sub_path):
+                    yield f"{shard}/{sub}/{name}", os.path.join(sub_path, name)
+
+    def cleanup_orphans(self, referenced, grace_seconds=3600):
+        """
+        Deletes blobs not in `referenced` (a set of Report.filename values).
+        Blobs touched within grace_seconds are kept so uploads whose Report row
+        is not committed yet are never removed. Returns the number of blobs deleted.
+        """
+        cutoff = time.time() - grace_seconds
+        referenced = set(referenced) | {match.group(1) for match in map(self.REFERENCE_PATTERN.match, referenced) if match}
+        removed = 0
+        for blob, path in list(self.iter_blobs()):
+            if blob in referenced or os.path.getmtime(path) > cutoff:
+                continue
+            os.remove(path)
+            removed += 1
+            for directory in (os.path.dirname(path), os.path.dirname(os.path.dirname(path))):
+                if not os.listdir(directory):
+                    os.rmdir(directory)
+
+        # Abandoned temp files from interrupted uploads
+        for name in os.listdir(self.tmp_dir):
+            path = os.path.join(self.tmp_dir, name)
+            if os.path.getmtime(path) <= cutoff:
+                os.remove(path)
+        return removed
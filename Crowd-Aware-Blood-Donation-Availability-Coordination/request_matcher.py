@@ -0,0 +1,168 @@
+"""
+Request-to-Bank Matching for BloodConnect
+Scores every bank for a blood request with numpy and builds a ranked allocation plan
+"""
+
+import numpy as np
+
+BLOOD_GROUPS = ['A+', 'A-', 'B+', 'B-', 'AB+', 'AB-', 'O+', 'O-']
+GROUP_INDEX = {bg: i for i, bg in enumerate(BLOOD_GROUPS)}
+
+# Red cell donors each recipient group can receive from
+_DONORS = {
+    'A+': ['A+', 'A-', 'O+', 'O-'],
+    'A-': ['A-', 'O-'],
+    'B+': ['B+', 'B-', 'O+', 'O-'],
+    'B-': ['B-', 'O-'],
+    'AB+': BLOOD_GROUPS,
+    'AB-': ['AB-', 'A-', 'B-', 'O-'],
+    'O+': ['O+', 'O-'],
+    'O-': ['O-'],
+}
+
+def _build_matrices():
+    """
+    COMPATIBLE[recipient, donor] is True when the donor group can be transfused.
+    PREFERENCE ranks compatible donors: the exact group first and the scarce
+    universal O- last, so substitutions keep rare stock for patients who need it.
+    """
+    n = len(BLOOD_GROUPS)
+    compatible = np.zeros((n, n), dtype=bool)
+    preference = np.zeros((n, n))
+    for recipient, donors in _DONORS.items():
+        r = GROUP_INDEX[recipient]
+        for donor in donors:
+            d = GROUP_INDEX[donor]
+            compatible[r, d] = True
+            if donor == recipient:
+                preference[r, d] = 1.0
+            elif donor == 'O-':
+                preference[r, d] = 0.4
+            else:
+                preference[r, d] = 0.7
+    return compatible, preference
+
+COMPATIBLE, PREFERENCE = _build_matrices()
+
+EARTH_RADIUS_KM = 6371.0088
+
+class BankSnapshot:
+    """
+    Column-oriented view of the bank network: one row per bank.
+    stock / expiring are (banks x 8) unit counts of usable and soon-to-expire blood.
+    """
+
+    def __init__(self, bank_ids, names, cities, lat, lon, stock, expiring, pending):
+        self.bank_ids = np.asarray(bank_ids, dtype=np.int64)
+        self.names = list(names)
+        self.cities = list(cities)
+        self.lat = np.asarray(lat, dtype=float)
+        self.lon = np.asarray(lon, dtype=float)
+        self.stock = np.asarray(stock, dtype=float).reshape(len(self.bank_ids), len(BLOOD_GROUPS))
+        self.expiring = np.asarray(expiring, dtype=float).reshape(self.stock.shape)
+        self.pending = np.asarray(pending, dtype=float)
+
+    def __len__(self):
+        return len(self.bank_ids)
+
+class RequestMatcher:
+    """Weighted multi-factor scoring; weights shift towards distance for emergencies"""
+
+    WEIGHTS = {
+        #            coverage, preferred, expiry, distance, load
+        'emergency': (0.30, 0.10, 0.05, 0.45, 0.10),
+        'urgent':    (0.30, 0.15, 0.10, 0.30, 0.15),
+        'routine':   (0.25, 0.20, 0.20, 0.15, 0.20),
+    }
+    DISTANCE_SCALE_KM = 25.0  # Distance at which the distance score halves
+    UNKNOWN_DISTANCE_SCORE = 0.5  # Banks or hospitals without coordinates
+
+    def distances_km(self, snapshot, lat, lon):
+        """Vectorised haversine from one point to every bank (NaN where a bank has no coordinates)"""
+        phi1 = np.radians(lat)
+        phi2 = np.radians(snapshot.lat)
+        dphi = phi2 - phi1
+        dlambda = np.radians(snapshot.lon - lon)
+        a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+
+    def score(self, snapshot, blood_group, units, priority='routine', lat=None, lon=None):
+        """Returns (scores, compatible_units, distances); banks without compatible stock score -inf"""
+        r = GROUP_INDEX[blood_group]
+        units = max(int(units), 1)
+        w_cov, w_pref, w_exp, w_dist, w_load = self.WEIGHTS.get(priority, self.WEIGHTS['routine'])
+
+        compatible_units = snapshot.stock @ COMPATIBLE[r]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            coverage = np.minimum(compatible_units / units, 1.0)
+            # Share of the usable stock that is the preferred groups / close to expiry
+            preferred = np.nan_to_num((snapshot.stock @ PREFERENCE[r]) / compatible_units)
+            expiry = np.nan_to_num((snapshot.expiring @ COMPATIBLE[r]) / compatible_units)
+
+        if lat is None or lon is None:
+            distances = np.full(len(snapshot), np.nan)
+        else:
+            distances = self.distances_km(snapshot, lat, lon)
+        distance_score = np.where(np.isnan(distances), self.UNKNOWN_DISTANCE_SCORE,
+                                  1.0 / (1.0 + np.nan_to_num(distances) / self.DISTANCE_SCALE_KM))
+
+        max_pending = snapshot.pending.max() if len(snapshot) else 0
+        load_score = 1.0 - snapshot.pending / (max_pending + 1.0)
+
+        scores = (w_cov * coverage + w_pref * preferred + w_exp * expiry
+                  + w_dist * distance_score + w_load * load_score)
+        scores = np.where(compatible_units > 0, scores, -np.inf)
+        return scores, compatible_units, distances
+
+    def plan(self, snapshot, blood_group, units, priority='routine', lat=None, lon=None, limit=10):
+        """
+        Ranks banks and allocates the requested units greedily down the ranking.
+        Each bank gives its preferred compatible groups first (exact, then others, O- last).
+        The top `limit` banks are always listed, plus any lower-ranked bank the plan draws on.
+        """
+        r = GROUP_INDEX[blood_group]
+        units = max(int(units), 1)
+        scores, compatible_units, distances = self.score(snapshot, blood_group, units, priority, lat, lon)
+
+        viable = np.flatnonzero(np.isfinite(scores))
+        # Highest score first; argsort on the negated scores is stable for ties
+        ranked = viable[np.argsort(-scores[viable], kind='stable')]
+
+        donor_order = [d for d in np.argsort(-PREFERENCE[r], kind='stable') if COMPATIBLE[r, d]]
+        remaining = units
+        candidates = []
+        for i in ranked:
+            if remaining == 0 and len(candidates) >= limit:
+                break
+            allocations = []
+            if remaining > 0:
+                for d in donor_order:
+                    take = int(min(snapshot.stock[i, d], remaining))
+                    if take > 0:
+                        allocations.append({"blood_group": BLOOD_GROUPS[d], "units": take})
+                        remaining -= take
+                    if remaining == 0:
+                        break
+            if len(candidates) >= limit and not allocations:
+                continue
+            candidates.append({
+                "bank_id": int(snapshot.bank_ids[i]),
+                "bank_name": snapshot.names[i],
+                "city": snapshot.cities[i],
+                "score": round(float(scores[i]), 4),
+                "compatible_units": int(compatible_units[i]),
+                "distance_km": None if np.isnan(distances[i]) else round(float(distances[i]), 2),
+                "pending_requests": int(snapshot.pending[i]),
+                "allocations": allocations
+            })
+
+        return {
+            "blood_group": blood_group,
+            "units_requested": units,
+            "units_allocated": units - remaining,
+            "fully_allocated": remaining == 0,
+            "banks": candidates
+        }
+
+# Singleton instance
+request_matcher = RequestMatcher()
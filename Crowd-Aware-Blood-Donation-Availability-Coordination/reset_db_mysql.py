@@ -1,12 +0,0 @@
-from app import app, db
-
-def reset_db():
-    with app.app_context():
-        print("Dropping all tables...")
-        db.drop_all()
-        print("Creating all tables...")
-        db.create_all()
-        print("Database reset successfully.")
-
-if __name__ == "__main__":
-    reset_db()
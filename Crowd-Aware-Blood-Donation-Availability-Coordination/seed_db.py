@@ -1,4 +1,4 @@
-from app import app, db, User, Report, BloodRequest
+from app import app, db, User, Report, BloodRequest, rebuild_donor_profiles
 from datetime import datetime, timedelta
 
 def seed_db():
@@ -123,6 +123,8 @@ def seed_db():
                 db.session.add(expiring_stock)
 
         db.session.commit()
+        # Seeded reports bypass verify_report, so derive the donor counters from them
+        rebuild_donor_profiles()
         print("Database seeded successfully.")
 
 if __name__ == "__main__":
@@ -0,0 +1,11 @@
+from app import app, snapshot_inventory
+
+# Run once a day, shortly before midnight UTC, e.g. from cron:
+#   55 23 * * * cd /path/to/app && python snapshot_inventory.py
+# Only today's stock can be measured, so a missed day stays a gap in the trend.
+if __name__ == "__main__":
+    with app.app_context():
+        print("Recording daily inventory snapshot...")
+        count = snapshot_inventory()
+        print(f"- {count} bank / blood group rows written")
+        print("Snapshot complete.")
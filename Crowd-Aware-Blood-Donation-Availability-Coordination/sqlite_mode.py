@@ -0,0 +1,65 @@
+"""
+SQLite Deployment Mode for BloodConnect
+Tuned WAL settings for small banks and offline camp laptops running on a single SQLite file
+"""
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+class SQLiteMode:
+    """
+    Engine options and per-connection PRAGMAs for SQLite deployments.
+    WAL lets readers run alongside the single writer, and synchronous=NORMAL fsyncs only at
+    checkpoints (an application crash loses nothing; a power cut can lose the last commits).
+    Connections are pooled rather than opened per request, so each one's page cache and
+    mmap stay warm; a thread holds its own connection for the length of a request.
+    """
+
+    PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 256 * 1024 * 1024,  # Bytes of the file read through the page cache mapping
+        'cache_size': -32000,  # Negative is KiB: ~32 MB page cache per connection
+        'temp_store': 'MEMORY',
+        'wal_autocheckpoint': 1000,  # Pages
+    }
+
+    def __init__(self, busy_timeout_ms=5000, pool_size=16, pragmas=None):
+        self.busy_timeout_ms = busy_timeout_ms
+        self.pool_size = pool_size
+        self.pragmas = dict(self.PRAGMAS if pragmas is None else pragmas)
+
+    @staticmethod
+    def applies_to(uri):
+        """True for file-backed SQLite URIs (in-memory databases cannot use WAL)"""
+        url = make_url(uri)
+        return url.get_backend_name() == 'sqlite' and url.database not in (None, '', ':memory:')
+
+    def engine_options(self):
+        """SQLALCHEMY_ENGINE_OPTIONS: a connection per concurrent thread, waiting on locks instead of failing"""
+        return {
+            'poolclass': QueuePool,
+            'pool_size': self.pool_size,  # Connections kept open between requests
+            'max_overflow': self.pool_size,  # Extra connections for bursts, closed when returned
+            'pool_pre_ping': False,  # A local file cannot drop the connection
+            # Pooled connections move between request threads, but only one thread uses each at a time
+            'connect_args': {'timeout': self.busy_timeout_ms / 1000, 'check_same_thread': False},
+        }
+
+    def on_connect(self, dbapi_connection, connection_record):
+        """Engine 'connect' listener applying the PRAGMAs to every new connection"""
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute(f'PRAGMA busy_timeout = {int(self.busy_timeout_ms)}')
+            for name, value in self.pragmas.items():
+                cursor.execute(f'PRAGMA {name} = {value}')
+        finally:
+            cursor.close()
+
+    def settings(self, connection):
+        """Current values of the tuned PRAGMAs on a connection, for status checks"""
+        names = ['busy_timeout', *self.pragmas]
+        return {name: connection.exec_driver_sql(f'PRAGMA {name}').scalar() for name in names}
+
+# Singleton instance
+sqlite_mode = SQLiteMode()
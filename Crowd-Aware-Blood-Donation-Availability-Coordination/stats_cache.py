@@ -0,0 +1,68 @@
+"""
+Statistics Cache for BloodConnect
+Short-lived cache for aggregate dashboard stats, invalidated when the tables they read are committed
+"""
+
+import time
+import threading
+from flask import current_app
+
+class StatsCache:
+    """
+    Caches computed stats per key until the TTL expires or a commit touches one of the key's tables.
+    Holds at most STATS_CACHE_MAX_ENTRIES keys: inserting past the cap drops expired entries, then the oldest.
+    """
+
+    DEFAULT_TTL = 30  # Seconds
+    DEFAULT_MAX_ENTRIES = 1024
+
+    def __init__(self):
+        # key -> (expires_at, tables, value)
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, tables, compute, ttl=None):
+        """Returns the cached value for key, calling compute() when it is missing or stale"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and entry[0] > now:
+            return entry[2]
+
+        value = compute()
+        if ttl is None:
+            ttl = current_app.config.get('STATS_CACHE_TTL', self.DEFAULT_TTL)
+        max_entries = current_app.config.get('STATS_CACHE_MAX_ENTRIES', self.DEFAULT_MAX_ENTRIES)
+        with self._lock:
+            self._entries.pop(key, None)  # Re-inserted at the end, so insertion order stays oldest first
+            self._entries[key] = (now + ttl, frozenset(tables), value)
+            if len(self._entries) > max_entries:
+                self._evict(now, max_entries)
+        return value
+
+    def _evict(self, now, max_entries):
+        for key in [k for k, entry in self._entries.items() if entry[0] <= now]:
+            del self._entries[key]
+        while len(self._entries) > max_entries:
+            del self._entries[next(iter(self._entries))]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def invalidate(self, tables):
+        """Drops every entry that depends on one of the given table names"""
+        tables = set(tables)
+        with self._lock:
+            for key in [k for k, entry in self._entries.items() if entry[1] & tables]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def track(self, tracker):
+        """Invalidates entries from a CommitTracker's committed table changes"""
+        tracker.listen(None, self.invalidate)
+
+# Singleton instance
+stats_cache = StatsCache()
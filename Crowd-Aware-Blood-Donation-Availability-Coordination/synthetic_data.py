@@ -0,0 +1,362 @@
+"""
+Synthetic Dataset Loader for BloodConnect
+Generates production-sized banks, hospitals, donors, blood bags, requests, appointments and
+notifications with realistic distributions, written through bulk inserts for benchmarking.
+
+Usage:
+    python synthetic_data.py [scale] [seed] [--native]
+
+scale 1 is roughly 60k rows; scale 100 is roughly 6 million. --native uses MySQL's
+LOAD DATA LOCAL INFILE (the server must allow local_infile) instead of multi-row INSERTs.
+"""
+
+import bisect
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from itertools import accumulate, islice
+from sqlalchemy import create_engine
+from werkzeug.security import generate_password_hash
+from app import app, db, User, Report, BloodRequest, BloodInventory, Notification, Campaign, Appointment, \
+    rebuild_donor_profiles
+
+# Rows per scale unit
+SCALE_COUNTS = {
+    'banks': 10,
+    'hospitals': 25,
+    'donors': 5000,
+    'camps': 40,
+    'bags': 8000,
+    'requests': 3000,
+    'appointments': 12000,
+    'notifications': 20000,
+}
+
+# (city, state, latitude, longitude); earlier cities are bigger (weights fall off as 1/rank)
+CITIES = [
+    ('Bangalore', 'Karnataka', 12.9716, 77.5946),
+    ('Chennai', 'Tamil Nadu', 13.0827, 80.2707),
+    ('Hyderabad', 'Telangana', 17.3850, 78.4867),
+    ('Mumbai', 'Maharashtra', 19.0760, 72.8777),
+    ('Delhi', 'Delhi', 28.6139, 77.2090),
+    ('Pune', 'Maharashtra', 18.5204, 73.8567),
+    ('Kolkata', 'West Bengal', 22.5726, 88.3639),
+    ('Coimbatore', 'Tamil Nadu', 11.0168, 76.9558),
+    ('Mysore', 'Karnataka', 12.2958, 76.6394),
+    ('Mandya', 'Karnataka', 12.5218, 76.8951),
+]
+CITY_WEIGHTS = [1 / rank for rank in range(1, len(CITIES) + 1)]
+
+# Approximate ABO / Rh distribution of the Indian donor population
+BLOOD_GROUPS = [('O+', 31), ('B+', 30), ('A+', 22), ('AB+', 8), ('O-', 4), ('B-', 2), ('A-', 2), ('AB-', 1)]
+
+TIME_SLOTS = ['09:00', '10:00', '11:00', '12:00', '14:00', '15:00', '16:00']
+REQUEST_REASONS = ['Surgery', 'Accident', 'Anaemia', 'Thalassemia', 'Dengue', 'Delivery', 'Cancer treatment']
+NOTIFICATION_TYPES = [('info', 50), ('shortage', 20), ('urgent', 12), ('expiry', 10), ('emergency', 5), ('warning', 3)]
+
+class _Picker:
+    """Weighted choice with the cumulative weights computed once"""
+
+    def __init__(self, items, weights):
+        self.items = list(items)
+        self.cumulative = list(accumulate(weights))
+        self.total = self.cumulative[-1]
+
+    def __call__(self, rng):
+        return self.items[bisect.bisect(self.cumulative, rng.random() * self.total)]
+
+class SyntheticDataset:
+    """
+    Deterministic (per seed) row generators. Primary keys are assigned up front from each table's
+    current MAX(id), so related rows reference each other without reading IDs back.
+    """
+
+    def __init__(self, scale=1, seed=42, now=None):
+        self.scale = scale
+        self.counts = {name: max(1, int(round(count * scale))) for name, count in SCALE_COUNTS.items()}
+        self.rng = random.Random(seed)
+        self.now = now or datetime.utcnow().replace(microsecond=0)
+        self.city = _Picker(range(len(CITIES)), CITY_WEIGHTS)
+        self.blood_group = _Picker([g for g, _ in BLOOD_GROUPS], [w for _, w in BLOOD_GROUPS])
+        self.notification_type = _Picker([t for t, _ in NOTIFICATION_TYPES], [w for _, w in NOTIFICATION_TYPES])
+        self.password_hash = generate_password_hash('password')  # One hash; scrypt per row would dominate
+
+    def _past(self, days, skew=1.0):
+        # skew > 1 crowds timestamps towards now, as recent activity outweighs old history
+        return self.now - timedelta(seconds=int(days * 86400 * self.rng.random() ** skew))
+
+    def _jitter(self, value, spread=0.15):
+        return round(value + self.rng.uniform(-spread, spread), 6)
+
+    def plan(self, start_ids):
+        """Assigns ID ranges given {table name: first free id}; returns the loader's table list"""
+        user_id = start_ids['user']
+        self.bank_ids = range(user_id, user_id + self.counts['banks'])
+        self.hospital_ids = range(self.bank_ids.stop, self.bank_ids.stop + self.counts['hospitals'])
+        self.donor_ids = range(self.hospital_ids.stop, self.hospital_ids.stop + self.counts['donors'])
+        self.camp_ids = range(start_ids['campaign'], start_ids['campaign'] + self.counts['camps'])
+        self.start_ids = start_ids
+
+        # Cities are drawn here so bags, requests and bookings can prefer local banks
+        rng = self.rng
+        self.user_city = {user_id: self.city(rng) for user_id in
+                          [*self.bank_ids, *self.hospital_ids, *self.donor_ids]}
+        self.banks_by_city = {}
+        for bank_id in self.bank_ids:
+            self.banks_by_city.setdefault(self.user_city[bank_id], []).append(bank_id)
+        self.camp_dates = {}
+
+        # A few donors do most of the donating (long-tailed activity)
+        self.active_donor = _Picker(self.donor_ids, [1 / (rank + 10) ** 0.8 for rank in range(len(self.donor_ids))])
+        self.busy_bank = _Picker(self.bank_ids, [rng.uniform(0.2, 1.0) for _ in self.bank_ids])
+        self.busy_hospital = _Picker(self.hospital_ids, [rng.uniform(0.2, 1.0) for _ in self.hospital_ids])
+        self.completed = []  # (donor_id, date) of completed appointments, for the matching reports
+
+        return [
+            (User, ['id', 'username', 'email', 'password_hash', 'role', 'donation_type', 'phone', 'blood_group',
+                    'account_status', 'address', 'city', 'state', 'pincode', 'license_id', 'registration_id',
+                    'operating_hours', 'capacity', 'hospital_type', 'latitude', 'longitude', 'created_at',
+                    'ai_verification_status', 'ai_confidence_score'], self.users),
+            (Campaign, ['id', 'organizer_id', 'name', 'location', 'city', 'date', 'start_time', 'end_time',
+                        'status', 'target_blood_groups', 'created_at'], self.camps),
+            (BloodInventory, ['id', 'bank_id', 'blood_group', 'units', 'expiry_date', 'added_date'], self.bags),
+            (BloodRequest, ['id', 'hospital_id', 'patient_name', 'patient_id', 'blood_group', 'units', 'priority',
+                            'reason', 'blood_bank_id', 'bank_id', 'status', 'request_date'], self.requests),
+            (Appointment, ['id', 'donor_id', 'camp_id', 'bank_id', 'date', 'time_slot', 'status', 'created_at'],
+             self.appointments),
+            (Report, ['id', 'donor_id', 'filename', 'upload_date', 'status'], self.reports),
+            (Notification, ['id', 'user_id', 'message', 'type', 'is_read', 'created_at'], self.notifications),
+        ]
+
+    def _local_bank(self, city, local_share=0.85):
+        local = self.banks_by_city.get(city)
+        if local and self.rng.random() < local_share:
+            return self.rng.choice(local)
+        return self.busy_bank(self.rng)
+
+    def users(self):
+        rng = self.rng
+        for user_id in self.bank_ids:
+            name, state, lat, lon = CITIES[self.user_city[user_id]]
+            yield (user_id, f'bank_{user_id}', f'bank{user_id}@synthetic.test', self.password_hash, 'blood_bank',
+                   None, f'9{user_id:09d}'[-10:], None, 'active', f'{user_id} Hospital Road, {name}', name, state,
+                   f'{560000 + user_id % 1000}', f'LIC-{user_id}', None, '24x7', rng.choice([200, 500, 1000, 2000]),
+                   None, self._jitter(lat), self._jitter(lon), self._past(1500), 'auto_approved', rng.randint(80, 100))
+        for user_id in self.hospital_ids:
+            name, state, lat, lon = CITIES[self.user_city[user_id]]
+            yield (user_id, f'hospital_{user_id}', f'hospital{user_id}@synthetic.test', self.password_hash, 'hospital',
+                   None, f'8{user_id:09d}'[-10:], None, 'active', f'{user_id} Main Road, {name}', name, state,
+                   f'{560000 + user_id % 1000}', None, f'REG-{user_id}', None, rng.choice([50, 150, 400, 1000]),
+                   rng.choice(['Government', 'Private', 'Private', 'Trust']), self._jitter(lat), self._jitter(lon),
+                   self._past(1500), 'auto_approved', rng.randint(75, 100))
+        for user_id in self.donor_ids:
+            name, state, _, _ = CITIES[self.user_city[user_id]]
+            roll = rng.random()
+            status = 'active' if roll < 0.85 else 'pending' if roll < 0.95 else 'suspended'
+            yield (user_id, f'donor_{user_id}', f'donor{user_id}@synthetic.test', self.password_hash, 'donor',
+                   'Free' if rng.random() < 0.9 else 'Paid', f'7{user_id:09d}'[-10:], self.blood_group(rng), status,
+                   None, name, state, f'{560000 + rng.randint(0, 999)}', None, None, None, None, None, None, None,
+                   self._past(1500, skew=1.5), 'pending', 0)
+
+    def camps(self):
+        rng = self.rng
+        for camp_id in self.camp_ids:
+            organizer = self.busy_bank(rng)
+            city = CITIES[self.user_city[organizer]][0]
+            date = (self.now + timedelta(days=rng.randint(-365, 60))).replace(hour=0, minute=0, second=0)
+            if date >= self.now:
+                status = 'scheduled'
+            else:
+                status = 'cancelled' if rng.random() < 0.1 else 'completed'
+            self.camp_dates[camp_id] = (date, status)
+            targets = 'All' if rng.random() < 0.6 else ','.join(sorted(rng.sample([g for g, _ in BLOOD_GROUPS], 2)))
+            yield (camp_id, organizer, f'Donation Drive {camp_id}', f'Community Hall {camp_id % 50}, {city}', city,
+                   date, '09:00', '17:00', status, targets, date - timedelta(days=rng.randint(7, 45)))
+
+    def bags(self):
+        rng = self.rng
+        for bag_id in range(self.start_ids['blood_inventory'], self.start_ids['blood_inventory'] + self.counts['bags']):
+            added = self._past(120, skew=1.3)
+            # Whole blood keeps 35-42 days, so the older part of this window is expired stock
+            yield (bag_id, self.busy_bank(rng), self.blood_group(rng), rng.choice([1, 1, 1, 2, 2, 3, 4]),
+                   added + timedelta(days=rng.randint(35, 42)), added)
+
+    def requests(self):
+        rng = self.rng
+        first = self.start_ids['blood_request']
+        for request_id in range(first, first + self.counts['requests']):
+            hospital = self.busy_hospital(rng)
+            bank = None if rng.random() < 0.1 else self._local_bank(self.user_city[hospital], 0.7)
+            requested = self._past(365, skew=1.5)
+            roll = rng.random()
+            priority = 'routine' if roll < 0.6 else 'urgent' if roll < 0.9 else 'emergency'
+            if requested > self.now - timedelta(days=3):
+                status = 'pending' if rng.random() < 0.8 else 'approved'
+            else:
+                roll = rng.random()
+                status = 'completed' if roll < 0.7 else 'approved' if roll < 0.85 else 'rejected'
+            yield (request_id, hospital, f'Patient {request_id}', f'P{request_id:08d}', self.blood_group(rng),
+                   min(1 + int(rng.expovariate(0.6)), 10), priority, rng.choice(REQUEST_REASONS),
+                   str(bank) if bank else None, bank, status, requested)
+
+    def appointments(self):
+        rng = self.rng
+        first = self.start_ids['appointment']
+        for appointment_id in range(first, first + self.counts['appointments']):
+            donor = self.active_donor(rng)
+            camp = bank = None
+            if rng.random() < 0.3:
+                # Camp bookings happen on the camp's day and follow its outcome
+                camp = rng.choice(self.camp_ids)
+                date, camp_status = self.camp_dates[camp]
+                if camp_status == 'completed':
+                    status = 'completed' if rng.random() < 0.85 else 'cancelled'
+                else:
+                    status = camp_status
+            else:
+                bank = self._local_bank(self.user_city[donor])
+                if rng.random() < 0.08:
+                    date = self.now + timedelta(days=rng.randint(1, 30))
+                    status = 'scheduled'
+                else:
+                    date = self._past(730, skew=1.2)
+                    status = 'completed' if rng.random() < 0.8 else 'cancelled'
+                date = date.replace(hour=0, minute=0, second=0)
+            if status == 'completed':
+                self.completed.append((donor, date))
+            yield (appointment_id, donor, camp, bank, date, rng.choice(TIME_SLOTS), status,
+                   date - timedelta(days=rng.randint(1, 20)))
+
+    def reports(self):
+        # Completed donations carry an approved report, which is what DonorProfile counts
+        rng = self.rng
+        for report_id, (donor, date) in enumerate(self.completed, start=self.start_ids['report']):
+            yield (report_id, donor, f'synthetic/report_{report_id}.pdf', date + timedelta(hours=rng.randint(1, 48)),
+                   'approved')
+
+    def notifications(self):
+        rng = self.rng
+        first = self.start_ids['notification']
+        users = _Picker([self.donor_ids, self.bank_ids, self.hospital_ids], [80, 15, 5])
+        for notification_id in range(first, first + self.counts['notifications']):
+            kind = self.notification_type(rng)
+            created = self._past(180, skew=1.5)
+            is_read = rng.random() < (0.9 if created < self.now - timedelta(days=14) else 0.3)
+            yield (notification_id, rng.choice(users(rng)), f'{kind.title()} alert #{notification_id}', kind,
+                   is_read, created)
+
+def _chunks(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+def _tsv_value(value):
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n')
+
+def _load_data_infile(conn, table, columns, chunk):
+    """MySQL's native bulk path: stream the chunk through a temporary TSV file"""
+    handle = tempfile.NamedTemporaryFile('w', suffix='.tsv', delete=False, encoding='utf-8', newline='')
+    try:
+        with handle:
+            for row in chunk:
+                handle.write('\t'.join(_tsv_value(value) for value in row) + '\n')
+        quote = conn.dialect.identifier_preparer.quote
+        conn.exec_driver_sql(
+            f"LOAD DATA LOCAL INFILE '{handle.name}' INTO TABLE {quote(table.name)} "
+            f"FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' ({', '.join(quote(c) for c in columns)})"
+        )
+    finally:
+        os.unlink(handle.name)
+
+def load_synthetic_data(scale=1, seed=42, batch_size=5000, native=False, log=print):
+    """
+    Generates and inserts a scale-sized dataset after whatever is already in the database.
+    Each chunk of batch_size rows is one executemany (a multi-row INSERT on MySQL) or, with
+    native=True on MySQL, one LOAD DATA LOCAL INFILE; every chunk commits on its own.
+    Returns {table name: rows inserted}.
+    """
+    dataset = SyntheticDataset(scale=scale, seed=seed)
+    start_ids = {}
+    for model in (User, Campaign, BloodInventory, BloodRequest, Appointment, Report, Notification):
+        start_ids[model.__tablename__] = (db.session.query(db.func.max(model.id)).scalar() or 0) + 1
+    db.session.commit()
+
+    engine = db.engine
+    dialect = engine.dialect.name
+    native = native and dialect == 'mysql'
+    if native:
+        engine = create_engine(engine.url, connect_args={'local_infile': True})
+    placeholder = '?' if engine.dialect.paramstyle == 'qmark' else '%s'
+    quote = engine.dialect.identifier_preparer.quote
+
+    inserted = {}
+    with engine.connect() as conn:
+        # Bulk-load session settings: the rows are generated consistent, so skip per-row checks
+        if dialect == 'sqlite':
+            synchronous = conn.exec_driver_sql('PRAGMA synchronous').scalar()
+            conn.exec_driver_sql('PRAGMA synchronous = OFF')
+        elif dialect == 'mysql':
+            conn.exec_driver_sql('SET unique_checks = 0, foreign_key_checks = 0')
+        conn.commit()
+
+        try:
+            for model, columns, rows in dataset.plan(start_ids):
+                table = model.__table__
+                # Raw executemany skips SQLAlchemy's type handling, so apply the bind processors here
+                processors = [table.c[c].type.bind_processor(engine.dialect) for c in columns]
+                processed = [(i, p) for i, p in enumerate(processors) if p is not None]
+                sql = (f"INSERT INTO {quote(table.name)} ({', '.join(quote(c) for c in columns)}) "
+                       f"VALUES ({', '.join([placeholder] * len(columns))})")
+                started = time.perf_counter()
+                count = 0
+                for chunk in _chunks(rows(), batch_size):
+                    if processed and not native:
+                        converted = []
+                        for row in chunk:
+                            row = list(row)
+                            for i, process in processed:
+                                if row[i] is not None:
+                                    row[i] = process(row[i])
+                            converted.append(tuple(row))
+                        chunk = converted
+                    if native:
+                        _load_data_infile(conn, table, columns, chunk)
+                    else:
+                        conn.exec_driver_sql(sql, chunk)
+                    conn.commit()
+                    count += len(chunk)
+                inserted[table.name] = count
+                elapsed = time.perf_counter() - started
+                log(f"- {table.name}: {count} rows in {elapsed:.1f}s ({count / max(elapsed, 1e-9):,.0f} rows/s)")
+        finally:
+            if dialect == 'sqlite':
+                conn.exec_driver_sql(f'PRAGMA synchronous = {int(synchronous)}')
+            elif dialect == 'mysql':
+                conn.exec_driver_sql('SET unique_checks = 1, foreign_key_checks = 1')
+            conn.commit()
+    if native:
+        engine.dispose()
+
+    inserted['donor_profile'] = rebuild_donor_profiles(batch_size=batch_size)
+    return inserted
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    scale = float(args[0]) if args else 1
+    seed = int(args[1]) if len(args) > 1 else 42
+    with app.app_context():
+        print(f"Loading synthetic dataset at scale {scale:g}...")
+        started = time.perf_counter()
+        inserted = load_synthetic_data(scale=scale, seed=seed, native='--native' in sys.argv)
+        total = sum(inserted.values())
+        print(f"Loaded {total:,} rows in {time.perf_counter() - started:.1f}s.")
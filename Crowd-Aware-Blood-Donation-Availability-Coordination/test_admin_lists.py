@@ -0,0 +1,181 @@
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import text
+import pytest
+
+from app import app, db, User, Report, BloodRequest, stats_cache
+
+NOW = datetime(2026, 6, 1)
+
+def setup_module(module=None):
+    with app.app_context():
+        rng = random.Random(41)
+        users = [{
+            "id": i,
+            "username": f"user_{i}",
+            "email": f"user_{i}@test.org",
+            "role": rng.choice(['donor', 'donor', 'hospital', 'bank', 'blood_bank']),
+            "city": rng.choice(['Mysore', 'Mandya', None]),
+            "account_status": rng.choice(['active', 'pending', 'suspended']),
+            "ai_verification_status": rng.choice(['pending', 'flagged', 'auto_approved']),
+            "ai_confidence_score": rng.choice([None, 10, 40, 40, 75]),
+            "created_at": rng.choice([None, NOW - timedelta(days=rng.randint(0, 400))]),
+        } for i in range(1, 1501)]
+        users.append({"id": 1501, "username": "admin", "email": "admin@test.org", "role": "admin"})
+        db.session.execute(db.insert(User), users)
+
+        donors = [u['id'] for u in users if u['role'] == 'donor']
+        hospitals = [u['id'] for u in users if u['role'] == 'hospital']
+        db.session.execute(db.insert(Report), [{
+            "donor_id": rng.choice(donors), "filename": f"r{i}.pdf",
+            "status": rng.choice(['pending', 'approved', 'rejected']),
+            "upload_date": NOW - timedelta(days=rng.randint(0, 90))
+        } for i in range(2000)])
+        db.session.execute(db.insert(BloodRequest), [{
+            "hospital_id": rng.choice(hospitals), "patient_name": f"P{i}", "patient_id": str(i),
+            "blood_group": rng.choice(['A+', 'O-']), "units": 1, "priority": rng.choice(['urgent', 'routine']),
+            "reason": "Surgery", "status": rng.choice(['pending', 'approved']),
+            # Many requests share a timestamp, so the id tie-breaker matters
+            "request_date": NOW - timedelta(hours=rng.randint(0, 50))
+        } for i in range(1500)])
+        db.session.commit()
+
+def walk(client, url, **params):
+    """Follows X-Next-Cursor to the end; returns (items, X-Total-Count of the first page, pages)"""
+    items, total, pages, cursor = [], None, 0, None
+    while True:
+        resp = client.get(url, query_string=dict(params, **({'after': cursor} if cursor else {})))
+        assert resp.status_code == 200, resp.get_data(as_text=True)
+        items.extend(resp.get_json())
+        total = total if total is not None else int(resp.headers['X-Total-Count'])
+        pages += 1
+        cursor = resp.headers.get('X-Next-Cursor')
+        if not cursor:
+            return items, total, pages
+
+def test_users_filters_and_pages():
+    print("Testing /api/users keyset pagination and filters...")
+    client = app.test_client()
+    with app.app_context():
+        expected = [u.id for u in User.query.filter(User.role.in_(['bank', 'blood_bank']), User.account_status == 'pending',
+                                                    User.city == 'Mysore').order_by(User.id.desc())]
+        since = [u.id for u in User.query.filter(User.role != 'admin', User.created_at >= NOW - timedelta(days=30))
+                 .order_by(User.id.desc())]
+
+    items, total, pages = walk(client, '/api/users', role='blood_bank', status='pending', city='Mysore', limit=7)
+    assert [u['id'] for u in items] == expected and total == len(expected) and pages > 1
+
+    items, total, _ = walk(client, '/api/users', limit=200, **{'from': (NOW - timedelta(days=30)).strftime('%Y-%m-%d')})
+    assert [u['id'] for u in items] == since and total == len(since)
+    assert len(client.get('/api/users').get_json()) == app.config['ADMIN_PAGE_SIZE']
+    assert all(u['role'] != 'admin' for u in walk(client, '/api/users', limit=500)[0])
+    print(f"TEST PASSED: {len(expected)} filtered users over {pages} pages.")
+
+def test_reports_and_requests():
+    print("Testing /api/reports and /api/admin/requests pagination...")
+    client = app.test_client()
+    with app.app_context():
+        reports = [r.id for r in Report.query.join(Report.donor).filter(Report.status == 'pending', User.city == 'Mandya')
+                   .order_by(Report.id.desc())]
+        requests = [r.id for r in BloodRequest.query.filter_by(status='pending')
+                    .order_by(BloodRequest.request_date.desc(), BloodRequest.id.desc())]
+
+    items, total, _ = walk(client, '/api/reports', status='pending', city='Mandya', limit=33)
+    assert [r['id'] for r in items] == reports and total == len(reports)
+
+    items, total, pages = walk(client, '/api/admin/requests', limit=64)
+    assert [r['id'] for r in items] == requests and total == len(requests) and pages > 1
+    urgent = walk(client, '/api/admin/requests', status='all', priority='urgent', blood_group='O-')[0]
+    assert urgent and all(r['priority'] == 'urgent' and r['blood_group'] == 'O-' for r in urgent)
+    assert client.get('/api/reports?after=abc').status_code == 400
+    assert client.get('/api/admin/requests?to=2026-13-01').status_code == 400
+    print(f"TEST PASSED: {len(requests)} pending requests paged on (request_date, id).")
+
+def test_pending_verifications_order_with_null_scores():
+    print("Testing /api/admin/pending-verifications pagination...")
+    client = app.test_client()
+    with app.app_context():
+        queue = User.query.filter(User.ai_verification_status.in_(['pending', 'flagged']), User.role == 'hospital').all()
+    # NULL scores first, then ascending score, then id
+    expected = [u.id for u in sorted(queue, key=lambda u: (u.ai_confidence_score is not None, u.ai_confidence_score or 0, u.id))]
+
+    items, total, pages = walk(client, '/api/admin/pending-verifications', role='hospital', limit=9)
+    assert [u['id'] for u in items] == expected and total == len(expected) and pages > 1
+    flagged = walk(client, '/api/admin/pending-verifications', status='flagged', limit=500)[0]
+    assert flagged and all(u['ai_verification_status'] == 'flagged' for u in flagged)
+    print(f"TEST PASSED: {len(expected)} queued users paged across NULL and equal scores.")
+
+def test_totals_are_cached_until_commit(sql_statements):
+    print("Testing cached list totals...")
+    client = app.test_client()
+    with sql_statements() as statements:
+        client.get('/api/users?role=donor&limit=1')
+        first = len(statements)
+        client.get('/api/users?role=donor&limit=1')
+        second = len(statements) - first
+    assert second == first - 1, (first, second)  # The count query is skipped
+
+    before = int(client.get('/api/users?role=donor&limit=1').headers['X-Total-Count'])
+    with app.app_context():
+        db.session.add(User(username='late', email='late@test.org', role='donor', password_hash='x'))
+        db.session.commit()
+    assert int(client.get('/api/users?role=donor&limit=1').headers['X-Total-Count']) == before + 1
+    print("TEST PASSED: totals reused until a commit touched the table.")
+
+def test_total_cache_keys_are_bounded(sql_statements, monkeypatch):
+    print("Testing cache keys for list totals...")
+    client = app.test_client()
+    stats_cache.clear()
+    client.get('/api/users?role=donor&limit=1')
+    # Arguments that filter nothing reuse the same entry
+    with sql_statements() as statements:
+        for extra in ('q=anything', 'city=', 'limit=3', 'utm=1&fields=id'):
+            client.get(f'/api/users?role=donor&limit=1&{extra}')
+    assert not any('count(' in s.lower() for s in statements), statements
+    assert len(stats_cache) == 1
+
+    # Distinct filter values are capped, oldest first
+    monkeypatch.setitem(app.config, 'STATS_CACHE_MAX_ENTRIES', 3)
+    for i in range(10):
+        client.get(f'/api/users?city=Town{i}&limit=1')
+    assert len(stats_cache) == 3
+    print("TEST PASSED: keys follow the applied filters and the cache stays bounded.")
+
+def test_sparse_fields(sql_statements):
+    print("Testing ?fields= projections...")
+    client = app.test_client()
+    with sql_statements() as statements:
+        users = client.get('/api/users?fields=username,city&limit=5').get_json()
+        reports = client.get('/api/reports?fields=id,status,donor_name&limit=5').get_json()
+        bare = client.get('/api/reports?fields=filename&limit=5').get_json()
+        requests = client.get('/api/admin/requests?fields=patient_name&limit=5').get_json()
+
+    assert all(set(u) == {'username', 'city'} for u in users) and len(users) == 5
+    assert all(set(r) == {'id', 'status', 'donor_name'} for r in reports)
+    assert all(set(r) == {'filename'} for r in bare)
+    assert all(set(r) == {'patient_name'} for r in requests)
+    selects = ' '.join(s for s in statements if s.lstrip().upper().startswith('SELECT') and 'count(' not in s)
+    for column in ('medical_conditions', 'address', 'license_id', 'admin_notes', 'reason'):
+        assert column not in selects, column
+
+    # Full rows are unchanged without ?fields=
+    full = client.get('/api/users?limit=1').get_json()[0]
+    assert len(full) == 14 and 'address' in full
+    notes = client.get('/api/admin/pending-verifications?fields=id,ai_verification_notes&limit=3').get_json()
+    assert all(set(u) == {'id', 'ai_verification_notes'} and u['ai_verification_notes'] == [] for u in notes)
+    assert client.get('/api/users?fields=username,password_hash').status_code == 400
+    print("TEST PASSED: only the requested columns were selected and serialized.")
+
+def test_list_queries_use_indexes():
+    print("Testing admin list query plans...")
+    with app.app_context():
+        plan = db.session.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id FROM blood_request WHERE status = 'pending' "
+            "ORDER BY request_date DESC, id DESC LIMIT 51"
+        )).fetchall()
+    detail = ' '.join(str(row[-1]) for row in plan)
+    assert 'ix_blood_request_status_date' in detail and 'TEMP B-TREE' not in detail, detail
+    print(f"TEST PASSED: {detail}")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main(['-s', __file__]))
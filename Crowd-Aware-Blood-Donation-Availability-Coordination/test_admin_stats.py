@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+import pytest
+
+from app import app, db, User, BloodInventory, BloodRequest
+
+def setup_module(module=None):
+    with app.app_context():
+        bank = User(username='Stats Bank', email='statsbank@test.org', role='bank', password_hash='x',
+                    ai_verification_status='auto_approved', ai_confidence_score=90)
+        hospital = User(username='Stats Hospital', email='statshosp@test.org', role='hospital', password_hash='x')
+        db.session.add_all([
+            User(username='admin', email='admin@test.org', role='admin', password_hash='x'),
+            bank, hospital,
+            User(username='d1', email='d1@test.org', role='donor', password_hash='x',
+                 ai_verification_status='flagged', ai_confidence_score=40),
+            User(username='d2', email='d2@test.org', role='donor', password_hash='x',
+                 ai_verification_status='rejected', ai_confidence_score=0),
+        ])
+        db.session.flush()
+
+        now = datetime.utcnow()
+        db.session.add_all([
+            BloodInventory(bank_id=bank.id, blood_group='O+', units=12, expiry_date=now + timedelta(days=2)),
+            BloodInventory(bank_id=bank.id, blood_group='O+', units=3, expiry_date=now + timedelta(days=30)),
+            BloodInventory(bank_id=bank.id, blood_group='A+', units=4, expiry_date=now + timedelta(days=5)),
+            BloodRequest(hospital_id=hospital.id, patient_name='P', patient_id='1', blood_group='O+', units=1,
+                         priority='emergency', reason='Trauma', status='pending'),
+        ])
+        db.session.commit()
+
+def fetch_counting(sql_statements, client, url):
+    """Returns (json, number of SQL statements executed while serving url)"""
+    with sql_statements() as statements:
+        resp = client.get(url)
+    assert resp.status_code == 200, resp.get_data(as_text=True)
+    return resp.get_json(), len(statements)
+
+def test_ai_stats_single_query_and_cache(sql_statements):
+    print("Testing AI stats aggregation...")
+    client = app.test_client()
+
+    stats, statements = fetch_counting(sql_statements, client, '/api/admin/ai-stats')
+    assert statements == 1, statements
+    assert stats == {
+        'total_registrations': 4,
+        'auto_approved': 1,
+        'flagged_for_review': 1,
+        'pending': 2,
+        'manual_approved': 0,
+        'rejected': 1,
+        'average_confidence_score': 65.0,
+        'automation_rate': 25.0
+    }
+
+    cached, statements = fetch_counting(sql_statements, client, '/api/admin/ai-stats')
+    assert statements == 0 and cached == stats
+
+    # A commit to user invalidates the entry
+    with app.app_context():
+        db.session.add(User(username='d3', email='d3@test.org', role='donor', password_hash='x',
+                            ai_verification_status='auto_approved', ai_confidence_score=80))
+        db.session.commit()
+    stats, statements = fetch_counting(sql_statements, client, '/api/admin/ai-stats')
+    assert statements == 1
+    assert stats['total_registrations'] == 5 and stats['auto_approved'] == 2
+    print("TEST PASSED: AI stats computed in one statement and invalidated on commit.")
+
+def test_advanced_stats_grouped_and_cache(sql_statements):
+    print("Testing advanced stats aggregation...")
+    client = app.test_client()
+
+    stats, statements = fetch_counting(sql_statements, client, '/api/admin/stats/advanced')
+    assert statements == 2, statements
+    assert stats['expiring_units_7_days'] == 2
+    assert stats['active_emergencies'] == 1
+    assert stats['shortage_groups'] == ['A+', 'A-', 'B+', 'B-', 'AB+', 'AB-', 'O-']
+
+    # Unrelated tables do not invalidate it
+    with app.app_context():
+        db.session.add(User(username='d4', email='d4@test.org', role='donor', password_hash='x'))
+        db.session.commit()
+    _, statements = fetch_counting(sql_statements, client, '/api/admin/stats/advanced')
+    assert statements == 0
+
+    with app.app_context():
+        BloodRequest.query.filter_by(priority='emergency').update({'status': 'completed'})
+        db.session.commit()
+    stats, statements = fetch_counting(sql_statements, client, '/api/admin/stats/advanced')
+    assert statements == 2 and stats['active_emergencies'] == 0
+    print("TEST PASSED: advanced stats computed in two statements and invalidated on commit.")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main(['-s', __file__]))
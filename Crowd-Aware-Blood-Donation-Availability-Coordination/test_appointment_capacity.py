@@ -0,0 +1,115 @@
+import threading
+from datetime import datetime, timedelta
+import pytest
+
+from app import app, db, User, Campaign, Appointment, AppointmentSlot
+
+ids = {}
+CAMP_DAY = (datetime.utcnow() + timedelta(days=7)).strftime('%Y-%m-%d')
+
+def setup_module(module=None):
+    with app.app_context():
+        bank = User(username='Slot Bank', email='slotbank@test.org', role='bank', password_hash='x')
+        db.session.add(bank)
+        db.session.flush()
+        camp = Campaign(organizer_id=bank.id, name='Stampede Drive', location='Stadium',
+                        date=datetime.strptime(CAMP_DAY, '%Y-%m-%d'), slot_capacity=25)
+        donors = [User(username=f'donor_{i}', email=f'donor_{i}@test.org', role='donor', password_hash='x')
+                  for i in range(200)]
+        db.session.add(camp)
+        db.session.add_all(donors)
+        db.session.commit()
+        ids.update(bank=bank.id, camp=camp.id, donors=[d.id for d in donors])
+
+def book(client, donor_id, time_slot, **owner):
+    resp = client.post('/api/appointments', json=dict(owner, donor_id=donor_id, date=CAMP_DAY, time_slot=time_slot))
+    return resp.status_code
+
+def test_concurrent_camp_bookings_never_overbook():
+    print("Testing 200 concurrent bookings for 25 camp seats...")
+    statuses = []
+    start = threading.Barrier(len(ids['donors']))
+
+    def worker(donor_id):
+        client = app.test_client()
+        start.wait()
+        statuses.append(book(client, donor_id, '10:00', camp_id=ids['camp']))
+
+    threads = [threading.Thread(target=worker, args=(donor_id,)) for donor_id in ids['donors']]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    with app.app_context():
+        appointments = Appointment.query.filter_by(camp_id=ids['camp'], time_slot='10:00').count()
+        slot = AppointmentSlot.query.filter_by(owner_type='camp', owner_id=ids['camp'], time_slot='10:00').one()
+        assert (slot.booked, slot.capacity) == (25, 25)
+    assert statuses.count(201) == appointments == 25, statuses
+    assert set(statuses) <= {201, 409, 503}, statuses
+    print(f"TEST PASSED: {statuses.count(201)} booked, {statuses.count(409)} turned away, no overbooking.")
+
+def test_bank_capacity_and_double_booking():
+    print("Testing bank slot capacity and duplicate bookings...")
+    client = app.test_client()
+    donors = ids['donors']
+    assert book(client, donors[0], '09:00', bank_id=ids['bank']) == 201
+    assert book(client, donors[0], '09:00', bank_id=ids['bank']) == 409  # Same donor, same slot
+    for donor_id in donors[1:4]:
+        assert book(client, donor_id, '09:00', bank_id=ids['bank']) == 201
+    assert book(client, donors[4], '09:00', bank_id=ids['bank']) == 409  # BANK_SLOT_CAPACITY is 4
+    assert book(client, donors[4], '09:30', bank_id=ids['bank']) == 201
+    assert book(client, donors[5], '09:00', bank_id=999) == 404
+    assert book(client, donors[5], '09:00') == 400
+    print("TEST PASSED: bank slots capped at capacity and duplicate bookings rejected.")
+
+def test_concurrent_duplicates_across_slots():
+    print("Testing one donor booking two places at the same time concurrently...")
+    donor_id = ids['donors'][100]
+    statuses = []
+
+    def attempt(owner):
+        statuses.append(book(app.test_client(), donor_id, '11:00', **owner))
+
+    owners = [{'camp_id': ids['camp']}, {'bank_id': ids['bank']}] * 5
+    threads = [threading.Thread(target=attempt, args=(owner,)) for owner in owners]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(statuses) == [201] + [409] * 9, statuses
+    with app.app_context():
+        assert Appointment.query.filter_by(donor_id=donor_id, time_slot='11:00').count() == 1
+        # The losing seat claims were rolled back with their bookings
+        assert db.session.query(db.func.sum(AppointmentSlot.booked)).filter_by(time_slot='11:00').scalar() == 1
+    print("TEST PASSED: only one of ten concurrent bookings for the donor's slot went through.")
+
+def test_counter_starts_from_existing_bookings():
+    print("Testing slot counters created over pre-existing appointments...")
+    client = app.test_client()
+    donors = ids['donors']
+    with app.app_context():
+        # Appointments made before counters existed still hold their seats
+        for donor_id in donors[10:34]:
+            db.session.add(Appointment(donor_id=donor_id, camp_id=ids['camp'],
+                                       date=datetime.strptime(CAMP_DAY, '%Y-%m-%d'), time_slot='15:00'))
+        db.session.commit()
+    assert book(client, donors[50], '15:00', camp_id=ids['camp']) == 201
+    assert book(client, donors[51], '15:00', camp_id=ids['camp']) == 409
+
+    for bad in (0, -3, '30', 2.5, True):
+        assert client.put(f"/api/camps/{ids['camp']}", json={'slot_capacity': bad}).status_code == 400, bad
+    assert client.post('/api/camps', json={'organizer_id': ids['bank'], 'name': 'Bad', 'date': CAMP_DAY,
+                                           'slot_capacity': 0}).status_code == 400
+    assert book(client, donors[51], '15:00', camp_id=ids['camp']) == 409  # Rejected edits changed nothing
+
+    # Raising the camp's capacity frees seats on existing counters
+    assert client.put(f"/api/camps/{ids['camp']}", json={'slot_capacity': 26}).status_code == 200
+    assert book(client, donors[51], '15:00', camp_id=ids['camp']) == 201
+    assert client.delete(f"/api/camps/{ids['camp']}").status_code == 200
+    assert book(client, donors[52], '16:00', camp_id=ids['camp']) == 404
+    print("TEST PASSED: counters honoured legacy bookings, capacity edits and cancellation.")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main(['-s', __file__]))
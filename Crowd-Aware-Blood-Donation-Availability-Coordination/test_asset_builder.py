@@ -0,0 +1,97 @@
+import os
+import gzip
+import json
+import tempfile
+import pytest
+
+import app as app_module
+from app import app
+from asset_builder import MANIFEST_NAME, AssetBuilder, AssetManifest
+
+SCRIPT = b'function book(slot) { return fetch("/api/appointments", {method: "POST"}); }\n' * 20
+PAGE = '''<html><head>
+<link rel="stylesheet" href="css/style.css?v=1">
+<script src='js/main.js'></script>
+<script src="https://cdn.example.org/chart.js"></script>
+</head><body><img src="img/missing.png"></body></html>
+'''
+
+def write(folder, relpath, data):
+    path = os.path.join(folder, *relpath.split('/'))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+@pytest.fixture
+def build():
+    source, output = tempfile.mkdtemp(), os.path.join(tempfile.mkdtemp(), 'frontend_build')
+    write(source, 'index.html', PAGE.encode())
+    write(source, 'pages/donor.html', b'<link href="../css/style.css"><script src="../js/main.js"></script>')
+    write(source, 'css/style.css', b'a{}')  # Too small for gzip to pay off
+    write(source, 'js/main.js', SCRIPT)
+    write(source, 'README.md', b'# not deployed')
+    manifest = AssetBuilder(source, output).build()
+    return output, manifest
+
+def read(folder, relpath):
+    with open(os.path.join(folder, *relpath.split('/')), 'rb') as f:
+        return f.read()
+
+def test_manifest_and_rewrites(build):
+    print("Testing the hashed asset manifest...")
+    output, manifest = build
+    assets = manifest['assets']
+    assert set(assets) == {'css/style.css', 'js/main.js'}  # HTML keeps its name; README is skipped
+    assert assets['js/main.js'].startswith('js/main.') and assets['js/main.js'].endswith('.js')
+    assert read(output, assets['js/main.js']) == SCRIPT
+    with open(os.path.join(output, MANIFEST_NAME)) as f:
+        assert json.load(f) == manifest
+
+    index = read(output, 'index.html').decode()
+    assert f'href="{assets["css/style.css"]}?v=1"' in index and f"src='{assets['js/main.js']}'" in index
+    assert 'https://cdn.example.org/chart.js' in index and 'img/missing.png' in index  # Left alone
+    nested = read(output, 'pages/donor.html').decode()
+    assert f'href="../{assets["css/style.css"]}"' in nested
+
+    # Same content, same names: a rebuild does not bust caches
+    builder = AssetBuilder(None, None)
+    assert builder.fingerprinted_name('js/main.js', SCRIPT) == assets['js/main.js']
+    assert builder.fingerprinted_name('js/main.js', SCRIPT + b';') != assets['js/main.js']
+    print(f"TEST PASSED: {len(assets)} fingerprinted assets referenced from the pages.")
+
+def test_gzip_variants(build):
+    print("Testing precompressed variants...")
+    output, manifest = build
+    script = manifest['assets']['js/main.js']
+    assert script in manifest['gzip'] and 'index.html' in manifest['gzip']
+    assert manifest['assets']['css/style.css'] not in manifest['gzip']  # Larger once compressed
+    assert gzip.decompress(read(output, script + '.gz')) == SCRIPT
+    assert not os.path.exists(os.path.join(output, *manifest['assets']['css/style.css'].split('/')) + '.gz')
+    print("TEST PASSED: .gz files only where they are smaller.")
+
+def test_served_from_build(build, monkeypatch):
+    print("Testing gzip negotiation on the built frontend...")
+    output, manifest = build
+    monkeypatch.setattr(app, 'static_folder', output)
+    monkeypatch.setattr(app_module, 'asset_manifest', AssetManifest.load(output))
+    client = app.test_client()
+    script = manifest['assets']['js/main.js']
+
+    plain = client.get('/js/main.js')  # Source name maps onto the hashed file but stays revalidated
+    assert plain.status_code == 200 and plain.data == SCRIPT
+    assert 'Content-Encoding' not in plain.headers and 'Accept-Encoding' in plain.vary
+    assert plain.cache_control.no_cache and not plain.cache_control.immutable
+
+    zipped = client.get(f'/{script}', headers={'Accept-Encoding': 'gzip, br'})
+    assert zipped.headers['Content-Encoding'] == 'gzip' and zipped.mimetype == 'text/javascript'
+    assert gzip.decompress(zipped.data) == SCRIPT
+    assert zipped.cache_control.immutable
+    assert zipped.get_etag()[0] != client.get(f'/{script}').get_etag()[0]  # Each encoding has its own ETag
+
+    unzipped = client.get('/css/style.css', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in unzipped.headers and unzipped.data == b'a{}'
+    assert AssetManifest.load(tempfile.mkdtemp()).built is False
+    print("TEST PASSED: .gz sent only to clients that accept it, with Vary set.")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main(['-s', __file__]))
@@ -0,0 +1,50 @@
+import pytest
+
+from app import app, db, User
+
+ids = {}
+
+def setup_module(module=None):
+    with app.app_context():
+        bank = User(username='Batch Bank', email='batchbank@test.org', role='bank', city='Hassan', password_hash='x')
+        db.session.add(bank)
+        db.session.commit()
+        ids['bank'] = bank.id
+
+def test_batch_results():
+    print("Testing batched sub-requests...")
+    client = app.test_client()
+    bank_id = ids['bank']
+
+    resp = client.post('/api/batch', json={'requests': [
+        '/api/banks',
+        {'id': 'stats', 'path': f'/api/bank/stats/{bank_id}'},
+        '/api/user/999999',
+        '/api/no-such-route',
+        {'path': '/api/banks', 'method': 'POST'},
+        '/api/batch',
+        '/api/hospital/requests/1?status=active'
+    ]})
+    assert resp.status_code == 200, resp.get_data(as_text=True)
+    results = resp.get_json()['results']
+
+    assert [r['status'] for r in results] == [200, 200, 404, 404, 405, 400, 200]
+    assert [r['id'] for r in results] == [0, 'stats', 2, 3, 4, 5, 6]
+    assert results[0]['body'] == client.get('/api/banks').get_json()
+    assert results[1]['body'] == client.get(f'/api/bank/stats/{bank_id}').get_json()
+    assert results[6]['body'] == []
+    assert all(isinstance(r['duration_ms'], float) for r in results)
+    print("TEST PASSED: batch returned per-item status codes, bodies and timings.")
+
+def test_batch_limits():
+    print("Testing batch validation...")
+    client = app.test_client()
+
+    assert client.post('/api/batch', json={'requests': []}).status_code == 400
+    too_many = ['/api/banks'] * (app.config['BATCH_MAX_REQUESTS'] + 1)
+    resp = client.post('/api/batch', json={'requests': too_many})
+    assert resp.status_code == 400
+    print("TEST PASSED: empty and oversized batches were rejected.")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main(['-s', __file__]))
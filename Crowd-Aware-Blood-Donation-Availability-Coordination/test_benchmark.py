@@ -0,0 +1,76 @@
+import pytest
+
+import benchmark
+from benchmark import SCENARIOS, api_routes, compare, percentile, run_benchmarks, run_concurrency
+
+results = {}
+
+def setup_module(module=None):
+    results.update(run_benchmarks(scales=(0.02,), iterations=3, log=lambda message: None))
+
+def test_every_api_route_is_measured():
+    print("Testing benchmark coverage...")
+    routes = api_routes()
+    assert len(routes) > 60
+    assert {f'0.02 {method} {rule}' for method, rule in routes} == set(results)
+    failed = {key: r['status'] for key, r in results.items() if r['status'] >= 400}
+    assert not failed, failed
+    for result in results.values():
+        assert result['p50_ms'] <= result['p95_ms'] <= result['p99_ms']
+        assert result['statements'] >= 0 and result['peak_kb'] > 0
+    # Cached and in-memory endpoints stay off the database
+    assert results['0.02 GET /api/leaderboard/rank/<int:donor_id>']['statements'] == 0
+    print(f"TEST PASSED: {len(results)} endpoints answered without errors.")
+
+def test_missing_scenario_is_reported():
+    print("Testing that an unmeasured route fails the run...")
+    key = ('GET', '/api/banks')
+    builder = SCENARIOS.pop(key)
+    try:
+        run_benchmarks(scales=(0.02,), iterations=1, log=lambda message: None)
+        assert False, "a route without a scenario should fail the run"
+    except LookupError as e:
+        assert '/api/banks' in str(e)
+    finally:
+        SCENARIOS[key] = builder
+    print("TEST PASSED: the uncovered route was named.")
+
+def test_baseline_comparison():
+    print("Testing regression detection against a baseline...")
+    assert compare(results, results) == []
+
+    key = '0.02 GET /api/bank/bootstrap/<int:bank_id>'
+    baseline = {k: dict(v) for k, v in results.items()}
+    baseline[key].update(p95_ms=results[key]['p95_ms'] / 3 - 5, statements=results[key]['statements'] - 1)
+    regressions = compare(results, baseline, min_ms=0)
+    assert len(regressions) == 2 and all(r.startswith(key) for r in regressions)
+
+    # Sub-threshold noise is not a regression
+    baseline[key].update(p95_ms=results[key]['p95_ms'] - 0.5, statements=results[key]['statements'])
+    assert compare(results, baseline) == []
+
+    # A server error is flagged whatever the timings, even on an endpoint the baseline lacks
+    broken = {key: dict(results[key], status=500), '0.02 GET /api/new': dict(results[key], status=503)}
+    regressions = compare(broken, baseline)
+    assert regressions == [f'{key}: status 500', '0.02 GET /api/new: status 503']
+    assert percentile([5, 1, 4, 2, 3], 50) == 3 and percentile(list(range(1, 101)), 99) == 99
+    print("TEST PASSED: slower, chattier and failing endpoints were flagged.")
+
+def test_refuses_other_databases(monkeypatch):
+    print("Testing that the benchmark only runs against its own database...")
+    monkeypatch.setattr(benchmark, 'BENCHMARK_URL', 'sqlite:////tmp/elsewhere.db')
+    with pytest.raises(RuntimeError, match='elsewhere.db'):
+        run_benchmarks(scales=(0.02,), iterations=1, log=lambda message: None)
+    with pytest.raises(RuntimeError):
+        run_concurrency(threads=1, requests=1, log=lambda message: None)
+    print("TEST PASSED: a mismatched engine URL stops the run before any table is dropped.")
+
+def test_concurrent_pass():
+    print("Testing the concurrent read/write pass...")
+    result = run_concurrency(threads=3, requests=8, log=lambda message: None)
+    assert result['requests'] == 24 and result['errors'] == 0
+    assert result['throughput_rps'] > 0 and result['p50_ms'] <= result['p99_ms']
+    print(f"TEST PASSED: {result['requests']} concurrent requests at {result['throughput_rps']} req/s.")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main(['-s', __file__]))
@@ -0,0 +1,96 @@
+import io
+import csv
+import json
+import pytest
+
+import app as app_module
+from app import app, User
+
+def read_results(resp):
+    return list(csv.DictReader(io.StringIO(resp.get_data(as_text=True))))
+
+def test_csv_import():
+    print("Testing CSV bulk import...")
+    client = app.test_client()
+    app.config['BULK_IMPORT_BATCH_SIZE'] = 3
+
+    upload = io.StringIO()
+    writer = csv.writer(upload)
+    writer.writerow(['name', 'email', 'password', 'phone', 'blood_group', 'city'])
+    for i in range(7):
+        writer.writerow([f'camp_donor_{i}', f'camp_donor_{i}@camp.org', 'password123', '9876543210', 'O+', 'Coimbatore'])
+    writer.writerow(['camp_donor_0', 'camp_donor_0@camp.org', 'password123', '', 'O+', ''])  # duplicate of row 1
+    writer.writerow(['no_password', 'no_password@camp.org', '', '', 'A+', ''])
+
+    resp = client.post('/api/donors/import', data={
+        'file': (io.BytesIO(upload.getvalue().encode()), 'donors.csv')
+    }, content_type='multipart/form-data')
+    assert resp.status_code == 200, resp.get_data(as_text=True)
+
+    results = read_results(resp)
+    assert [int(r['row']) for r in results] == list(range(1, 10))
+    assert [r['status'] for r in results] == ['created'] * 7 + ['error', 'error']
+    assert results[7]['message'] == "Email already registered"
+    assert results[8]['message'] == "Missing required fields"
+
+    with app.app_context():
+        donor = User.query.filter_by(email='camp_donor_3@camp.org').first()
+        assert donor is not None and donor.role == 'donor' and donor.account_status == 'pending'
+        assert str(donor.id) == results[3]['user_id']
+        assert donor.check_password('password123')
+        assert donor.ai_verification_status in ('auto_approved', 'flagged')
+        # AI flags (no address in the upload) are stored as verification events, not a blob
+        assert donor.verification_events and donor.ai_verification_notes is None
+    print("TEST PASSED: CSV import created donors and reported per-row errors.")
+
+def test_ndjson_import():
+    print("Testing NDJSON bulk import...")
+    client = app.test_client()
+
+    lines = [
+        json.dumps({'username': 'nd_donor_1', 'email': 'nd_donor_1@camp.org', 'password': 'pw', 'phone': 9876543210}),
+        'not json',
+        json.dumps({'username': 'nd_donor_2', 'email': 'nd_donor_2@camp.org', 'password': 'pw'}),
+    ]
+    resp = client.post('/api/donors/import', data='\n'.join(lines), content_type='application/x-ndjson')
+    assert resp.status_code == 200, resp.get_data(as_text=True)
+
+    results = read_results(resp)
+    assert [r['status'] for r in results] == ['created', 'error', 'created']
+    assert results[1]['message'] == "Malformed row"
+    print("TEST PASSED: NDJSON import handled malformed lines.")
+
+def test_chunked_raw_body_import():
+    print("Testing a raw CSV body sent without Content-Length...")
+    client = app.test_client()
+    body = 'name,email,password\nchunk_donor,chunk_donor@camp.org,pw\n'.encode()
+    # Servers set wsgi.input_terminated for chunked requests so the body is read to its end
+    resp = client.post('/api/donors/import', input_stream=io.BytesIO(body), content_type='text/csv',
+                       headers={'Transfer-Encoding': 'chunked'}, environ_overrides={'wsgi.input_terminated': True})
+    assert resp.status_code == 200, resp.get_data(as_text=True)
+    assert [r['status'] for r in read_results(resp)] == ['created']
+
+    empty = client.post('/api/donors/import', data={}, content_type='multipart/form-data')
+    assert empty.status_code == 400
+    print("TEST PASSED: the chunked upload was streamed in.")
+
+def test_failed_flags_roll_back_donors():
+    print("Testing that donors are never stored without their AI flags...")
+    client = app.test_client()
+    saved = app_module.verification_event_rows
+    # Every flag row violates NOT NULL, as a failing event insert would
+    app_module.verification_event_rows = lambda user_id, notes: [{"user_id": user_id, "type": None}]
+    try:
+        resp = client.post('/api/donors/import', data={
+            'file': (io.BytesIO(b'name,email,password\nunflagged,unflagged@camp.org,pw\n'), 'donors.csv')
+        }, content_type='multipart/form-data')
+        results = read_results(resp)  # The response streams, so the batch runs while it is read
+    finally:
+        app_module.verification_event_rows = saved
+    assert [r['status'] for r in results] == ['error']
+    with app.app_context():
+        assert User.query.filter_by(email='unflagged@camp.org').first() is None
+    print("TEST PASSED: the failed flag insert rolled back its donor.")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main(['-s', __file__]))
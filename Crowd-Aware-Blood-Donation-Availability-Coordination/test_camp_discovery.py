@@ -0,0 +1,106 @@
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import text
+import pytest
+
+from app import app, db, User, Campaign
+from migrations import add_missing_indexes, backfill_campaign_cities_batch
+
+ids = {}
+TODAY = datetime.combine(datetime.utcnow().date(), datetime.min.time())
+
+def setup_module(module=None):
+    with app.app_context():
+        bank = User(username='Camp Bank', email='campbank@test.org', role='bank', city='Mysore', password_hash='x')
+        db.session.add(bank)
+        db.session.flush()
+
+        # Years of history: mostly past camps, some cancelled, a few hundred upcoming
+        rng = random.Random(7)
+        rows = [{
+            "organizer_id": bank.id,
+            "name": f"Camp {i}",
+            "location": "Hall",
+            "city": rng.choice(['Mysore', 'Mandya', 'Hassan']),
+            "date": TODAY + timedelta(days=rng.randint(-1500, 60)),
+            "status": rng.choice(['scheduled', 'scheduled', 'completed', 'cancelled']),
+            "target_blood_groups": rng.choice([None, 'All', 'A+, O-', 'AB+', 'B+,O+']),
+        } for i in range(20000)]
+        db.session.execute(db.insert(Campaign), rows)
+        db.session.commit()
+        ids['bank'] = bank.id
+
+def expected(city=None, blood_group=None):
+    with app.app_context():
+        camps = Campaign.query.filter(Campaign.date >= TODAY, Campaign.status == 'scheduled')
+        if city:
+            camps = camps.filter_by(city=city)
+        result = []
+        for camp in camps.order_by(Campaign.date, Campaign.id):
+            targets = [t.strip() for t in (camp.target_blood_groups or 'All').split(',')]
+            if blood_group is None or 'All' in targets or blood_group in targets:
+                result.append(camp.id)
+        return result
+
+def walk(client, **params):
+    ids_seen, pages, cursor = [], 0, None
+    while True:
+        query = dict(params, **({'after': cursor} if cursor else {}))
+        resp = client.get('/api/camps/discover', query_string=query)
+        assert resp.status_code == 200, resp.get_data(as_text=True)
+        page = resp.get_json()
+        ids_seen.extend(c['id'] for c in page['camps'])
+        pages += 1
+        cursor = page['next_cursor']
+        if not cursor:
+            return ids_seen, pages
+
+def test_filters_and_pagination():
+    print("Testing camp discovery filters and keyset pagination...")
+    client = app.test_client()
+
+    seen, pages = walk(client, limit=50)
+    assert seen == expected() and pages > 1
+    assert walk(client, city='Mandya', limit=25)[0] == expected(city='Mandya')
+    assert walk(client, city=' mandya ', limit=100)[0] == expected(city='Mandya')  # Case-insensitive
+    o_neg = walk(client, city='HASSAN', blood_group='o-', limit=40)[0]
+    assert o_neg == expected(city='Hassan', blood_group='O-')
+    assert walk(client, blood_group='B+', limit=100)[0] == expected(blood_group='B+')  # Not matched by "AB+"
+
+    window = client.get('/api/camps/discover', query_string={
+        'from': (TODAY + timedelta(days=10)).strftime('%Y-%m-%d'),
+        'to': (TODAY + timedelta(days=12)).strftime('%Y-%m-%d'), 'status': 'all', 'limit': 100
+    }).get_json()['camps']
+    assert window and all(TODAY + timedelta(days=10) <= datetime.strptime(c['date'], '%Y-%m-%d')
+                          <= TODAY + timedelta(days=12) for c in window)
+
+    assert client.get('/api/camps/discover?after=garbage').status_code == 400
+    assert client.get('/api/camps/discover?from=tomorrow').status_code == 400
+    print(f"TEST PASSED: {len(seen)} upcoming camps paged in {pages} pages matching the filters.")
+
+def test_discovery_uses_composite_index():
+    print("Testing camp discovery query plan...")
+    with app.app_context():
+        plan = db.session.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id FROM campaign WHERE lower(city) = 'mysore' AND status = 'scheduled' "
+            "AND date >= :start ORDER BY date, id LIMIT 21"
+        ), {"start": TODAY}).fetchall()
+    detail = ' '.join(str(row[-1]) for row in plan)
+    assert 'ix_campaign_city_lower_status_date' in detail and 'TEMP B-TREE' not in detail, detail
+    print(f"TEST PASSED: {detail}")
+
+def test_schema_upgrade_helpers():
+    print("Testing index and city backfill upgrade helpers...")
+    with app.app_context():
+        db.session.execute(text("DROP INDEX ix_campaign_status_date"))
+        db.session.execute(text("UPDATE campaign SET city = NULL WHERE id <= 10"))
+        db.session.commit()
+        assert add_missing_indexes() == ['ix_campaign_status_date']
+        assert backfill_campaign_cities_batch(0)[1] == 10
+        db.session.commit()
+        assert Campaign.query.filter(Campaign.city.is_(None)).count() == 0
+        assert db.session.get(Campaign, 1).city == 'Mysore'
+    print("TEST PASSED: missing index recreated and camp cities backfilled.")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main(['-s', __file__]))
@@ -0,0 +1,87 @@
+import gzip
+import json
+import pytest
+from datetime import datetime, timedelta
+from flask import jsonify
+
+from app import app, db, User, BloodInventory
+from compression import compressor
+
+ids = {}
+
+def setup_module(module=None):
+    with app.app_context():
+        bank = User(username='Bank', email='bank@test.org', role='blood_bank', password_hash='x')
+        small = User(username='Small Bank', email='small@test.org', role='blood_bank', password_hash='x')
+        db.session.add_all([bank, small])
+        db.session.flush()
+        expiry = datetime.utcnow() + timedelta(days=20)
+        db.session.add_all(BloodInventory(bank_id=bank.id, blood_group='O+', units=i % 5 + 1,
+                                          expiry_date=expiry + timedelta(hours=i)) for i in range(300))
+        db.session.add(BloodInventory(bank_id=small.id, blood_group='A-', units=2, expiry_date=expiry))
+        db.session.commit()
+        ids.update(bank=bank.id, small=small.id)
+
+def buffered(payload, **headers):
+    """Runs the after_request hook on a jsonify response"""
+    with app.test_request_context('/', headers=headers):
+        rv = compressor.compress_response(jsonify(payload))
+        return rv, rv.get_data()
+
+def test_after_request_hook():
+    print("Testing gzip of buffered JSON responses...")
+    payload = [{'id': i, 'blood_group': 'O+'} for i in range(200)]
+    rv, body = buffered(payload, **{'Accept-Encoding': 'gzip, deflate'})
+    assert rv.headers['Content-Encoding'] == 'gzip' and 'Accept-Encoding' in rv.vary
+    assert json.loads(gzip.decompress(body)) == payload
+    assert int(rv.headers['Content-Length']) == len(body)
+
+    rv, body = buffered(payload)  # No gzip in Accept-Encoding: sent as is, but caches must still vary
+    assert 'Content-Encoding' not in rv.headers and 'Accept-Encoding' in rv.vary
+    assert json.loads(body) == payload
+
+    rv, body = buffered({'ok': True}, **{'Accept-Encoding': 'gzip'})  # Under COMPRESSION_MIN_SIZE
+    assert 'Content-Encoding' not in rv.headers and json.loads(body) == {'ok': True}
+
+    with app.test_request_context('/', headers={'Accept-Encoding': 'gzip'}):
+        error = jsonify([{'message': 'x' * 50}] * 100)
+        error.status_code = 500
+        assert 'Content-Encoding' not in compressor.compress_response(error).headers  # Only 2xx bodies
+    print("TEST PASSED: large JSON gzipped only for clients that accept it.")
+
+def test_hook_on_routes():
+    print("Testing the hook through the app...")
+    client = app.test_client()
+    resp = client.get('/api/banks', headers={'Accept-Encoding': 'gzip'})
+    assert resp.status_code == 200 and 'Content-Encoding' not in resp.headers  # Small list
+    resp = client.get('/uploads/missing.pdf', headers={'Accept-Encoding': 'gzip'})
+    assert resp.status_code == 404 and 'Content-Encoding' not in resp.headers
+    print("TEST PASSED: small and non-JSON responses pass through untouched.")
+
+def test_json_list_streaming(monkeypatch):
+    print("Testing streamed JSON lists...")
+    monkeypatch.setattr(compressor, 'STREAM_CHUNK_SIZE', 2048)  # Several compress() calls
+    client = app.test_client()
+    url = f"/api/bank/inventory/details/{ids['bank']}"
+
+    plain = client.get(url)
+    assert 'Content-Length' not in plain.headers and 'Content-Encoding' not in plain.headers  # Streamed
+    rows = json.loads(plain.data)
+    assert len(rows) == 300 and rows[0]['blood_group'] == 'O+'
+
+    zipped = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    chunks = list(zipped.response)
+    assert len(chunks) > 1  # Sent incrementally, not as one buffered body
+    assert zipped.headers['Content-Encoding'] == 'gzip' and 'Accept-Encoding' in zipped.vary
+    assert 'Content-Length' not in zipped.headers
+    assert json.loads(gzip.decompress(b''.join(chunks))) == rows
+
+    small = client.get(f"/api/bank/inventory/details/{ids['small']}", headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Length' in small.headers and 'Content-Encoding' not in small.headers  # Buffered as is
+    assert len(small.get_json()) == 1
+    empty = client.get('/api/bank/inventory/details/999999', headers={'Accept-Encoding': 'gzip'})
+    assert empty.get_json() == []
+    print(f"TEST PASSED: 300 rows streamed in {len(chunks)} gzip chunks.")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main(['-s', __file__]))
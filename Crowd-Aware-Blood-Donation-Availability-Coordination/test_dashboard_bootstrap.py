@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta
+import pytest
+
+from app import app, db, User, Report, BloodRequest, BloodInventory, Notification, Campaign, Appointment, rebuild_donor_profiles
+
+ids = {}
+
+def setup_module(module=None):
+    with app.app_context():
+        bank = User(username='City Bank', email='bank@test.org', role='bank', city='Mysore', password_hash='x')
+        other_bank = User(username='Town Bank', email='bank2@test.org', role='blood_bank', city='Mandya', password_hash='x')
+        hospital = User(username='General Hospital', email='hosp@test.org', role='hospital', password_hash='x')
+        db.session.add_all([bank, other_bank, hospital])
+        db.session.flush()
+
+        now = datetime.utcnow()
+        donors = []
+        for i in range(5):
+            donor = User(username=f'donor_{i}', email=f'donor_{i}@test.org', role='donor',
+                         blood_group='O+', password_hash='x')
+            donors.append(donor)
+        db.session.add_all(donors)
+        db.session.flush()
+
+        camp = Campaign(organizer_id=bank.id, name='Spring Drive', location='Town Hall',
+                        date=now + timedelta(days=10), start_time='09:00', end_time='17:00')
+        db.session.add(camp)
+        db.session.flush()
+
+        for i, bg in enumerate(['A+', 'O+', 'O+', 'B-']):
+            db.session.add(BloodInventory(bank_id=bank.id, blood_group=bg, units=i + 2,
+                                          expiry_date=now + timedelta(days=3 + i * 10)))
+        for i, donor in enumerate(donors):
+            db.session.add(Appointment(donor_id=donor.id, bank_id=bank.id, date=now - timedelta(days=i),
+                                       time_slot='10:00', status='completed'))
+            db.session.add(BloodRequest(hospital_id=hospital.id, patient_name=f'Patient {i}', patient_id=f'P{i}',
+                                        blood_group='O+', units=i + 1, priority='urgent', reason='Surgery',
+                                        blood_bank_id=str(bank.id), bank_id=bank.id,
+                                        status='completed' if i % 2 else 'pending'))
+
+        donor = donors[0]
+        db.session.add(Appointment(donor_id=donor.id, camp_id=camp.id, date=camp.date, time_slot='11:00'))
+        for i in range(3):
+            db.session.add(Report(donor_id=donor.id, filename=f'r{i}.pdf', status='approved',
+                                  upload_date=now - timedelta(days=30 * i)))
+            db.session.add(Notification(user_id=donor.id, message=f'Note {i}', type='info',
+                                        created_at=now - timedelta(hours=i)))
+        db.session.commit()
+        rebuild_donor_profiles()  # Reports were inserted directly, not through verify_report
+        ids.update(bank=bank.id, hospital=hospital.id, donor=donor.id)
+
+def fetch(client, url):
+    resp = client.get(url)
+    assert resp.status_code == 200, resp.get_data(as_text=True)
+    return resp.get_json()
+
+def count_statements(sql_statements, client, url):
+    """Returns (json, number of SQL statements executed while serving url)"""
+    with sql_statements() as statements:
+        data = fetch(client, url)
+    return data, len(statements)
+
+def test_bank_bootstrap(sql_statements):
+    print("Testing bank dashboard bootstrap...")
+    client = app.test_client()
+    bank_id = ids['bank']
+
+    data, statements = count_statements(sql_statements, client, f'/api/bank/bootstrap/{bank_id}')
+    assert statements <= 6, f"bank bootstrap issued {statements} statements"
+
+    assert data['profile'] == fetch(client, f'/api/user/{bank_id}')
+    assert data['stats'] == fetch(client, f'/api/bank/stats/{bank_id}')
+    assert data['inventory'] == fetch(client, f'/api/bank/inventory/{bank_id}')
+    assert data['inventory_details'] == fetch(client, f'/api/bank/inventory/details/{bank_id}')
+    assert data['requests'] == fetch(client, f'/api/bank/requests/{bank_id}')
+    assert data['donations'] == fetch(client, f'/api/bank/donations/{bank_id}')
+    assert data['camps'] == fetch(client, '/api/campaigns')
+    assert data['banks'] == fetch(client, '/api/banks')
+    assert len(data['donations']) == 5 and data['stats']['pending_requests'] == 3
+    print(f"TEST PASSED: bank bootstrap matched the widget endpoints in {statements} statements.")
+
+def test_donor_bootstrap(sql_statements):
+    print("Testing donor dashboard bootstrap...")
+    client = app.test_client()
+    donor_id = ids['donor']
+
+    data, statements = count_statements(sql_statements, client, f'/api/donor/bootstrap/{donor_id}')
+    assert statements <= 5, f"donor bootstrap issued {statements} statements"
+
+    assert data['profile'] == fetch(client, f'/api/user/{donor_id}')
+    assert data['stats'] == fetch(client, f'/api/donor/stats/{donor_id}')
+    assert data['notifications'] == fetch(client, f'/api/notifications/{donor_id}')
+    assert data['campaigns'] == fetch(client, '/api/camps/discover')
+    assert data['appointments'] == fetch(client, f'/api/appointments/{donor_id}')
+    assert data['stats']['total_donations'] == 3
+    assert {a['title'] for a in data['appointments']} == {'City Bank', 'Spring Drive'}
+    print(f"TEST PASSED: donor bootstrap matched the widget endpoints in {statements} statements.")
+
+def test_hospital_bootstrap(sql_statements):
+    print("Testing hospital dashboard bootstrap...")
+    client = app.test_client()
+    hospital_id = ids['hospital']
+
+    data, statements = count_statements(sql_statements, client, f'/api/hospital/bootstrap/{hospital_id}')
+    assert statements <= 3, f"hospital bootstrap issued {statements} statements"
+
+    assert data['profile'] == fetch(client, f'/api/user/{hospital_id}')
+    assert data['stats'] == fetch(client, f'/api/hospital/stats/{hospital_id}')
+    assert data['requests'] == fetch(client, f'/api/hospital/requests/{hospital_id}')
+    assert data['active_requests'] == fetch(client, f'/api/hospital/requests/{hospital_id}?status=active')
+    assert data['history'] == fetch(client, f'/api/hospital/requests/{hospital_id}?status=completed')
+    assert data['banks'] == fetch(client, '/api/banks')
+    print(f"TEST PASSED: hospital bootstrap matched the widget endpoints in {statements} statements.")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main(['-s', __file__]))
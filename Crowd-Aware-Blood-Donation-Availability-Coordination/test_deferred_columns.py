@@ -0,0 +1,113 @@
+import json
+import tracemalloc
+from datetime import datetime, timedelta
+from sqlalchemy import event
+import pytest
+
+from app import app, db, User, Campaign, Appointment
+
+ids = {}
+HEAVY = ('medical_conditions', 'address', 'ai_verification_notes')
+
+def setup_module(module=None):
+    with app.app_context():
+        notes = json.dumps([{'type': 'check', 'detail': 'x' * 200}] * 60)  # ~16 KB, like a long review history
+        bank = User(username='Heavy Bank', email='heavybank@test.org', role='bank', address='12 Bank Road, ' * 100,
+                    password_hash='x', ai_verification_notes=notes)
+        db.session.add(bank)
+        db.session.flush()
+        camp = Campaign(organizer_id=bank.id, name='Heavy Camp', location='Hall', date=datetime.utcnow() + timedelta(days=3))
+        db.session.add(camp)
+        db.session.flush()
+
+        donors = []
+        for i in range(200):
+            donor = User(username=f'donor_{i}', email=f'donor_{i}@test.org', role='donor', account_status='active',
+                         ai_verification_status='auto_approved', medical_conditions='history ' * 1000,
+                         address='Flat 4, Long Street, ' * 100, ai_verification_notes=notes, password_hash='x')
+            donors.append(donor)
+        donors[5].set_password('pw')
+        db.session.add_all(donors)
+        db.session.flush()
+        for i, donor in enumerate(donors[:60]):
+            db.session.add(Appointment(donor_id=donor.id, camp_id=camp.id, date=camp.date, time_slot=f'{9 + i % 8}:00'))
+            db.session.add(Appointment(donor_id=donors[0].id, bank_id=bank.id, date=camp.date, time_slot=f'{i}:30'))
+        db.session.commit()
+        ids.update(bank=bank.id, camp=camp.id, donor=donors[0].id)
+
+def undefer_everything(orm_execute_state):
+    """Loads every User column, as the model did before the Text columns were deferred"""
+    if orm_execute_state.is_select:
+        orm_execute_state.statement = orm_execute_state.statement.options(db.undefer('*'))
+
+def measure(sql_statements, call, eager=False):
+    """(bytes of result rows fetched, statements, peak traced memory) for one request"""
+    if eager:
+        event.listen(db.session, 'do_orm_execute', undefer_everything)
+    tracemalloc.start()
+    try:
+        with sql_statements(parameters=True) as statements:
+            resp = call(app.test_client())
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        if eager:
+            event.remove(db.session, 'do_orm_execute', undefer_everything)
+    assert resp.status_code == 200, resp.get_data(as_text=True)
+
+    # Replay the SELECTs to size the rows the database sent back
+    transferred = 0
+    with app.app_context():
+        engine = db.engine
+    with engine.connect() as conn:
+        cursor = conn.connection.cursor()
+        for statement, parameters in statements:
+            if statement.lstrip().upper().startswith('SELECT'):
+                for row in cursor.execute(statement, parameters).fetchall():
+                    transferred += sum(len(str(v)) for v in row if v is not None)
+    return transferred, [s for s, _ in statements], peak
+
+def compare(sql_statements, name, call):
+    call(app.test_client())  # Warm up query compilation so both runs measure steady state
+    deferred_bytes, statements, deferred_peak = measure(sql_statements, call)
+    eager_bytes, _, eager_peak = measure(sql_statements, call, eager=True)
+    print(f"  {name}: {eager_bytes:,} -> {deferred_bytes:,} bytes fetched, "
+          f"peak memory {eager_peak / 1024:,.0f} -> {deferred_peak / 1024:,.0f} KiB")
+    assert deferred_bytes * 10 < eager_bytes, (name, deferred_bytes, eager_bytes)
+    assert deferred_peak < eager_peak, (name, deferred_peak, eager_peak)
+    return statements
+
+def test_login_and_listing_skip_text_columns(sql_statements):
+    print("Testing deferred columns on login and listing paths...")
+    statements = compare(sql_statements, 'login', lambda c: c.post('/api/login', json={
+        'email': 'donor_5@test.org', 'password': 'pw', 'role': 'donor'
+    }))
+    assert not any(col in s for s in statements for col in HEAVY)
+    compare(sql_statements, 'auto-approved list', lambda c: c.get('/api/admin/auto-approved'))
+    print("TEST PASSED: login and listing loaded no Text columns.")
+
+def test_relationship_traversal_skips_text_columns(sql_statements):
+    print("Testing deferred columns on relationship traversal...")
+    compare(sql_statements, 'donor appointments', lambda c: c.get(f"/api/appointments/{ids['donor']}"))
+
+    _, statements, _ = measure(sql_statements, lambda c: c.get(f"/api/camps/{ids['camp']}/slots"))
+    assert len(statements) == 1 and not any(col in statements[0] for col in HEAVY)
+    print("TEST PASSED: traversals loaded only the columns they show.")
+
+def test_undeferred_where_needed():
+    print("Testing endpoints that still read the deferred columns...")
+    client = app.test_client()
+    banks = client.get('/api/banks').get_json()
+    assert banks[0]['address'].startswith('12 Bank Road')
+    appointments = client.get(f"/api/appointments/{ids['donor']}").get_json()
+    assert any(a['location'].startswith('12 Bank Road') for a in appointments)
+
+    resp = client.post(f"/api/admin/verify/{ids['donor']}", json={'decision': 'approve', 'admin_id': 1, 'notes': 'ok'})
+    assert resp.status_code == 200
+    with app.app_context():
+        events = db.session.get(User, ids['donor']).verification_events
+    assert events[-1].as_note()['type'] == 'admin_review'
+    print("TEST PASSED: bank address still loads and review decisions are recorded.")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main(['-s', __file__]))
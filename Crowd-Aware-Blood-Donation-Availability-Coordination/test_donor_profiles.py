@@ -0,0 +1,105 @@
+import threading
+from datetime import datetime, timedelta
+import pytest
+
+from app import app, db, User, Report, DonorProfile, rebuild_donor_profiles
+
+ids = {}
+
+def setup_module(module=None):
+    with app.app_context():
+        donor = User(username='counter', email='counter@test.org', role='donor', password_hash='x')
+        db.session.add(donor)
+        db.session.flush()
+        now = datetime.utcnow()
+        reports = [Report(donor_id=donor.id, filename=f'r{i}.pdf', upload_date=now - timedelta(days=200 - i * 30))
+                   for i in range(7)]
+        db.session.add_all(reports)
+        db.session.commit()
+        ids.update(donor=donor.id, reports=[r.id for r in reports])
+
+def stats(sql_statements, client):
+    """Returns (stats json, number of SQL statements executed)"""
+    with sql_statements() as statements:
+        resp = client.get(f"/api/donor/stats/{ids['donor']}")
+    assert resp.status_code == 200
+    return resp.get_json(), len(statements)
+
+def test_counters_follow_verify_report(sql_statements):
+    print("Testing donor counters maintained by verify_report...")
+    client = app.test_client()
+
+    data, statements = stats(sql_statements, client)
+    assert statements == 1
+    assert data['total_donations'] == 0 and data['next_eligible_date'] is None
+
+    for report_id in ids['reports']:
+        assert client.post(f'/api/verify_report/{report_id}', json={'action': 'approve'}).status_code == 200
+    # Approving twice must not double count
+    client.post(f"/api/verify_report/{ids['reports'][0]}", json={'action': 'approve'})
+
+    data, statements = stats(sql_statements, client)
+    assert statements == 1
+    assert data['total_donations'] == 7 and data['achievement_level'] == 'Silver'
+    with app.app_context():
+        latest = db.session.get(Report, ids['reports'][-1]).upload_date
+    assert data['next_eligible_date'] == (latest + timedelta(days=90)).strftime('%Y-%m-%d')
+
+    # Rejecting the latest report rolls back the count, tier and last donation date
+    client.post(f"/api/verify_report/{ids['reports'][-1]}", json={'action': 'reject'})
+    data, _ = stats(sql_statements, client)
+    assert data['total_donations'] == 6 and data['achievement_level'] == 'Silver'
+    with app.app_context():
+        previous = db.session.get(Report, ids['reports'][-2]).upload_date
+    assert data['next_eligible_date'] == (previous + timedelta(days=90)).strftime('%Y-%m-%d')
+    print("TEST PASSED: verify_report kept the counters in step and stats used one read.")
+
+def test_rebuild_matches_incremental():
+    print("Testing donor profile rebuild...")
+    with app.app_context():
+        before = db.session.get(DonorProfile, ids['donor'])
+        expected = (before.total_donations, before.last_donation_date, before.achievement_level)
+        db.session.query(DonorProfile).delete()
+        db.session.commit()
+
+        assert rebuild_donor_profiles(batch_size=1) == 1
+        after = db.session.get(DonorProfile, ids['donor'])
+        assert (after.total_donations, after.last_donation_date, after.achievement_level) == expected
+    print("TEST PASSED: rebuild reproduced the incrementally maintained counters.")
+
+def test_concurrent_approvals_count_once():
+    print("Testing concurrent approvals of one report...")
+    with app.app_context():
+        donor = User(username='racer', email='racer@test.org', role='donor', password_hash='x')
+        db.session.add(donor)
+        db.session.flush()
+        report = Report(donor_id=donor.id, filename='race.pdf')
+        db.session.add(report)
+        db.session.commit()
+        donor_id, report_id = donor.id, report.id
+
+    statuses = []
+
+    def approve():
+        resp = app.test_client().post(f'/api/verify_report/{report_id}', json={'action': 'approve'})
+        statuses.append(resp.status_code)
+
+    threads = [threading.Thread(target=approve) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert statuses == [200] * 8, statuses
+    with app.app_context():
+        assert db.session.get(DonorProfile, donor_id).total_donations == 1
+    client = app.test_client()
+    client.post(f'/api/verify_report/{report_id}', json={'action': 'reject'})
+    client.post(f'/api/verify_report/{report_id}', json={'action': 'reject'})
+    with app.app_context():
+        assert db.session.get(DonorProfile, donor_id).total_donations == 0
+        assert db.session.get(Report, report_id).status == 'rejected'
+    print("TEST PASSED: eight simultaneous approvals counted one donation.")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main(['-s', __file__]))
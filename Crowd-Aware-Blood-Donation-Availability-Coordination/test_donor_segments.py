@@ -0,0 +1,132 @@
+import random
+from datetime import date, datetime, timedelta
+import pytest
+
+from app import app, db, User, Report
+from donor_segments import Bitmap, DonorSegments
+
+ids = {}
+
+def setup_module(module=None):
+    with app.app_context():
+        now = datetime.utcnow()
+        donors = {
+            'recent': User(username='recent', email='recent@test.org', role='donor', password_hash='x', blood_group='O-',
+                           city='Coimbatore', pincode='641001', account_status='active'),
+            'due': User(username='due', email='due@test.org', role='donor', password_hash='x', blood_group='O-',
+                        city='coimbatore ', pincode='641018', account_status='active'),
+            'never': User(username='never', email='never@test.org', role='donor', password_hash='x', blood_group='O-',
+                          city='Coimbatore', pincode='641045', account_status='active'),
+            'pending': User(username='pending', email='pending@test.org', role='donor', password_hash='x',
+                            blood_group='O-', city='Coimbatore', account_status='pending'),
+            'chennai': User(username='chennai', email='chennai@test.org', role='donor', password_hash='x',
+                            blood_group='O-', city='Chennai', pincode='600001', account_status='active'),
+        }
+        db.session.add_all(donors.values())
+        db.session.flush()
+        db.session.add_all([
+            Report(donor_id=donors['recent'].id, filename='a.pdf', status='approved', upload_date=now - timedelta(days=10)),
+            Report(donor_id=donors['due'].id, filename='b.pdf', status='approved', upload_date=now - timedelta(days=85)),
+        ])
+        db.session.commit()
+        ids.update({name: user.id for name, user in donors.items()})
+
+def segment(client, **params):
+    resp = client.get('/api/donors/segment', query_string=params)
+    assert resp.status_code == 200, resp.get_data(as_text=True)
+    return set(resp.get_json()['donor_ids'])
+
+def test_bitmap_operations():
+    print("Testing chunked bitmap set operations...")
+    rng = random.Random(11)
+    a_ids = set(rng.sample(range(300000), 20000))
+    b_ids = set(rng.sample(range(300000), 20000))
+    a, b = Bitmap.of(a_ids), Bitmap.of(b_ids)
+    assert list(a & b) == sorted(a_ids & b_ids)
+    assert list(a | b) == sorted(a_ids | b_ids)
+    assert list(a - b) == sorted(a_ids - b_ids)
+    assert len(a) == len(a_ids) and (next(iter(a_ids)) in a)
+    for i in list(a_ids)[:100]:
+        a.discard(i)
+    assert len(a) == len(a_ids) - 100
+    print("TEST PASSED: bitmap operations match Python sets.")
+
+def test_segment_queries():
+    print("Testing donor segment queries...")
+    client = app.test_client()
+
+    assert segment(client, blood_group='O-', city='Coimbatore') == {ids['recent'], ids['due'], ids['never']}
+    assert segment(client, blood_group='o-', city='COIMBATORE', eligible_within_days=7) == {ids['due'], ids['never']}
+    assert segment(client, blood_group='O-', eligible_within_days=0) == {ids['never'], ids['chennai']}
+    assert segment(client, pincode_prefix='6410') == {ids['recent'], ids['due'], ids['never']}
+    assert segment(client, city='Coimbatore', status='pending') == {ids['pending']}
+    assert segment(client, blood_group='AB+') == set()
+    print("TEST PASSED: segments intersected blood group, city, pincode and eligibility.")
+
+def test_incremental_updates():
+    print("Testing incremental segment updates...")
+    client = app.test_client()
+    segment(client, blood_group='O-')  # Make sure the engine is loaded
+
+    # Registration adds the donor; approving their report records a donation
+    resp = client.post('/api/register', json={
+        'name': 'newcomer', 'email': 'newcomer@test.org', 'password': 'pw', 'role': 'donor',
+        'blood_group': 'O-', 'city': 'Coimbatore', 'pincode': '641002'
+    })
+    assert resp.status_code == 201
+    new_id = resp.get_json()['user_id']
+    assert new_id in segment(client, city='Coimbatore', status='pending')
+
+    with app.app_context():
+        report = Report(donor_id=new_id, filename='c.pdf')
+        db.session.add(report)
+        db.session.commit()
+        report_id = report.id
+    client.post(f'/api/verify_report/{report_id}', json={'action': 'approve'})
+
+    coimbatore = segment(client, blood_group='O-', city='Coimbatore')
+    assert new_id in coimbatore
+    assert new_id not in segment(client, blood_group='O-', city='Coimbatore', eligible_within_days=7)
+
+    # Moving city re-indexes the donor
+    with app.app_context():
+        db.session.get(User, ids['chennai']).city = 'Coimbatore'
+        db.session.commit()
+    assert ids['chennai'] in segment(client, city='Coimbatore', eligible_within_days=7)
+    assert segment(client, city='Chennai') == set()
+    print("TEST PASSED: registrations, donations and profile edits updated the bitmaps.")
+
+def test_reload_after_ttl(monkeypatch):
+    print("Testing that another worker's writes show up after the TTL...")
+    client = app.test_client()
+    segment(client, blood_group='O-')  # Make sure the engine is loaded
+    with app.app_context():
+        # A Core insert skips this process's row listeners, like a write made by another worker
+        db.session.execute(db.insert(User), [{'username': 'elsewhere', 'email': 'elsewhere@test.org', 'role': 'donor',
+                                              'password_hash': 'x', 'blood_group': 'B-', 'city': 'Madurai',
+                                              'account_status': 'active'}])
+        db.session.commit()
+        other_id = User.query.filter_by(email='elsewhere@test.org').first().id
+    assert segment(client, blood_group='B-') == set()
+
+    monkeypatch.setitem(app.config, 'DONOR_SEGMENTS_TTL', 0)
+    assert segment(client, blood_group='B-') == {other_id}
+    print("TEST PASSED: the stale bitmaps were rebuilt from the database.")
+
+def test_eligibility_folding():
+    print("Testing eligibility bucket folding...")
+    engine = DonorSegments()
+    today = datetime.utcnow()
+    engine.load([{'id': i, 'blood_group': 'A+'} for i in range(5)],
+                {i: today - timedelta(days=100 + i) for i in range(4)})
+    assert set(engine.segment(account_status=None, eligible_by=date.today())) == set(range(5))
+    assert len(engine.eligible_from) == 2  # Folded past buckets + never donated
+
+    engine.record_donation(2, today)
+    assert set(engine.segment(account_status=None, eligible_by=date.today())) == {0, 1, 3, 4}
+    engine.remove(0)
+    assert set(engine.segment(account_status=None, eligible_by=date.today())) == {1, 3, 4}
+    print("TEST PASSED: folded buckets stayed consistent with donations and removals.")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main(['-s', __file__]))
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import pytest
+
+import app as app_module
+from app import app
+from asset_builder import AssetManifest
+from file_server import file_server
+
+STYLE = b'body { color: #b71c1c; }\n' * 40
+
+@pytest.fixture
+def static(monkeypatch):
+    """Serves a scratch frontend folder with no asset build"""
+    folder = tempfile.mkdtemp()
+    os.makedirs(os.path.join(folder, 'css'))
+    for name, data in (('css/style.css', STYLE), ('css/app.0123abcd45.css', STYLE)):
+        with open(os.path.join(folder, *name.split('/')), 'wb') as f:
+            f.write(data)
+    monkeypatch.setattr(app, 'static_folder', folder)
+    monkeypatch.setattr(app_module, 'asset_manifest', AssetManifest())
+    return folder
+
+def test_etag_and_conditional_get(static):
+    print("Testing content ETags and 304 answers...")
+    client = app.test_client()
+    resp = client.get('/css/style.css')
+    etag, weak = resp.get_etag()
+    assert resp.status_code == 200 and resp.data == STYLE and etag and not weak
+    assert resp.cache_control.no_cache and resp.cache_control.max_age == 0  # Plain names are revalidated
+
+    again = client.get('/css/style.css', headers={'If-None-Match': f'"{etag}"'})
+    assert again.status_code == 304 and again.data == b''
+
+    # A changed file gets a new ETag even though the cached one was keyed by path
+    with open(os.path.join(static, 'css', 'style.css'), 'ab') as f:
+        f.write(b'/* v2 */')
+    os.utime(os.path.join(static, 'css', 'style.css'), ns=(0, 10**18))
+    changed = client.get('/css/style.css', headers={'If-None-Match': f'"{etag}"'})
+    assert changed.status_code == 200 and changed.get_etag()[0] != etag
+    print("TEST PASSED: strong ETags, 304 on a match and a fresh tag after an edit.")
+
+def test_fingerprinted_names_are_immutable(static):
+    print("Testing cache lifetime of hashed file names...")
+    resp = app.test_client().get('/css/app.0123abcd45.css')
+    assert resp.status_code == 200
+    assert resp.get_etag() == ('0123abcd45', False)  # The name already is the content hash
+    assert resp.cache_control.immutable and resp.cache_control.public
+    assert resp.cache_control.max_age == file_server.IMMUTABLE_MAX_AGE
+    assert file_server.fingerprint('ab/cd/' + 'f' * 64) == 'f' * 64
+    assert file_server.fingerprint('ab/cd/' + 'e' * 64 + '.pdf') == 'e' * 64
+    for name in ('css/style.css', '12345678.pdf', 'deadbeefcafe.js', '.0123abcd45.css', 'app.0123abcd.css'):
+        assert file_server.fingerprint(name) is None, name
+    print("TEST PASSED: hashed files are cached for a year.")
+
+def test_range_requests(static):
+    print("Testing partial content...")
+    client = app.test_client()
+    resp = client.get('/css/style.css', headers={'Range': 'bytes=5-9'})
+    assert resp.status_code == 206 and resp.data == STYLE[5:10]
+    assert resp.headers['Content-Range'] == f'bytes 5-9/{len(STYLE)}'
+    assert client.get('/css/style.css', headers={'Range': f'bytes={len(STYLE) + 10}-'}).status_code == 416
+    print("TEST PASSED: byte ranges answered with 206 / 416.")
+
+def test_accel_redirect(static, monkeypatch):
+    print("Testing proxy offload...")
+    monkeypatch.setitem(app.config, 'STATIC_ACCEL_REDIRECT', '/_protected/frontend/')
+    client = app.test_client()
+    resp = client.get('/css/style.css')
+    assert resp.status_code == 200 and resp.data == b''
+    assert resp.headers['X-Accel-Redirect'] == '/_protected/frontend/css/style.css'
+    assert resp.mimetype == 'text/css' and resp.get_etag()[0]
+
+    # The 304 is answered here, so the proxy is not told to send the file
+    again = client.get('/css/style.css', headers={'If-None-Match': resp.headers['ETag']})
+    assert again.status_code == 304 and 'X-Accel-Redirect' not in again.headers
+    print("TEST PASSED: headers only, with the transfer handed to the proxy.")
+
+def test_missing_and_escaping_paths(static):
+    print("Testing paths outside the folder...")
+    client = app.test_client()
+    assert client.get('/css/missing.css').status_code == 404
+    assert client.get('/css/../../etc/passwd').status_code == 404
+    assert client.get('/css').status_code == 404  # Directories are not files
+    print("TEST PASSED: only files inside the folder are served.")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main(['-s', __file__]))
@@ -0,0 +1,118 @@
+import time
+import random
+from datetime import datetime, timedelta
+import pytest
+
+from app import app, db, User, BloodInventory
+from geo_index import GeoIndex, GridIndex, MAX_RADIUS_KM, haversine_km
+
+def setup_module(module=None):
+    with app.app_context():
+        # Bangalore, Mysore (~125 km away) and one bank without coordinates
+        banks = [
+            ('Central Bank', 12.9716, 77.5946, 4),
+            ('Whitefield Bank', 12.9698, 77.7500, 9),
+            ('Koramangala Bank', 12.9352, 77.6245, 9),
+            ('Mysore Bank', 12.2958, 76.6394, 20),
+            ('Unmapped Bank', None, None, 30),
+        ]
+        expiry = datetime.utcnow() + timedelta(days=20)
+        for name, lat, lon, units in banks:
+            bank = User(username=name, email=f'{name.split()[0].lower()}@geo.org', role='bank',
+                        password_hash='x', latitude=lat, longitude=lon)
+            db.session.add(bank)
+            db.session.flush()
+            db.session.add(BloodInventory(bank_id=bank.id, blood_group='O-', units=units, expiry_date=expiry))
+        db.session.commit()
+
+def test_grid_matches_brute_force():
+    print("Testing grid index against a linear scan...")
+    rng = random.Random(7)
+    points = [(i, rng.uniform(8, 35), rng.uniform(68, 97)) for i in range(5000)]
+    index = GridIndex(points)
+
+    durations = []
+    for _ in range(200):
+        lat, lon, radius = rng.uniform(8, 35), rng.uniform(68, 97), rng.choice([10, 50, 150])
+        started = time.perf_counter()
+        found = index.within(lat, lon, radius)
+        durations.append(time.perf_counter() - started)
+
+        expected = sorted((k, haversine_km(lat, lon, plat, plon)) for k, plat, plon in points
+                          if haversine_km(lat, lon, plat, plon) <= radius)
+        assert sorted(k for k, _ in found) == [k for k, _ in expected]
+        assert [d for _, d in found] == sorted(d for _, d in found)
+
+    durations.sort()
+    print(f"TEST PASSED: grid index exact over 5000 points, median query {durations[100] * 1000:.3f} ms.")
+
+def test_stock_check_near():
+    print("Testing nearest-bank stock check...")
+    client = app.test_client()
+
+    resp = client.get('/api/stock-check?blood_group=O-&near=12.9716,77.5946&radius_km=25')
+    assert resp.status_code == 200, resp.get_data(as_text=True)
+    rows = resp.get_json()
+    assert [r['bank_name'] for r in rows] == ['Central Bank', 'Koramangala Bank', 'Whitefield Bank']
+    assert rows[0]['distance_km'] == 0
+
+    everything = client.get('/api/stock-check?blood_group=O-').get_json()
+    assert len(everything) == 5 and 'distance_km' not in everything[0]
+
+    assert client.get('/api/stock-check?blood_group=O-&near=abc').status_code == 400
+    assert client.get('/api/stock-check?blood_group=O-&near=95,10').status_code == 400
+
+    # Registering a bank with coordinates rebuilds the index on the next search
+    resp = client.post('/api/register', json={
+        'name': 'Indiranagar Bank', 'email': 'indiranagar@geo.org', 'password': 'pw', 'role': 'bank',
+        'latitude': 12.9784, 'longitude': 77.6408
+    })
+    assert resp.status_code == 201, resp.get_data(as_text=True)
+    with app.app_context():
+        bank_id = resp.get_json()['user_id']
+        db.session.add(BloodInventory(bank_id=bank_id, blood_group='O-', units=2,
+                                      expiry_date=datetime.utcnow() + timedelta(days=20)))
+        db.session.commit()
+
+    rows = client.get('/api/stock-check?blood_group=O-&near=12.9716,77.5946&radius_km=25').get_json()
+    assert [r['bank_name'] for r in rows][:2] == ['Central Bank', 'Indiranagar Bank']
+    print("TEST PASSED: stock check ranked nearby banks and picked up a new registration.")
+
+def test_radius_validation_and_wide_queries():
+    print("Testing radius validation and planet-wide radii...")
+    rng = random.Random(11)
+    points = [(i, rng.uniform(-80, 80), rng.uniform(-179, 179)) for i in range(500)]
+    index = GridIndex(points)
+    for radius in (-1, 0, float('nan'), float('inf')):
+        try:
+            index.within(12.9, 77.6, radius)
+            assert False, f"radius {radius} should be rejected"
+        except ValueError:
+            pass
+
+    # Huge radii are clamped and fall back to a linear scan instead of walking millions of cells
+    started = time.perf_counter()
+    found = index.within(12.9, 77.6, 1e7)
+    assert time.perf_counter() - started < 0.1
+    assert len(found) == len(points) and all(d <= MAX_RADIUS_KM for _, d in found)
+
+    client = app.test_client()
+    for radius in ('-5', 'nan', 'inf', 'abc'):
+        resp = client.get(f'/api/stock-check?blood_group=O-&near=12.9716,77.5946&radius_km={radius}')
+        assert resp.status_code == 400, radius
+    assert len(client.get('/api/stock-check?blood_group=O-&near=12.9716,77.5946&radius_km=1e9').get_json()) == 5  # Every mapped bank
+    print("TEST PASSED: bad radii rejected, planet-wide search answered by a linear scan.")
+
+def test_index_reloads_after_ttl():
+    print("Testing the location index TTL...")
+    rows = [[(1, 12.97, 77.59)]]
+    index = GeoIndex(lambda: rows[0], ttl=0.05)
+    assert [k for k, _ in index.within(12.97, 77.59, 5)] == [1]
+    rows[0] = [(1, 12.97, 77.59), (2, 12.98, 77.60)]  # Written by another worker; no invalidate() here
+    assert [k for k, _ in index.within(12.97, 77.59, 5)] == [1]
+    time.sleep(0.06)
+    assert [k for k, _ in index.within(12.97, 77.59, 5)] == [1, 2]
+    print("TEST PASSED: a stale index reloaded once its TTL passed.")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main(['-s', __file__]))
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+from sqlalchemy import text
+import pytest
+
+from app import app, db, User, BloodInventory, InventorySnapshot, snapshot_inventory
+
+ids = {}
+TODAY = datetime.utcnow().date()
+YESTERDAY = TODAY - timedelta(days=1)
+
+def setup_module(module=None):
+    with app.app_context():
+        bank_a = User(username='Bank A', email='a@bank.test', role='blood_bank', password_hash='x')
+        bank_b = User(username='Bank B', email='b@bank.test', role='bank', password_hash='x')
+        db.session.add_all([bank_a, bank_b, User(username='donor', email='d@test.org', role='donor', password_hash='x')])
+        db.session.flush()
+
+        added = datetime.utcnow() - timedelta(days=10)
+        now = datetime.utcnow()
+        bags = [
+            (bank_a.id, 'O+', 3, now + timedelta(days=20)),
+            (bank_a.id, 'O+', 2, now + timedelta(days=3)),  # Expiring within the week
+            (bank_a.id, 'O+', 1, now - timedelta(days=2)),  # Already expired
+            (bank_a.id, 'A-', 4, now + timedelta(days=30)),
+            (bank_b.id, 'O+', 5, now + timedelta(days=15)),
+        ]
+        db.session.add_all(BloodInventory(bank_id=bank_id, blood_group=group, units=units, expiry_date=expiry,
+                                          added_date=added) for bank_id, group, units, expiry in bags)
+        db.session.commit()
+        ids.update(a=bank_a.id, b=bank_b.id)
+
+def row(bank_id, day, group):
+    snap = db.session.get(InventorySnapshot, (bank_id, day, group))
+    return snap.available, snap.expiring, snap.expired
+
+def test_snapshot_counts():
+    print("Testing daily snapshot rows...")
+    with app.app_context():
+        assert snapshot_inventory() == 2 * 8
+        # Yesterday as the nightly job recorded it, before the history test consumes stock
+        db.session.execute(db.insert(InventorySnapshot), [
+            {'bank_id': s.bank_id, 'day': YESTERDAY, 'blood_group': s.blood_group, 'available': s.available,
+             'expiring': s.expiring, 'expired': s.expired} for s in InventorySnapshot.query.filter_by(day=TODAY)
+        ])
+        db.session.commit()
+        assert snapshot_inventory() == 2 * 8  # Rerunning a day replaces its rows
+        assert InventorySnapshot.query.count() == 2 * 2 * 8
+        assert row(ids['a'], TODAY, 'O+') == (5, 2, 1)
+        assert row(ids['a'], TODAY, 'A-') == (4, 0, 0)
+        assert row(ids['a'], TODAY, 'B+') == (0, 0, 0)  # Empty groups are recorded as zero
+        assert row(ids['b'], YESTERDAY, 'O+') == (5, 0, 0)
+    print("TEST PASSED: one row per bank, group and day with available, expiring and expired units.")
+
+def test_only_today_is_recorded():
+    print("Testing that past days are refused...")
+    with app.app_context():
+        for day in (YESTERDAY, TODAY + timedelta(days=1)):
+            with pytest.raises(ValueError):
+                snapshot_inventory(day)
+        assert InventorySnapshot.query.count() == 2 * 2 * 8
+    print("TEST PASSED: a missed day is left as a gap rather than under-counted.")
+
+def test_history_survives_consumption():
+    print("Testing that consumed stock stays in the history...")
+    client = app.test_client()
+    resp = client.post('/api/inventory/update', json={'bank_id': ids['a'], 'blood_group': 'O+', 'units': -4})
+    assert resp.status_code == 200
+    with app.app_context():
+        snapshot_inventory()
+        assert row(ids['a'], TODAY, 'O+') == (2, 0, 0)  # FIFO took the expired, expiring and one good unit
+        assert row(ids['a'], YESTERDAY, 'O+') == (5, 2, 1)
+    print("TEST PASSED: yesterday's stock level is still on record.")
+
+def test_trend_endpoint():
+    print("Testing the trend range query...")
+    client = app.test_client()
+    window = {'from': YESTERDAY.strftime('%Y-%m-%d'), 'to': TODAY.strftime('%Y-%m-%d')}
+
+    data = client.get('/api/analytics/inventory/trend', query_string={**window, 'bank_id': ids['a']}).get_json()
+    assert data['labels'] == [window['from'], window['to']]
+    assert list(data['groups'])[:2] == ['A+', 'A-']  # Blood group order, not alphabetical
+    assert data['groups']['O+'] == {'available': [5, 2], 'expiring': [2, 0], 'expired': [1, 0]}
+
+    network = client.get('/api/analytics/inventory/trend', query_string={**window, 'blood_group': 'o+'}).get_json()
+    assert list(network['groups']) == ['O+']
+    assert network['groups']['O+']['available'] == [10, 7]
+
+    # Default window ends today and reaches back INVENTORY_TREND_DAYS
+    default = client.get('/api/analytics/inventory/trend').get_json()
+    assert default['labels'] == data['labels'] and default['to'] == window['to']
+    for bad in ({'from': '2024-13-01'}, {'to': '0001-01-01'}, {'from': window['to'], 'to': window['from']},
+                {'from': '2020-01-01', 'to': '2024-01-01'}):
+        assert client.get('/api/analytics/inventory/trend', query_string=bad).status_code == 400, bad
+    print("TEST PASSED: per-bank and network-wide series for the requested days.")
+
+def test_trend_query_plans():
+    print("Testing trend query plans...")
+    with app.app_context():
+        params = {'bank': ids['a'], 'start': YESTERDAY, 'end': TODAY}
+        per_bank = db.session.execute(text(
+            "EXPLAIN QUERY PLAN SELECT day, blood_group, available, expiring, expired FROM inventory_snapshot "
+            "WHERE bank_id = :bank AND day BETWEEN :start AND :end ORDER BY day, blood_group"
+        ), params).fetchall()
+        network = db.session.execute(text(
+            "EXPLAIN QUERY PLAN SELECT day, blood_group, sum(available) FROM inventory_snapshot "
+            "WHERE day BETWEEN :start AND :end GROUP BY day, blood_group ORDER BY day, blood_group"
+        ), params).fetchall()
+    per_bank = ' '.join(str(r[-1]) for r in per_bank)
+    network = ' '.join(str(r[-1]) for r in network)
+    assert 'sqlite_autoindex_inventory_snapshot_1' in per_bank and 'TEMP B-TREE' not in per_bank, per_bank
+    assert 'ix_inventory_snapshot_day' in network and 'TEMP B-TREE' not in network, network
+    print(f"TEST PASSED: {per_bank} / {network}")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main(['-s', __file__]))
@@ -0,0 +1,128 @@
+import random
+from datetime import datetime, timedelta
+import pytest
+
+from app import app, db, User, Report, DonorProfile, rebuild_donor_profiles
+from leaderboard import DonorLeaderboard, donor_leaderboard
+
+ids = {}
+
+def setup_module(module=None):
+    with app.app_context():
+        now = datetime.utcnow()
+        donors = {
+            'asha': User(username='asha', email='asha@test.org', role='donor', password_hash='x',
+                         city='Mysore', blood_group='O+'),
+            'bala': User(username='bala', email='bala@test.org', role='donor', password_hash='x',
+                         city='mysore', blood_group='A+'),
+            'chitra': User(username='chitra', email='chitra@test.org', role='donor', password_hash='x',
+                           city='Mandya', blood_group='O+'),
+            'dev': User(username='dev', email='dev@test.org', role='donor', password_hash='x',
+                        city='Mysore', blood_group='O+'),
+        }
+        db.session.add_all(donors.values())
+        db.session.flush()
+        for name, count in (('asha', 4), ('bala', 2), ('chitra', 4)):
+            for i in range(count):
+                db.session.add(Report(donor_id=donors[name].id, filename=f'{name}{i}.pdf', status='approved',
+                                      upload_date=now - timedelta(days=100 * i)))
+        db.session.commit()
+        rebuild_donor_profiles()
+        ids.update({name: user.id for name, user in donors.items()})
+
+def fetch(client, url, **params):
+    resp = client.get(url, query_string=params)
+    assert resp.status_code == 200, resp.get_data(as_text=True)
+    return resp.get_json()
+
+def test_top_and_rank():
+    print("Testing leaderboard top-N and rank queries...")
+    client = app.test_client()
+
+    leaders = fetch(client, '/api/leaderboard')['leaders']
+    assert [(l['rank'], l['name']) for l in leaders] == [(1, 'asha'), (1, 'chitra'), (3, 'bala')]
+
+    mysore = fetch(client, '/api/leaderboard', city='MYSORE')['leaders']
+    assert [l['name'] for l in mysore] == ['asha', 'bala']
+    o_pos = fetch(client, '/api/leaderboard', city='Mandya', blood_group='o+')['leaders']
+    assert [l['name'] for l in o_pos] == ['chitra']
+
+    ranks = fetch(client, f"/api/leaderboard/rank/{ids['bala']}")['ranks']
+    assert ranks['overall'] == {'scope': ['all'], 'rank': 3, 'out_of': 3}
+    assert ranks['city']['rank'] == 2 and ranks['blood_group'] == {'scope': ['blood_group', 'A+'], 'rank': 1, 'out_of': 1}
+    assert fetch(client, f"/api/leaderboard/rank/{ids['dev']}")['ranks']['overall']['rank'] is None
+    assert client.get('/api/leaderboard/rank/99999').status_code == 404
+    print("TEST PASSED: boards ranked donors per city and blood group with shared ranks for ties.")
+
+def test_incremental_updates_skip_reports(sql_statements):
+    print("Testing incremental leaderboard updates...")
+    client = app.test_client()
+    fetch(client, '/api/leaderboard')  # Make sure the board is loaded
+
+    with app.app_context():
+        reports = [Report(donor_id=ids['dev'], filename=f'dev{i}.pdf') for i in range(5)]
+        db.session.add_all(reports)
+        db.session.commit()
+        report_ids = [r.id for r in reports]
+    for report_id in report_ids:
+        client.post(f'/api/verify_report/{report_id}', json={'action': 'approve'})
+
+    with sql_statements() as statements:
+        rank = fetch(client, f"/api/leaderboard/rank/{ids['dev']}")
+        leaders = fetch(client, '/api/leaderboard', city='Mysore')['leaders']
+    assert not any('report' in s.lower() for s in statements), statements
+
+    assert rank['total_donations'] == 5 and rank['ranks']['overall']['rank'] == 1
+    assert [l['name'] for l in leaders] == ['dev', 'asha', 'bala']
+
+    # Moving city and withdrawing an approval both re-rank the donor
+    with app.app_context():
+        db.session.get(User, ids['dev']).city = 'Mandya'
+        db.session.commit()
+    client.post(f'/api/verify_report/{report_ids[0]}', json={'action': 'reject'})
+    mandya = fetch(client, '/api/leaderboard', city='Mandya')['leaders']
+    assert [(l['name'], l['total_donations']) for l in mandya] == [('chitra', 4), ('dev', 4)]
+    assert [l['name'] for l in fetch(client, '/api/leaderboard', city='Mysore')['leaders']] == ['asha', 'bala']
+
+    # A rebuild from the database agrees with the incrementally maintained board
+    before = fetch(client, '/api/leaderboard')['leaders']
+    with app.app_context():
+        rebuild_donor_profiles()
+    assert not donor_leaderboard.loaded
+    assert fetch(client, '/api/leaderboard')['leaders'] == before
+    print("TEST PASSED: approvals and profile edits re-ranked donors without reading reports.")
+
+def test_reload_after_ttl(monkeypatch):
+    print("Testing that another worker's donations show up after the TTL...")
+    client = app.test_client()
+    fetch(client, '/api/leaderboard')  # Make sure the board is loaded
+    with app.app_context():
+        # A bulk UPDATE skips this process's row listeners, like a donation recorded by another worker
+        db.session.execute(db.update(DonorProfile).where(DonorProfile.donor_id == ids['bala']).values(total_donations=9))
+        db.session.commit()
+    assert fetch(client, f"/api/leaderboard/rank/{ids['bala']}")['ranks']['overall']['rank'] != 1
+
+    monkeypatch.setitem(app.config, 'LEADERBOARD_TTL', 0)
+    assert fetch(client, f"/api/leaderboard/rank/{ids['bala']}")['ranks']['overall']['rank'] == 1
+    print("TEST PASSED: the stale board was re-ranked from the database.")
+
+def test_matches_sorted_scan():
+    print("Testing leaderboard against a full sort...")
+    rng = random.Random(5)
+    board = DonorLeaderboard()
+    donors = {i: (rng.randint(0, 30), rng.choice(['a', 'b', 'c']), rng.choice(['O+', 'A-'])) for i in range(1, 3001)}
+    board.load([(i, *v) for i, v in donors.items()])
+    for i in rng.sample(sorted(donors), 500):
+        donors[i] = (rng.randint(0, 30),) + donors[i][1:]
+        board.update(i, donors[i][0], profile=True)
+
+    scope = board.scope('b', 'O+')
+    members = {i: c for i, (c, city, bg) in donors.items() if city == 'b' and bg == 'O+' and c > 0}
+    for i, count in members.items():
+        assert board.rank(i, scope) == (1 + sum(1 for c in members.values() if c > count), len(members))
+    expected = sorted(members, key=lambda i: (-members[i], i))[:20]
+    assert [donor_id for _, donor_id, _ in board.top(scope, 20)] == expected
+    print("TEST PASSED: ranks and top-N matched a full sort after 500 updates.")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main(['-s', __file__]))
@@ -0,0 +1,111 @@
+import json
+from sqlalchemy import inspect, text
+import pytest
+
+from app import app, db, User, Campaign, BloodRequest, VerificationEvent
+from migrations import MIGRATIONS, Backfill, SchemaMigration, status, upgrade
+
+def setup_module(module=None):
+    """A database as the pre-migration scripts left it: no bank_id or city columns, notes in blobs"""
+    with app.app_context():
+        db.session.execute(text("DROP TABLE blood_request"))
+        db.session.execute(text(
+            "CREATE TABLE blood_request (id INTEGER PRIMARY KEY, hospital_id INTEGER NOT NULL, "
+            "patient_name VARCHAR(100) NOT NULL, patient_id VARCHAR(50) NOT NULL, blood_group VARCHAR(5) NOT NULL, "
+            "units INTEGER NOT NULL, priority VARCHAR(20) NOT NULL, reason VARCHAR(255) NOT NULL, "
+            "blood_bank_id VARCHAR(50), status VARCHAR(20), request_date DATETIME)"
+        ))
+        db.session.execute(text("DROP INDEX ix_campaign_city_lower_status_date"))
+        db.session.execute(text("ALTER TABLE campaign DROP COLUMN city"))
+        db.session.execute(text("DROP TABLE verification_event"))
+        db.session.execute(text("DROP TABLE schema_migration"))
+
+        db.session.execute(text(
+            "INSERT INTO user (id, username, email, password_hash, role, city) VALUES "
+            "(1, 'Bank', 'bank@test.org', 'x', 'blood_bank', 'Mysore'), "
+            "(2, 'Hospital', 'hosp@test.org', 'x', 'hospital', 'Mysore')"
+        ))
+        notes = json.dumps([{'reason': 'Missing address', 'penalty': 20}])
+        db.session.execute(text("UPDATE user SET ai_verification_notes = :notes WHERE id = 2"), {'notes': notes})
+        for i in range(1, 8):
+            db.session.execute(text(
+                "INSERT INTO blood_request (id, hospital_id, patient_name, patient_id, blood_group, units, priority, "
+                "reason, blood_bank_id, status) VALUES (:id, 2, 'P', 'P', 'A+', 1, 'urgent', 'Surgery', :bank, 'pending')"
+            ), {'id': i, 'bank': '1' if i != 4 else 'Somewhere'})
+            db.session.execute(text(
+                "INSERT INTO campaign (id, organizer_id, name, location, date, start_time, end_time, status) "
+                "VALUES (:id, 1, 'Drive', 'Hall', '2030-01-01 00:00:00', '09:00', '17:00', 'scheduled')"
+            ), {'id': i})
+        db.session.commit()
+
+def test_time_budget_pauses_and_status_reports_progress():
+    print("Testing a throttled upgrade that runs out of time...")
+    with app.app_context():
+        assert [state for _, _, state in status()] == ['pending'] * len(MIGRATIONS)
+        assert upgrade(batch_size=3, pause=0, max_seconds=0, log=lambda message: None) is False
+
+        states = [state for _, _, state in status()]
+        assert states[0] == 'applied' and states[1].startswith('running (step 2 of 3')
+        assert states[2:] == ['pending'] * (len(MIGRATIONS) - 2)
+        columns = {col['name'] for col in inspect(db.engine).get_columns('campaign')}
+        assert 'city' in columns
+        # The baseline is pinned: bank_id is left to migration 4, which adds it with its foreign key
+        assert 'bank_id' not in {col['name'] for col in inspect(db.engine).get_columns('blood_request')}
+        assert Campaign.query.filter(Campaign.city.isnot(None)).count() == 0
+    print("TEST PASSED: DDL ran, the backfill waited for the next run.")
+
+def test_interrupted_backfill_resumes_after_last_batch():
+    print("Testing resume after a failed backfill batch...")
+    step = next(s for s in MIGRATIONS[3][2] if isinstance(s, Backfill))
+    real_batch, calls = step.batch, []
+
+    def failing_batch(after_id, batch_size):
+        calls.append(after_id)
+        if len(calls) == 2:
+            raise RuntimeError("connection lost")
+        return real_batch(after_id, batch_size)
+
+    with app.app_context():
+        step.batch = failing_batch
+        try:
+            upgrade(batch_size=3, pause=0, log=lambda message: None)
+            assert False, "the failing batch should propagate"
+        except RuntimeError:
+            db.session.rollback()
+        finally:
+            step.batch = real_batch
+
+        record = db.session.get(SchemaMigration, 4)
+        assert record.applied_at is None and record.last_id == 3 and record.rows == 3
+        assert [r.bank_id for r in BloodRequest.query.order_by(BloodRequest.id)] == [1, 1, 1, None, None, None, None]
+
+        assert upgrade(batch_size=3, pause=0, log=lambda message: None) is True
+        db.session.expire_all()
+        assert [r.bank_id for r in BloodRequest.query.order_by(BloodRequest.id)] == [1, 1, 1, None, 1, 1, 1]
+        assert db.session.get(SchemaMigration, 4).rows == 6
+    print("TEST PASSED: the rerun continued after the last committed batch.")
+
+def test_backfills_completed_and_rerun_is_noop():
+    print("Testing the upgraded data and a repeat run...")
+    with app.app_context():
+        assert [state for _, _, state in status()] == ['applied'] * len(MIGRATIONS)
+        assert Campaign.query.filter(Campaign.city != 'Mysore').count() == 0
+        events = VerificationEvent.query.filter_by(user_id=2).all()
+        assert [(e.type, e.reason, e.penalty) for e in events] == [('ai_flag', 'Missing address', 20)]
+        assert db.session.get(User, 2).ai_verification_notes is None
+        indexes = {index['name'] for index in inspect(db.engine).get_indexes('blood_request')}
+        assert 'ix_blood_request_bank_status_date' in indexes
+        indexes = {name for (name,) in db.session.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'campaign'"))}  # Expression index included
+        assert 'ix_campaign_city_lower_status_date' in indexes and 'ix_campaign_city_status_date' not in indexes
+        foreign_keys = inspect(db.engine).get_foreign_keys('blood_request')
+        assert {'constrained_columns': ['bank_id'], 'referred_table': 'user', 'referred_columns': ['id']} in \
+            [{k: fk[k] for k in ('constrained_columns', 'referred_table', 'referred_columns')} for fk in foreign_keys]
+
+        messages = []
+        assert upgrade(pause=0, log=messages.append) is True
+        assert messages == []
+    print("TEST PASSED: every migration applied once.")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main(['-s', __file__]))
@@ -0,0 +1,107 @@
+import io
+import os
+import time
+import tempfile
+import pytest
+from werkzeug.datastructures import FileStorage
+
+import app as app_module
+import cleanup_uploads
+from app import app, db, User, Report
+from report_storage import ReportStorage
+
+PDF = b'%PDF-1.4 blood panel'
+
+@pytest.fixture
+def storage(monkeypatch):
+    """Points the upload routes and the cleanup job at a scratch uploads folder"""
+    root = os.path.join(tempfile.mkdtemp(), 'uploads')
+    storage = ReportStorage(root, chunk_size=4)  # Several chunks even for tiny files
+    monkeypatch.setattr(app_module, 'report_storage', storage)
+    monkeypatch.setattr(cleanup_uploads, 'report_storage', storage)
+    monkeypatch.setitem(app.config, 'UPLOAD_FOLDER', root)
+    return storage
+
+def setup_module(module=None):
+    with app.app_context():
+        db.session.add(User(username='donor', email='donor@test.org', role='donor', password_hash='x'))
+        db.session.commit()
+
+def upload(client, content, name):
+    with app.app_context():
+        donor_id = User.query.filter_by(email='donor@test.org').first().id
+    resp = client.post('/api/upload_report', data={'donor_id': str(donor_id), 'report': (io.BytesIO(content), name)},
+                       content_type='multipart/form-data')
+    assert resp.status_code == 201, resp.get_data(as_text=True)
+    with app.app_context():
+        return Report.query.order_by(Report.id.desc()).first().filename
+
+def test_uploads_are_deduplicated(storage):
+    print("Testing content-addressed uploads...")
+    client = app.test_client()
+    first = upload(client, PDF, 'scan.pdf')
+    second = upload(client, PDF, 'SCAN (copy).PDF')
+    other = upload(client, b'haemoglobin 14.1', 'notes.txt')
+
+    # Keyed by content alone: the uploaded name does not matter, the extension is kept for the content type
+    assert first == second and first != other
+    digest = os.path.basename(first)[:-len('.pdf')]
+    assert len(digest) == 64 and first == f'{digest[:2]}/{digest[2:4]}/{digest}.pdf'
+    assert other.endswith('.txt')
+    blobs = sorted(blob for blob, _ in storage.iter_blobs())
+    assert blobs == sorted([storage.resolve(first), storage.resolve(other)]) and first[:-len('.pdf')] in blobs
+    assert os.listdir(storage.tmp_dir) == []
+    print("TEST PASSED: the same report uploaded twice is stored once.")
+
+def test_served_with_sniffed_type(storage):
+    print("Testing that blobs are served with their content type...")
+    client = app.test_client()
+    blob = upload(client, PDF, 'scan.pdf')
+    resp = client.get(f'/uploads/{blob}')
+    assert resp.status_code == 200 and resp.data == PDF
+    assert resp.mimetype == 'application/pdf'
+    assert resp.cache_control.private and resp.cache_control.immutable
+    text = upload(client, b'plain notes', 'notes.txt')
+    assert client.get(f'/uploads/{text}').mimetype == 'text/plain'
+    renamed = upload(client, PDF, 'scan.txt')  # Known signatures win over the extension
+    assert client.get(f'/uploads/{renamed}').mimetype == 'application/pdf'
+    unknown = upload(client, b'\x00\x01', 'blob')
+    assert client.get(f'/uploads/{unknown}').mimetype == 'application/octet-stream'
+    print("TEST PASSED: blobs are served with a type sniffed from their content or their extension.")
+
+def test_temp_files_are_not_served(storage):
+    print("Testing that in-flight uploads stay private...")
+    root = os.path.abspath(storage.root)
+    assert not os.path.abspath(storage.tmp_dir).startswith(root + os.sep)
+
+    # A temp folder inside the uploads root (older layout) is still not reachable
+    os.makedirs(os.path.join(root, '.tmp'))
+    with open(os.path.join(root, '.tmp', 'partial'), 'wb') as f:
+        f.write(b'half a report')
+    client = app.test_client()
+    assert client.get('/uploads/.tmp/partial').status_code == 404
+    assert client.get('/uploads/ab/.hidden').status_code == 404
+    print("TEST PASSED: temp files live outside the served folder and dot paths are refused.")
+
+def test_cleanup_job(storage):
+    print("Testing orphaned blob cleanup...")
+    client = app.test_client()
+    kept = upload(client, PDF, 'scan.pdf')
+    orphan = storage.save(FileStorage(io.BytesIO(b'never registered'), 'lost.pdf'))
+    fresh = storage.save(FileStorage(io.BytesIO(b'still registering'), 'new.pdf'))
+    stale_tmp = os.path.join(storage.tmp_dir, 'interrupted')
+    open(stale_tmp, 'wb').close()
+
+    old = time.time() - 2 * 3600
+    for path in (os.path.join(storage.root, storage.resolve(kept)), os.path.join(storage.root, storage.resolve(orphan)), stale_tmp):
+        os.utime(path, (old, old))
+
+    cleanup_uploads.cleanup_uploads(grace_seconds=3600)
+    blobs = {blob for blob, _ in storage.iter_blobs()}
+    assert storage.resolve(kept) in blobs and storage.resolve(fresh) in blobs and storage.resolve(orphan) not in blobs  # Fresh blobs are in their grace period
+    assert not os.path.exists(os.path.join(storage.root, orphan[:2]))  # Emptied shard folders are removed
+    assert not os.path.exists(stale_tmp)
+    print("TEST PASSED: only unreferenced blobs past the grace period were deleted.")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main(['-s', __file__]))
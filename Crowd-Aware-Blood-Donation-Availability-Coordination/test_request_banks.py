@@ -0,0 +1,83 @@
+from sqlalchemy import text
+import pytest
+
+from app import app, db, User, BloodRequest
+from backfill_request_banks import backfill_request_banks
+
+ids = {}
+
+def setup_module(module=None):
+    with app.app_context():
+        bank = User(username='City Bank', email='bank@test.org', role='blood_bank', city='Mysore', password_hash='x')
+        hospital = User(username='General Hospital', email='hosp@test.org', role='hospital', password_hash='x')
+        db.session.add_all([bank, hospital])
+        db.session.flush()
+
+        # Legacy rows only carry the identifier string the hospital sent
+        legacy = [str(bank.id), f' {bank.id} ', str(hospital.id), 'City Bank', '9999', None, str(bank.id), '²']
+        for i, value in enumerate(legacy):
+            db.session.add(BloodRequest(hospital_id=hospital.id, patient_name=f'Patient {i}', patient_id=f'P{i}',
+                                        blood_group='A+', units=1, priority='urgent', reason='Surgery',
+                                        blood_bank_id=value, status='approved' if i == 6 else 'pending'))
+        db.session.commit()
+        ids.update(bank=bank.id, hospital=hospital.id)
+
+def test_backfill_in_batches_and_resume():
+    print("Testing chunked bank_id backfill...")
+    with app.app_context():
+        resolved, unresolved = backfill_request_banks(batch_size=2, pause=0)
+        assert resolved == 3 and unresolved == 4  # Including the non-ASCII digit
+        linked = [r.bank_id for r in BloodRequest.query.order_by(BloodRequest.id)]
+        assert linked == [ids['bank'], ids['bank'], None, None, None, None, ids['bank'], None]
+
+        # A second run finds nothing new to link
+        assert backfill_request_banks(batch_size=2, pause=0)[0] == 0
+    print("TEST PASSED: numeric bank identifiers were linked; others were left unassigned.")
+
+def test_bank_endpoints_use_fk():
+    print("Testing bank views over the integer FK...")
+    client = app.test_client()
+    bank_id = ids['bank']
+
+    requests = client.get(f'/api/bank/requests/{bank_id}').get_json()
+    assert len(requests) == 3
+    assert client.get(f'/api/bank/stats/{bank_id}').get_json()['pending_requests'] == 2
+
+    resp = client.post('/api/request_blood', json={
+        'hospital_id': ids['hospital'], 'patient_name': 'New', 'patient_id': 'P9', 'blood_group': 'O+',
+        'units': 1, 'priority': 'routine', 'reason': 'Anaemia', 'blood_bank': str(bank_id)
+    })
+    assert resp.status_code == 201, resp.get_data(as_text=True)
+    assert client.get(f'/api/bank/stats/{bank_id}').get_json()['pending_requests'] == 3
+    resp = client.post('/api/request_blood', json={
+        'hospital_id': ids['hospital'], 'patient_name': 'Odd', 'patient_id': 'P10', 'blood_group': 'O+',
+        'units': 1, 'priority': 'routine', 'reason': 'Anaemia', 'blood_bank': '²'
+    })
+    assert resp.status_code == 201, resp.get_data(as_text=True)
+
+    with app.app_context():
+        hospital_request = BloodRequest.query.filter_by(blood_bank_id=str(ids['hospital'])).first().id
+    resp = client.post(f'/api/bank/request/{hospital_request}/action', json={'action': 'approve', 'bank_id': bank_id})
+    assert resp.status_code == 403
+    print("TEST PASSED: bank requests, stats and actions follow bank_id.")
+
+def test_urgent_list_skips_other_banks():
+    print("Testing the urgent request list...")
+    urgent = app.test_client().get('/api/requests/urgent').get_json()
+    # The bank's two linked requests plus the one naming no bank; unresolved identifiers are left out
+    assert ids['bank'] == 1 and len(urgent) == 3
+    assert {r['hospital'] for r in urgent} == {'General Hospital'}
+    print("TEST PASSED: requests addressed to unknown banks are not offered.")
+
+def test_bank_queries_use_index():
+    print("Testing bank request query plan...")
+    with app.app_context():
+        plan = db.session.execute(text(
+            "EXPLAIN QUERY PLAN SELECT count(id) FROM blood_request WHERE bank_id = 1 AND status = 'pending'"
+        )).fetchall()
+    detail = ' '.join(str(row[-1]) for row in plan)
+    assert 'ix_blood_request_bank_status_date' in detail, detail
+    print(f"TEST PASSED: {detail}")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main(['-s', __file__]))
@@ -0,0 +1,105 @@
+import time
+from datetime import datetime, timedelta
+import numpy as np
+import pytest
+
+from app import app, db, User, BloodInventory, BloodRequest
+from request_matcher import request_matcher, BankSnapshot, COMPATIBLE, GROUP_INDEX, BLOOD_GROUPS
+
+ids = {}
+
+def setup_module(module=None):
+    with app.app_context():
+        hospital = User(username='Matcher Hospital', email='mh@test.org', role='hospital', password_hash='x',
+                        latitude=12.9716, longitude=77.5946)
+        near = User(username='Near Bank', email='near@test.org', role='bank', password_hash='x',
+                    latitude=12.9800, longitude=77.6000)
+        far = User(username='Far Bank', email='far@test.org', role='bank', password_hash='x',
+                   latitude=12.2958, longitude=76.6394)
+        db.session.add_all([hospital, near, far])
+        db.session.flush()
+
+        now = datetime.utcnow()
+        db.session.add_all([
+            # Near bank: 2 exact units plus universal O-; Far bank has plenty of exact stock
+            BloodInventory(bank_id=near.id, blood_group='A-', units=2, expiry_date=now + timedelta(days=3)),
+            BloodInventory(bank_id=near.id, blood_group='O-', units=5, expiry_date=now + timedelta(days=30)),
+            BloodInventory(bank_id=near.id, blood_group='B+', units=40, expiry_date=now + timedelta(days=30)),
+            BloodInventory(bank_id=near.id, blood_group='A-', units=9, expiry_date=now - timedelta(days=1)),
+            BloodInventory(bank_id=far.id, blood_group='A-', units=20, expiry_date=now + timedelta(days=30)),
+        ])
+        emergency = BloodRequest(hospital_id=hospital.id, patient_name='P1', patient_id='1', blood_group='A-',
+                                 units=4, priority='emergency', reason='Trauma')
+        large = BloodRequest(hospital_id=hospital.id, patient_name='P2', patient_id='2', blood_group='A-',
+                             units=25, priority='routine', reason='Surgery')
+        db.session.add_all([emergency, large])
+        db.session.commit()
+        ids.update(near=near.id, far=far.id, emergency=emergency.id, large=large.id)
+
+def test_compatibility_matrix():
+    print("Testing ABO/Rh compatibility matrix...")
+    assert COMPATIBLE[GROUP_INDEX['AB+']].all()
+    assert COMPATIBLE[:, GROUP_INDEX['O-']].all()
+    assert COMPATIBLE[GROUP_INDEX['O-']].sum() == 1
+    assert not COMPATIBLE[GROUP_INDEX['A+'], GROUP_INDEX['B+']]
+    assert not COMPATIBLE[GROUP_INDEX['O+'], GROUP_INDEX['A+']]
+    print("TEST PASSED: compatibility matrix matches the transfusion rules.")
+
+def test_emergency_plan_prefers_near_bank():
+    print("Testing emergency allocation plan...")
+    client = app.test_client()
+    resp = client.get(f"/api/requests/{ids['emergency']}/match")
+    assert resp.status_code == 200, resp.get_data(as_text=True)
+    plan = resp.get_json()
+
+    assert plan['fully_allocated'] and plan['units_allocated'] == 4
+    top = plan['banks'][0]
+    assert top['bank_id'] == ids['near']
+    # Expired A- is ignored, incompatible B+ is never used, exact group is drawn before O-
+    assert top['compatible_units'] == 7
+    assert top['allocations'] == [{'blood_group': 'A-', 'units': 2}, {'blood_group': 'O-', 'units': 2}]
+    print("TEST PASSED: emergency plan used the nearest compatible stock.")
+
+def test_large_request_spans_banks():
+    print("Testing multi-bank allocation plan...")
+    client = app.test_client()
+    plan = client.get(f"/api/requests/{ids['large']}/match").get_json()
+    assert plan['fully_allocated']
+    assert sum(a['units'] for b in plan['banks'] for a in b['allocations']) == 25
+    assert {b['bank_id'] for b in plan['banks']} == {ids['near'], ids['far']}
+    print("TEST PASSED: large request was split across banks.")
+
+def test_request_without_hospital():
+    print("Testing a request whose hospital account is gone...")
+    with app.app_context():
+        orphan = BloodRequest(hospital_id=999999, patient_name='P3', patient_id='3', blood_group='A-',
+                              units=4, priority='urgent', reason='Surgery')
+        db.session.add(orphan)
+        db.session.commit()
+        orphan_id = orphan.id
+    resp = app.test_client().get(f"/api/requests/{orphan_id}/match")
+    assert resp.status_code == 200, resp.get_data(as_text=True)
+    plan = resp.get_json()
+    assert plan['fully_allocated'] and {b['bank_id'] for b in plan['banks']} <= {ids['near'], ids['far']}
+    print("TEST PASSED: banks ranked without distance instead of a 500.")
+
+def test_vectorized_scoring_speed():
+    print("Testing scoring over a large bank network...")
+    rng = np.random.default_rng(3)
+    n = 5000
+    snapshot = BankSnapshot(
+        range(n), [f'Bank {i}' for i in range(n)], ['City'] * n,
+        rng.uniform(8, 35, n), rng.uniform(68, 97, n),
+        rng.integers(0, 30, (n, len(BLOOD_GROUPS))), rng.integers(0, 5, (n, len(BLOOD_GROUPS))),
+        rng.integers(0, 10, n)
+    )
+    started = time.perf_counter()
+    plan = request_matcher.plan(snapshot, 'AB-', 50, priority='urgent', lat=12.97, lon=77.59)
+    elapsed = (time.perf_counter() - started) * 1000
+    assert plan['fully_allocated']
+    scores = [b['score'] for b in plan['banks']]
+    assert scores == sorted(scores, reverse=True)
+    print(f"TEST PASSED: scored {n} banks in {elapsed:.2f} ms.")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main(['-s', __file__]))
@@ -0,0 +1,72 @@
+import json
+from datetime import datetime
+import pytest
+
+from app import app, db, User, VerificationEvent
+from migrate_verification_notes import migrate_verification_notes
+
+def test_flags_and_decisions_are_rows(sql_statements):
+    print("Testing verification events for registration and review...")
+    client = app.test_client()
+    for i in range(12):
+        # No registration ID or address: the verifier flags each of them
+        resp = client.post('/api/register', json={
+            'name': f'Clinic {i}', 'email': f'clinic{i}@test.org', 'password': 'pw', 'role': 'hospital', 'phone': '123',
+            'hospital_type': 'Private'
+        })
+        assert resp.status_code == 201, resp.get_data(as_text=True)
+    clinic = resp.get_json()['user_id']
+
+    with app.app_context():
+        flags = VerificationEvent.query.filter_by(user_id=clinic).all()
+        assert flags and all(e.type == 'ai_flag' and e.reason and e.penalty for e in flags)
+        assert db.session.get(User, clinic).ai_verification_notes is None
+
+    # A review is one INSERT; the user's earlier events are never read or rewritten
+    with sql_statements() as statements:
+        resp = client.post(f'/api/admin/verify/{clinic}', json={'decision': 'reject', 'admin_id': 1, 'notes': 'No licence'})
+    assert resp.status_code == 200
+    writes = [s for s in statements if s.lstrip().upper().startswith(('INSERT', 'UPDATE'))]
+    assert sum('verification_event' in s for s in writes) == 1
+    assert not any('verification_event' in s for s in statements if s.lstrip().upper().startswith('SELECT'))
+
+    # The admin queue fetches notes for the whole page in one query
+    with sql_statements() as statements:
+        resp = client.get('/api/admin/pending-verifications?fields=id,ai_verification_notes&limit=10')
+    page = resp.get_json()
+    assert len(page) == 10 and all(u['ai_verification_notes'] for u in page)
+    assert sum('verification_event' in s for s in statements) == 1
+    note = page[0]['ai_verification_notes'][0]
+    assert set(note) == {'reason', 'penalty', 'timestamp'}
+    print(f"TEST PASSED: flags and decisions stored as rows; page notes loaded in {len(statements)} statements.")
+
+def test_migration_splits_legacy_blobs():
+    print("Testing legacy notes migration...")
+    with app.app_context():
+        blob = json.dumps([
+            {'reason': 'Missing address', 'penalty': 10, 'timestamp': '2025-01-02T03:04:05'},
+            {'type': 'admin_review', 'decision': 'approve', 'notes': 'Checked', 'admin_id': 1,
+             'timestamp': '2025-01-03T00:00:00'},
+        ])
+        users = [{"username": f"legacy_{i}", "email": f"legacy_{i}@test.org", "role": "donor",
+                  "ai_verification_notes": blob if i != 13 else '{broken'} for i in range(30)]
+        db.session.execute(db.insert(User), users)
+        db.session.commit()
+        before = VerificationEvent.query.count()
+
+        migrated, written, skipped = migrate_verification_notes(batch_size=7)
+        assert (migrated, written) == (29, 58) and len(skipped) == 1
+        assert VerificationEvent.query.count() == before + 58
+        assert User.query.filter(User.ai_verification_notes.isnot(None)).count() == 1  # The unreadable one
+
+        legacy = User.query.filter_by(username='legacy_0').one()
+        notes = [e.as_note() for e in legacy.verification_events]
+        assert notes == json.loads(blob)
+        assert legacy.verification_events[0].created_at == datetime(2025, 1, 2, 3, 4, 5)
+
+        # Re-running only revisits what was left behind
+        assert migrate_verification_notes(batch_size=7) == (0, 0, skipped)
+    print("TEST PASSED: legacy blobs were split in batches and the run is resumable.")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main(['-s', __file__]))
@@ -1,6 +0,0 @@
-from app import app, db
-
-if __name__ == "__main__":
-    with app.app_context():
-        db.create_all()
-        print("Database schema updated.")